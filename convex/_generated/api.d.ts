@@ -10,11 +10,25 @@
 
 import type * as ai from "../ai.js";
 import type * as auth from "../auth.js";
+import type * as checkout from "../checkout.js";
+import type * as crons from "../crons.js";
 import type * as documents from "../documents.js";
 import type * as http from "../http.js";
 import type * as knowledge from "../knowledge.js";
+import type * as lib_documentSummary from "../lib/documentSummary.js";
+import type * as lib_documentText from "../lib/documentText.js";
+import type * as lib_email from "../lib/email.js";
+import type * as lib_embeddingDimensions from "../lib/embeddingDimensions.js";
+import type * as lib_embeddings from "../lib/embeddings.js";
+import type * as lib_entitlements from "../lib/entitlements.js";
+import type * as lib_openai from "../lib/openai.js";
+import type * as lib_prompt from "../lib/prompt.js";
+import type * as lib_textDiff from "../lib/textDiff.js";
 import type * as messages from "../messages.js";
+import type * as migrations from "../migrations.js";
+import type * as responseCache from "../responseCache.js";
 import type * as subscriptions from "../subscriptions.js";
+import type * as testing from "../testing.js";
 import type * as users from "../users.js";
 
 import type {
@@ -26,11 +40,25 @@ import type {
 declare const fullApi: ApiFromModules<{
   ai: typeof ai;
   auth: typeof auth;
+  checkout: typeof checkout;
+  crons: typeof crons;
   documents: typeof documents;
   http: typeof http;
   knowledge: typeof knowledge;
+  "lib/documentSummary": typeof lib_documentSummary;
+  "lib/documentText": typeof lib_documentText;
+  "lib/email": typeof lib_email;
+  "lib/embeddingDimensions": typeof lib_embeddingDimensions;
+  "lib/embeddings": typeof lib_embeddings;
+  "lib/entitlements": typeof lib_entitlements;
+  "lib/openai": typeof lib_openai;
+  "lib/prompt": typeof lib_prompt;
+  "lib/textDiff": typeof lib_textDiff;
   messages: typeof messages;
+  migrations: typeof migrations;
+  responseCache: typeof responseCache;
   subscriptions: typeof subscriptions;
+  testing: typeof testing;
   users: typeof users;
 }>;
 
@@ -1,100 +1,295 @@
 import { v } from "convex/values";
-import { action } from "./_generated/server";
-import { api } from "./_generated/api";
-import OpenAI from "openai";
+import { action, internalAction } from "./_generated/server";
+import { internal } from "./_generated/api";
+import type { Id } from "./_generated/dataModel";
+import { textEdit } from "./documents";
+import { documentToText } from "./lib/documentText";
+import { getEmbedder } from "./lib/embeddings";
+import { createOpenAI } from "./lib/openai";
+import { buildChatPrompt, truncateToTokens, withSnippets } from "./lib/prompt";
+import type { ChatTurn } from "./lib/prompt";
+import { applyTextEdits } from "./lib/textDiff";
+
+// How often a streaming reply is written back while tokens arrive. The first
+// token is always written at once.
+const STREAM_FLUSH_INTERVAL_MS = 100;
+
+// Knowledge items retrieved per message
+const KNOWLEDGE_TOP_K = 8;
+
+// Bounds on a conversation summary and on each message going into one
+const SUMMARY_MAX_TOKENS = 400;
+const SUMMARY_MESSAGE_TOKENS = 500;
+
+const SUMMARY_INSTRUCTIONS =
+  "You maintain a running summary of a conversation between a writer and their writing assistant about a document. Update the summary with the new messages. Keep what later replies may refer back to: requests, decisions, drafts agreed on and open questions. Write at most 250 words of plain prose, no preamble.";
+
+const NO_RESPONSE = "I apologize, but I couldn't generate a response. Please try again.";
+
+const CHAT_MODEL = "gpt-4o-mini";
+const CHAT_TEMPERATURE = 0.7;
+const CHAT_MAX_TOKENS = 2000;
+
+// Response cache key: a SHA-256 of the model settings, the document version
+// and the whole prompt. The system prompt carries the document text, the
+// retrieved knowledge, the custom instructions and the conversation summary;
+// the chat turns sent with it are included too, so a follow-up such as
+// "make it shorter" only hits after the same conversation.
+async function chatCacheKey(
+  documentId: Id<"documents">,
+  version: number,
+  prompt: { system: string; history: ChatTurn[]; user: string }
+) {
+  const data = JSON.stringify([
+    CHAT_MODEL,
+    CHAT_TEMPERATURE,
+    CHAT_MAX_TOKENS,
+    documentId,
+    version,
+    prompt.system,
+    prompt.history.map((turn) => [turn.role, turn.content]),
+    prompt.user.trim().replace(/\s+/g, " "),
+  ]);
+  const digest = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(data));
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+}
 
 export const chat = action({
   args: {
     documentId: v.id("documents"),
     userMessage: v.string(),
-    documentContent: v.string(),
+    // The document is read from the database. An editor with unsaved changes
+    // sends them as edits against the version it last saved (baseVersion);
+    // they are ignored if the document has been saved since.
+    baseVersion: v.optional(v.number()),
+    edits: v.optional(v.array(textEdit)),
+    // Text the user selected in the editor to ask about
+    contextSnippets: v.optional(v.array(v.string())),
+    // Stream the reply into the assistant message as it is generated
+    // (default). false waits for the whole completion before storing it.
+    stream: v.optional(v.boolean()),
+    // Always ask the model, e.g. to regenerate a reply; the new reply
+    // replaces the cached one
+    bypassCache: v.optional(v.boolean()),
   },
   handler: async (ctx, args) => {
-    // Fetch knowledge items for context
-    const knowledgeItems = await ctx.runQuery(api.knowledge.list, {
-      documentId: args.documentId,
-    });
+    // As stored in the chat, with every selected snippet
+    const userMessage = withSnippets(args.userMessage, args.contextSnippets ?? []);
 
-    // Fetch user's global AI instructions
-    const userSettings = await ctx.runQuery(api.users.getUserSettings, {});
-    const globalInstructions = userSettings?.aiSystemInstructions || "";
+    // Only embed the message for a caller who may chat about the document
+    await ctx.runQuery(internal.messages.checkChatAccess, { documentId: args.documentId });
 
-    // Fetch document-specific AI instructions
-    const document = await ctx.runQuery(api.documents.get, {
-      id: args.documentId,
-    });
-    const documentInstructions = document?.aiSystemInstructions || "";
-
-    // Build context from knowledge
-    let knowledgeContext = "";
-    if (knowledgeItems.length > 0) {
-      knowledgeContext = "\n\n## Reference Knowledge:\n";
-      for (const item of knowledgeItems) {
-        knowledgeContext += `\n### ${item.title}\n${item.content}\n`;
-      }
+    // Retrieve the knowledge closest to the message; if embedding fails, fall
+    // back to sending all of it
+    let knowledgeEmbeddingIds: Id<"knowledgeEmbeddings">[] | undefined;
+    try {
+      const [vector] = await getEmbedder().embed([userMessage]);
+      const matches = await ctx.vectorSearch("knowledgeEmbeddings", "by_embedding", {
+        vector,
+        limit: KNOWLEDGE_TOP_K,
+        filter: (q) => q.eq("documentId", args.documentId),
+      });
+      knowledgeEmbeddingIds = matches.map((match) => match._id);
+    } catch (error) {
+      console.error("Knowledge retrieval failed:", error);
     }
 
-    // Build custom instructions section
-    let customInstructions = "";
-    if (globalInstructions || documentInstructions) {
-      customInstructions = "\n\n## Custom Instructions:\n";
-      if (globalInstructions) {
-        customInstructions += `\n### User's Global Guidelines:\n${globalInstructions}\n`;
+    // The document, knowledge and custom instructions, with auth and
+    // ownership checked once
+    const edits = args.edits ?? [];
+    const hasEdits = args.baseVersion !== undefined && edits.length > 0;
+    const context = await ctx.runQuery(internal.messages.loadChatContext, {
+      documentId: args.documentId,
+      knowledgeEmbeddingIds,
+      ...(hasEdits && { editsBaseVersion: args.baseVersion }),
+    });
+    const {
+      knowledge: knowledgeItems,
+      globalInstructions,
+      documentInstructions,
+      conversationSummary,
+      history,
+    } = context;
+
+    let documentText = context.documentText;
+    if (documentText === null) {
+      const html = context.documentContent ?? "";
+      let unsaved: string | null = null;
+      if (hasEdits && args.baseVersion === context.version) {
+        try {
+          unsaved = applyTextEdits(html, edits);
+        } catch (error) {
+          console.error("Ignoring unsaved edits:", error);
+        }
       }
-      if (documentInstructions) {
-        customInstructions += `\n### Document-Specific Guidelines:\n${documentInstructions}\n`;
+      documentText = documentToText(unsaved ?? html);
+      if (unsaved === null) {
+        await ctx.scheduler.runAfter(0, internal.documents.cacheText, {
+          documentId: args.documentId,
+          version: context.version,
+          text: documentText,
+        });
       }
     }
 
-    // Create OpenAI client
-    const openai = new OpenAI({
-      apiKey: process.env.OPENAI_API_KEY,
+    const prompt = buildChatPrompt({
+      userMessage: args.userMessage,
+      snippets: args.contextSnippets ?? [],
+      documentText,
+      knowledge: knowledgeItems,
+      globalInstructions,
+      documentInstructions,
+      conversationSummary,
+      history,
     });
+    console.log("Prompt tokens", JSON.stringify(prompt.breakdown));
 
-    const systemPrompt = `You are an intelligent writing assistant helping users write and edit documents. You have access to reference knowledge that the user has provided to inform your writing.
-${customInstructions}
-Current document content:
----
-${args.documentContent || "(Document is empty)"}
----
-${knowledgeContext}
-
-When the user asks you to write or edit content:
-1. Consider the existing document content and any reference knowledge provided
-2. Match the tone and style of the existing document when adding content
-3. Be helpful and provide well-structured, clear writing
-4. If asked to edit specific sections, make targeted changes
-5. You can suggest improvements or ask clarifying questions if needed
-6. Follow any custom instructions provided by the user above
-
-Respond with the text you've written or edited. If providing a full replacement or addition, make it clear where it should go in the document.`;
-
-    const response = await openai.chat.completions.create({
-      model: "gpt-4o-mini",
-      messages: [
-        { role: "system", content: systemPrompt },
-        { role: "user", content: args.userMessage },
-      ],
-      temperature: 0.7,
-      max_tokens: 2000,
-    });
+    const cacheKey = await chatCacheKey(args.documentId, context.version, prompt);
+    if (!args.bypassCache) {
+      const cached = await ctx.runMutation(internal.responseCache.lookup, { key: cacheKey });
+      if (cached !== null) {
+        await ctx.runMutation(internal.messages.appendExchange, {
+          documentId: args.documentId,
+          userMessage,
+          assistantMessage: cached,
+        });
+        return cached;
+      }
+    }
+    const cacheReply = (response: string) =>
+      ctx.runMutation(internal.responseCache.store, {
+        key: cacheKey,
+        documentId: args.documentId,
+        response,
+      });
+
+    const openai = createOpenAI();
+
+    const chatMessages = [
+      { role: "system" as const, content: prompt.system },
+      ...prompt.history,
+      { role: "user" as const, content: prompt.user },
+    ];
+
+    if (args.stream === false) {
+      const response = await openai.chat.completions.create({
+        model: CHAT_MODEL,
+        messages: chatMessages,
+        temperature: CHAT_TEMPERATURE,
+        max_tokens: CHAT_MAX_TOKENS,
+      });
 
-    const assistantMessage = response.choices[0]?.message?.content || "I apologize, but I couldn't generate a response. Please try again.";
+      const reply = response.choices[0]?.message?.content;
+      const assistantMessage = reply || NO_RESPONSE;
 
-    // Store the messages
-    await ctx.runMutation(api.messages.create, {
+      await ctx.runMutation(internal.messages.appendExchange, {
+        documentId: args.documentId,
+        userMessage,
+        assistantMessage,
+      });
+      if (reply) {
+        await cacheReply(reply);
+      }
+
+      return assistantMessage;
+    }
+
+    // Store the question and an empty reply first, so both render before the
+    // model has produced anything
+    const messageId = await ctx.runMutation(internal.messages.appendExchange, {
       documentId: args.documentId,
-      role: "user",
-      content: args.userMessage,
+      userMessage,
+      assistantMessage: "",
+      streaming: true,
     });
 
-    await ctx.runMutation(api.messages.create, {
-      documentId: args.documentId,
-      role: "assistant",
+    let content = "";
+    let flushedLength = 0;
+    let lastFlush = 0;
+    try {
+      const stream = await openai.chat.completions.create({
+        model: CHAT_MODEL,
+        messages: chatMessages,
+        temperature: CHAT_TEMPERATURE,
+        max_tokens: CHAT_MAX_TOKENS,
+        stream: true,
+      });
+      for await (const chunk of stream) {
+        content += chunk.choices[0]?.delta?.content ?? "";
+        if (content.length === flushedLength || Date.now() - lastFlush < STREAM_FLUSH_INTERVAL_MS) {
+          continue;
+        }
+        lastFlush = Date.now();
+        flushedLength = content.length;
+        const stillOpen = await ctx.runMutation(internal.messages.updateAssistantMessage, {
+          messageId,
+          content,
+        });
+        if (!stillOpen) {
+          // The chat was cleared; leaving the loop aborts the request
+          return content;
+        }
+      }
+    } catch (error) {
+      await ctx.runMutation(internal.messages.updateAssistantMessage, {
+        messageId,
+        content: content || NO_RESPONSE,
+        status: "error",
+      });
+      throw error;
+    }
+
+    const assistantMessage = content || NO_RESPONSE;
+    await ctx.runMutation(internal.messages.updateAssistantMessage, {
+      messageId,
       content: assistantMessage,
+      status: "complete",
     });
-
+    if (content) {
+      await cacheReply(content);
+    }
     return assistantMessage;
   },
 });
 
+// Fold older chat messages into the document's rolling conversation summary.
+// Scheduled by messages.appendExchange once enough messages are waiting.
+export const summarizeChat = internalAction({
+  args: { documentId: v.id("documents") },
+  handler: async (ctx, args): Promise<void> => {
+    const input = await ctx.runQuery(internal.messages.loadChatSummaryInput, {
+      documentId: args.documentId,
+    });
+    if (!input) {
+      return;
+    }
+    const transcript = input.messages
+      .map(
+        (message) =>
+          `${message.role === "user" ? "User" : "Assistant"}: ${truncateToTokens(message.content, SUMMARY_MESSAGE_TOKENS)}`
+      )
+      .join("\n\n");
+    const response = await createOpenAI().chat.completions.create({
+      model: CHAT_MODEL,
+      messages: [
+        { role: "system", content: SUMMARY_INSTRUCTIONS },
+        {
+          role: "user",
+          content: `Summary so far:\n${input.summary || "(none)"}\n\nNew messages:\n${transcript}`,
+        },
+      ],
+      temperature: 0.2,
+      max_tokens: SUMMARY_MAX_TOKENS,
+    });
+    const summary = response.choices[0]?.message?.content?.trim();
+    if (!summary) {
+      return;
+    }
+    await ctx.runMutation(internal.messages.saveChatSummary, {
+      documentId: args.documentId,
+      summary,
+      previousSummarizedThrough: input.summarizedThrough,
+      throughMessageId: input.throughMessageId,
+    });
+  },
+});
@@ -1,7 +1,21 @@
 import { convexAuth } from "@convex-dev/auth/server";
 import { Password } from "@convex-dev/auth/providers/Password";
+import type { MutationCtx } from "./_generated/server";
+import { normalizeEmail } from "./lib/email";
+import { syncEntitlement } from "./lib/entitlements";
 
 export const { auth, signIn, signOut, store } = convexAuth({
   providers: [Password],
+  callbacks: {
+    // Keep users.normalizedEmail in step with the email signed up with, and
+    // pick up a subscription bought with it before signing up
+    async afterUserCreatedOrUpdated(ctx: MutationCtx, { userId }) {
+      const user = await ctx.db.get(userId);
+      const normalizedEmail = user?.email ? normalizeEmail(user.email) : undefined;
+      if (user && user.normalizedEmail !== normalizedEmail) {
+        await ctx.db.patch(userId, { normalizedEmail });
+      }
+      await syncEntitlement(ctx, userId);
+    },
+  },
 });
-
@@ -0,0 +1,144 @@
+import { v } from "convex/values";
+import { getAuthUserId } from "@convex-dev/auth/server";
+import { internal } from "./_generated/api";
+import { query, mutation, internalMutation } from "./_generated/server";
+import type { MutationCtx, QueryCtx } from "./_generated/server";
+import type { Id } from "./_generated/dataModel";
+import { normalizeEmail } from "./lib/email";
+
+// A checkout session is recorded when the Polar checkout opens and completed
+// by the webhook once the subscription it paid for is active (see
+// createOrUpdateSubscription). The app subscribes to it after a successful
+// payment and moves on as soon as it flips, instead of polling.
+
+// How long a checkout may stay open before its session expires
+const CHECKOUT_TTL_MS = 60 * 60 * 1000;
+// How long to wait for the webhook once the checkout reported success. Only
+// a backstop for a late or lost webhook, which normally arrives within
+// seconds; no longer than the 30 s the app used to poll for.
+const CONFIRMATION_TIMEOUT_MS = 30 * 1000;
+
+// The given session of the user, or their latest one. The id comes from the
+// success URL, so it is validated here rather than by the argument validator.
+async function sessionOf(ctx: QueryCtx, userId: Id<"users">, checkoutSessionId?: string) {
+  if (checkoutSessionId === undefined) {
+    return await ctx.db
+      .query("checkoutSessions")
+      .withIndex("by_user", (q) => q.eq("userId", userId))
+      .order("desc")
+      .first();
+  }
+  const id = ctx.db.normalizeId("checkoutSessions", checkoutSessionId);
+  const session = id ? await ctx.db.get(id) : null;
+  return session?.userId === userId ? session : null;
+}
+
+export const startCheckout = mutation({
+  args: {},
+  handler: async (ctx): Promise<Id<"checkoutSessions">> => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      throw new Error("Not authenticated");
+    }
+    const user = await ctx.db.get(userId);
+    if (!user?.email) {
+      throw new Error("No email on user");
+    }
+    const now = Date.now();
+    const checkoutSessionId = await ctx.db.insert("checkoutSessions", {
+      userId,
+      email: normalizeEmail(user.email),
+      status: "pending",
+      createdAt: now,
+      expiresAt: now + CHECKOUT_TTL_MS,
+    });
+    await ctx.scheduler.runAfter(CHECKOUT_TTL_MS, internal.checkout.expireCheckout, {
+      checkoutSessionId,
+      expiresAt: now + CHECKOUT_TTL_MS,
+    });
+    return checkoutSessionId;
+  },
+});
+
+// Called when the checkout reports a successful payment: from then on the
+// session only waits CONFIRMATION_TIMEOUT_MS for the webhook. Calling it
+// again does not extend the wait.
+export const reportCheckoutSuccess = mutation({
+  args: { checkoutSessionId: v.optional(v.string()) },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      throw new Error("Not authenticated");
+    }
+    const session = await sessionOf(ctx, userId, args.checkoutSessionId);
+    if (!session || session.status !== "pending") {
+      return;
+    }
+    const expiresAt = Date.now() + CONFIRMATION_TIMEOUT_MS;
+    if (expiresAt < session.expiresAt) {
+      await ctx.db.patch(session._id, { expiresAt });
+      await ctx.scheduler.runAfter(CONFIRMATION_TIMEOUT_MS, internal.checkout.expireCheckout, {
+        checkoutSessionId: session._id,
+        expiresAt,
+      });
+    }
+  },
+});
+
+export const getCheckoutSession = query({
+  args: { checkoutSessionId: v.optional(v.string()) },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      return null;
+    }
+    const session = await sessionOf(ctx, userId, args.checkoutSessionId);
+    if (!session) {
+      return null;
+    }
+    return { _id: session._id, status: session.status };
+  },
+});
+
+// Scheduled for a session's deadline; a no-op if it was resolved or its
+// deadline moved since
+export const expireCheckout = internalMutation({
+  args: { checkoutSessionId: v.id("checkoutSessions"), expiresAt: v.number() },
+  handler: async (ctx, args) => {
+    const session = await ctx.db.get(args.checkoutSessionId);
+    if (!session || session.status !== "pending" || session.expiresAt !== args.expiresAt) {
+      return;
+    }
+    await ctx.db.patch(session._id, { status: "expired", resolvedAt: Date.now() });
+  },
+});
+
+// Complete the pending sessions of the user who now has an active
+// subscription, found by their account or the email the checkout was for
+export async function completeCheckoutSessions(
+  ctx: MutationCtx,
+  email: string,
+  userId: Id<"users"> | undefined
+) {
+  const pending = await ctx.db
+    .query("checkoutSessions")
+    .withIndex("by_email_status", (q) =>
+      q.eq("email", normalizeEmail(email)).eq("status", "pending")
+    )
+    .collect();
+  if (userId) {
+    const ofUser = await ctx.db
+      .query("checkoutSessions")
+      .withIndex("by_user_status", (q) => q.eq("userId", userId).eq("status", "pending"))
+      .collect();
+    for (const session of ofUser) {
+      if (!pending.some((other) => other._id === session._id)) {
+        pending.push(session);
+      }
+    }
+  }
+  const now = Date.now();
+  for (const session of pending) {
+    await ctx.db.patch(session._id, { status: "completed", resolvedAt: now });
+  }
+}
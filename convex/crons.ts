@@ -0,0 +1,12 @@
+import { cronJobs } from "convex/server";
+import { internal } from "./_generated/api";
+
+const crons = cronJobs();
+
+// Drop expired AI chat replies from the response cache
+crons.hourly("evict expired chat responses", { minuteUTC: 0 }, internal.responseCache.evictExpired);
+
+// Restart purges of removed documents that stopped part way
+crons.interval("resume document purges", { minutes: 15 }, internal.documents.resumeDocumentPurges);
+
+export default crons;
@@ -1,19 +1,69 @@
 import { v } from "convex/values";
-import { mutation, query } from "./_generated/server";
+import { paginationOptsValidator } from "convex/server";
+import { internalMutation, internalQuery, mutation, query } from "./_generated/server";
+import type { MutationCtx } from "./_generated/server";
+import type { Doc, Id, TableNames } from "./_generated/dataModel";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { internal } from "./_generated/api";
+import { applyTextEdits, diffText, type TextEdit } from "./lib/textDiff";
+import { deleteDocumentSummary, syncDocumentSummary } from "./lib/documentSummary";
+import { deleteDocumentResponses } from "./responseCache";
 
+// Edits kept per document for editsSince; older clients reload the content.
+const MAX_EDIT_HISTORY = 200;
+
+// Rows deleted per purgeDocument run, well inside a mutation's limits
+const PURGE_BATCH = 500;
+// A purge that has not made progress for this long is restarted by
+// resumeDocumentPurges
+const PURGE_STALLED_MS = 10 * 60 * 1000;
+// Removed documents checked per resumeDocumentPurges run
+const RESUME_BATCH = 100;
+
+// Validator for TextEdit, also accepted by ai.chat for unsaved changes
+export const textEdit = v.object({
+  from: v.number(),
+  to: v.number(),
+  insert: v.string(),
+});
+
+function versionOf(document: Doc<"documents">) {
+  return document.version ?? 0;
+}
+
+// Store a new content version and its edits, dropping history beyond
+// MAX_EDIT_HISTORY.
+async function recordEdit(
+  ctx: MutationCtx,
+  documentId: Id<"documents">,
+  version: number,
+  changes: TextEdit[]
+) {
+  await ctx.db.insert("documentEdits", { documentId, version, changes });
+  const expired = await ctx.db
+    .query("documentEdits")
+    .withIndex("by_document_version", (q) =>
+      q.eq("documentId", documentId).lte("version", version - MAX_EDIT_HISTORY)
+    )
+    .collect();
+  for (const edit of expired) {
+    await ctx.db.delete(edit._id);
+  }
+}
+
+// Most recently edited first, a page at a time, straight from the index.
 export const list = query({
-  args: {},
-  handler: async (ctx) => {
+  args: { paginationOpts: paginationOptsValidator },
+  handler: async (ctx, args) => {
     const userId = await getAuthUserId(ctx);
     if (!userId) {
-      return [];
+      return { page: [], isDone: true, continueCursor: "" };
     }
-    const documents = await ctx.db
-      .query("documents")
-      .withIndex("by_user", (q) => q.eq("userId", userId))
-      .collect();
-    return documents.sort((a, b) => b.updatedAt - a.updatedAt);
+    return await ctx.db
+      .query("documentSummaries")
+      .withIndex("by_user_updatedAt", (q) => q.eq("userId", userId))
+      .order("desc")
+      .paginate(args.paginationOpts);
   },
 });
 
@@ -25,13 +75,70 @@ export const get = query({
       return null;
     }
     const document = await ctx.db.get(args.id);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       return null;
     }
     return document;
   },
 });
 
+// Everything but the content, for views that must not be re-sent the whole
+// document on every edit.
+export const getMeta = query({
+  args: { id: v.id("documents") },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      return null;
+    }
+    const document = await ctx.db.get(args.id);
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      return null;
+    }
+    return {
+      _id: document._id,
+      _creationTime: document._creationTime,
+      title: document.title,
+      updatedAt: document.updatedAt,
+      aiSystemInstructions: document.aiSystemInstructions,
+      version: versionOf(document),
+    };
+  },
+});
+
+// Content edits after sinceVersion, oldest first. When the history no longer
+// reaches back that far the current content is returned instead.
+export const editsSince = query({
+  args: { id: v.id("documents"), sinceVersion: v.number() },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      return null;
+    }
+    const document = await ctx.db.get(args.id);
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      return null;
+    }
+    const version = versionOf(document);
+    if (args.sinceVersion >= version) {
+      return { version, edits: [] };
+    }
+    const edits = await ctx.db
+      .query("documentEdits")
+      .withIndex("by_document_version", (q) =>
+        q.eq("documentId", args.id).gt("version", args.sinceVersion)
+      )
+      .collect();
+    if (edits.length !== version - args.sinceVersion) {
+      return { version, content: document.content };
+    }
+    return {
+      version,
+      edits: edits.map(({ version, changes }) => ({ version, changes })),
+    };
+  },
+});
+
 export const create = mutation({
   args: { title: v.optional(v.string()) },
   handler: async (ctx, args) => {
@@ -44,7 +151,9 @@ export const create = mutation({
       title: args.title ?? "Untitled Document",
       content: "",
       updatedAt: Date.now(),
+      version: 0,
     });
+    await syncDocumentSummary(ctx, (await ctx.db.get(documentId))!);
     return documentId;
   },
 });
@@ -62,25 +171,71 @@ export const update = mutation({
       throw new Error("Not authenticated");
     }
     const document = await ctx.db.get(args.id);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Document not found");
     }
-    const updates: { title?: string; content?: string; aiSystemInstructions?: string; updatedAt: number } = {
+    const updates: { title?: string; content?: string; aiSystemInstructions?: string; updatedAt: number; version?: number } = {
       updatedAt: Date.now(),
     };
     if (args.title !== undefined) {
       updates.title = args.title;
     }
-    if (args.content !== undefined) {
+    if (args.content !== undefined && args.content !== document.content) {
       updates.content = args.content;
+      updates.version = versionOf(document) + 1;
+      // Logged as the changed range only, so the edit history and editsSince
+      // subscribers do not get a copy of the whole document on every save
+      await recordEdit(ctx, args.id, updates.version, diffText(document.content, args.content));
     }
     if (args.aiSystemInstructions !== undefined) {
       updates.aiSystemInstructions = args.aiSystemInstructions;
     }
     await ctx.db.patch(args.id, updates);
+    await syncDocumentSummary(ctx, { ...document, ...updates }, updates.content !== undefined);
+    return updates.version ?? versionOf(document);
+  },
+});
+
+// Apply content edits made against baseVersion. Another client having saved
+// in between is reported as a conflict rather than merged; the caller then
+// falls back to a full update.
+export const applyEdits = mutation({
+  args: {
+    id: v.id("documents"),
+    baseVersion: v.number(),
+    edits: v.array(textEdit),
+  },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      throw new Error("Not authenticated");
+    }
+    const document = await ctx.db.get(args.id);
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      throw new Error("Document not found");
+    }
+    const current = versionOf(document);
+    if (args.baseVersion !== current) {
+      return { conflict: true, version: current };
+    }
+    if (args.edits.length === 0) {
+      return { conflict: false, version: current };
+    }
+    const version = current + 1;
+    const updates = {
+      content: applyTextEdits(document.content, args.edits),
+      version,
+      updatedAt: Date.now(),
+    };
+    await ctx.db.patch(args.id, updates);
+    await recordEdit(ctx, args.id, version, args.edits);
+    await syncDocumentSummary(ctx, { ...document, ...updates });
+    return { conflict: false, version };
   },
 });
 
+// Hide the document at once and purge it and everything attached to it in
+// the background, however much there is.
 export const remove = mutation({
   args: { id: v.id("documents") },
   handler: async (ctx, args) => {
@@ -89,27 +244,162 @@ export const remove = mutation({
       throw new Error("Not authenticated");
     }
     const document = await ctx.db.get(args.id);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Document not found");
     }
-    // Delete associated knowledge items
-    const knowledgeItems = await ctx.db
-      .query("knowledge")
-      .withIndex("by_document", (q) => q.eq("documentId", args.id))
-      .collect();
-    for (const item of knowledgeItems) {
-      await ctx.db.delete(item._id);
+    const now = Date.now();
+    await ctx.db.patch(args.id, { deletedAt: now, purgedRows: 0, purgeUpdatedAt: now });
+    await deleteDocumentSummary(ctx, args.id);
+    await ctx.scheduler.runAfter(0, internal.documents.purgeDocument, { documentId: args.id });
+  },
+});
+
+// Cache the chat text of a document version computed by ai.chat. Only the
+// latest version is kept; a version superseded in the meantime is dropped.
+export const cacheText = internalMutation({
+  args: {
+    documentId: v.id("documents"),
+    version: v.number(),
+    text: v.string(),
+  },
+  handler: async (ctx, args) => {
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.deletedAt !== undefined || versionOf(document) !== args.version) {
+      return;
     }
-    // Delete associated messages
-    const messages = await ctx.db
+    const existing = await ctx.db
+      .query("documentTexts")
+      .withIndex("by_document", (q) => q.eq("documentId", args.documentId))
+      .unique();
+    if (!existing) {
+      await ctx.db.insert("documentTexts", args);
+    } else if (existing.version !== args.version) {
+      await ctx.db.patch(existing._id, { version: args.version, text: args.text });
+    }
+  },
+});
+
+async function deleteRows(ctx: MutationCtx, rows: { _id: Id<TableNames> }[]) {
+  for (const row of rows) {
+    await ctx.db.delete(row._id);
+  }
+  return rows.length;
+}
+
+// What hangs off a document, in purge order. Knowledge goes before its
+// embeddings so an embedding saved late finds its item gone and is dropped.
+const PURGE_STEPS: ((
+  ctx: MutationCtx,
+  documentId: Id<"documents">,
+  limit: number
+) => Promise<number>)[] = [
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
+      .query("knowledge")
+      .withIndex("by_document", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
+      .query("knowledgeEmbeddings")
+      .withIndex("by_document", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
       .query("messages")
-      .withIndex("by_document", (q) => q.eq("documentId", args.id))
-      .collect();
-    for (const message of messages) {
-      await ctx.db.delete(message._id);
+      .withIndex("by_document", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
+      .query("chatSummaries")
+      .withIndex("by_document", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
+      .query("documentEdits")
+      .withIndex("by_document_version", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  async (ctx, documentId, limit) =>
+    deleteRows(ctx, await ctx.db
+      .query("documentTexts")
+      .withIndex("by_document", (q) => q.eq("documentId", documentId))
+      .take(limit)),
+  deleteDocumentResponses,
+];
+
+// Delete up to PURGE_BATCH rows of a removed document and schedule the next
+// batch; once nothing is left, delete the document itself. Progress is
+// counted on the document (see purgeProgress).
+export const purgeDocument = internalMutation({
+  args: { documentId: v.id("documents") },
+  handler: async (ctx, args): Promise<{ deleted: number; isDone: boolean }> => {
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.deletedAt === undefined) {
+      return { deleted: 0, isDone: true };
+    }
+    let deleted = 0;
+    for (const step of PURGE_STEPS) {
+      if (deleted >= PURGE_BATCH) break;
+      deleted += await step(ctx, args.documentId, PURGE_BATCH - deleted);
+    }
+    if (deleted === 0) {
+      await ctx.db.delete(args.documentId);
+      return { deleted, isDone: true };
+    }
+    await ctx.db.patch(args.documentId, {
+      purgedRows: (document.purgedRows ?? 0) + deleted,
+      purgeUpdatedAt: Date.now(),
+    });
+    await ctx.scheduler.runAfter(0, internal.documents.purgeDocument, args);
+    return { deleted, isDone: false };
+  },
+});
+
+// Restart purges that stopped making progress, e.g. after a failed batch.
+// Walks every removed document a page at a time, scheduling the next page
+// itself. A restarted purge counts as progress, so an overlapping run does
+// not start a second chain for it. Run from crons.ts.
+export const resumeDocumentPurges = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ resumed: number; isDone: boolean }> => {
+    const now = Date.now();
+    const page = await ctx.db
+      .query("documents")
+      .withIndex("by_deletedAt", (q) => q.gte("deletedAt", 0))
+      .paginate({ numItems: RESUME_BATCH, cursor: args.cursor ?? null });
+    let resumed = 0;
+    for (const document of page.page) {
+      if ((document.purgeUpdatedAt ?? document.deletedAt ?? 0) < now - PURGE_STALLED_MS) {
+        await ctx.db.patch(document._id, { purgeUpdatedAt: now });
+        await ctx.scheduler.runAfter(0, internal.documents.purgeDocument, {
+          documentId: document._id,
+        });
+        resumed++;
+      }
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.documents.resumeDocumentPurges, {
+        cursor: page.continueCursor,
+      });
     }
-    // Delete the document
-    await ctx.db.delete(args.id);
+    return { resumed, isDone: page.isDone };
   },
 });
 
+// Removed documents still being purged:
+//
+//   npx convex run documents:purgeProgress
+export const purgeProgress = internalQuery({
+  args: {},
+  handler: async (ctx) => {
+    const removed = await ctx.db
+      .query("documents")
+      .withIndex("by_deletedAt", (q) => q.gte("deletedAt", 0))
+      .take(100);
+    return removed.map((document) => ({
+      documentId: document._id,
+      deletedAt: document.deletedAt,
+      purgedRows: document.purgedRows ?? 0,
+      lastProgressAt: document.purgeUpdatedAt,
+    }));
+  },
+});
@@ -1,6 +1,14 @@
 import { v } from "convex/values";
-import { mutation, query } from "./_generated/server";
+import {
+  internalAction,
+  internalMutation,
+  internalQuery,
+  mutation,
+  query,
+} from "./_generated/server";
+import { internal } from "./_generated/api";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { getEmbedder, hashText, knowledgeText } from "./lib/embeddings";
 
 export const list = query({
   args: { documentId: v.id("documents") },
@@ -11,7 +19,7 @@ export const list = query({
     }
     // Verify document ownership
     const document = await ctx.db.get(args.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       return [];
     }
     return await ctx.db
@@ -34,14 +42,17 @@ export const create = mutation({
     }
     // Verify document ownership
     const document = await ctx.db.get(args.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Document not found");
     }
-    return await ctx.db.insert("knowledge", {
+    const knowledgeId = await ctx.db.insert("knowledge", {
       documentId: args.documentId,
       title: args.title,
       content: args.content,
+      embeddingPending: true,
     });
+    await ctx.scheduler.runAfter(0, internal.knowledge.embed, { knowledgeIds: [knowledgeId] });
+    return knowledgeId;
   },
 });
 
@@ -62,17 +73,26 @@ export const update = mutation({
     }
     // Verify document ownership
     const document = await ctx.db.get(knowledge.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Not authorized");
     }
-    const updates: { title?: string; content?: string } = {};
+    const updates: { title?: string; content?: string; embeddingPending?: boolean } = {};
     if (args.title !== undefined) {
       updates.title = args.title;
     }
     if (args.content !== undefined) {
       updates.content = args.content;
     }
+    const reembed =
+      (updates.title ?? knowledge.title) !== knowledge.title ||
+      (updates.content ?? knowledge.content) !== knowledge.content;
+    if (reembed) {
+      updates.embeddingPending = true;
+    }
     await ctx.db.patch(args.id, updates);
+    if (reembed) {
+      await ctx.scheduler.runAfter(0, internal.knowledge.embed, { knowledgeIds: [args.id] });
+    }
   },
 });
 
@@ -89,10 +109,87 @@ export const remove = mutation({
     }
     // Verify document ownership
     const document = await ctx.db.get(knowledge.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Not authorized");
     }
+    const embedding = await ctx.db
+      .query("knowledgeEmbeddings")
+      .withIndex("by_knowledge", (q) => q.eq("knowledgeId", args.id))
+      .unique();
+    if (embedding) {
+      await ctx.db.delete(embedding._id);
+    }
     await ctx.db.delete(args.id);
   },
 });
 
+export const getForEmbedding = internalQuery({
+  args: { knowledgeIds: v.array(v.id("knowledge")) },
+  handler: async (ctx, args) => {
+    const items = [];
+    for (const id of args.knowledgeIds) {
+      const item = await ctx.db.get(id);
+      if (item) {
+        items.push({ _id: item._id, text: knowledgeText(item) });
+      }
+    }
+    return items;
+  },
+});
+
+// Embed knowledge items in one embedder call. Scheduled by create and update
+// and by migrations:backfillKnowledgeEmbeddings.
+export const embed = internalAction({
+  args: { knowledgeIds: v.array(v.id("knowledge")) },
+  handler: async (ctx, args): Promise<void> => {
+    const items = await ctx.runQuery(internal.knowledge.getForEmbedding, args);
+    if (items.length === 0) {
+      return;
+    }
+    const embeddings = await getEmbedder().embed(items.map((item) => item.text));
+    await ctx.runMutation(internal.knowledge.saveEmbeddings, {
+      embeddings: items.map((item, index) => ({
+        knowledgeId: item._id,
+        embedding: embeddings[index],
+        textHash: hashText(item.text),
+      })),
+    });
+  },
+});
+
+export const saveEmbeddings = internalMutation({
+  args: {
+    embeddings: v.array(
+      v.object({
+        knowledgeId: v.id("knowledge"),
+        embedding: v.array(v.float64()),
+        textHash: v.number(),
+      })
+    ),
+  },
+  handler: async (ctx, args) => {
+    for (const { knowledgeId, embedding, textHash } of args.embeddings) {
+      const item = await ctx.db.get(knowledgeId);
+      // Deleted, or edited while embedding; the newer embed saves instead.
+      if (!item || hashText(knowledgeText(item)) !== textHash) {
+        continue;
+      }
+      const existing = await ctx.db
+        .query("knowledgeEmbeddings")
+        .withIndex("by_knowledge", (q) => q.eq("knowledgeId", knowledgeId))
+        .unique();
+      if (existing) {
+        await ctx.db.patch(existing._id, { embedding, textHash });
+      } else {
+        await ctx.db.insert("knowledgeEmbeddings", {
+          knowledgeId,
+          documentId: item.documentId,
+          embedding,
+          textHash,
+        });
+      }
+      await ctx.db.patch(knowledgeId, { embeddingPending: false });
+    }
+  },
+});
+
@@ -0,0 +1,93 @@
+// The dashboard's view of a document, kept in documentSummaries by the
+// document mutations so listing documents never reads their content.
+import type { MutationCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+
+const PREVIEW_LENGTH = 160;
+
+const ENTITIES: Record<string, string> = {
+  amp: "&",
+  lt: "<",
+  gt: ">",
+  quot: '"',
+  apos: "'",
+  nbsp: " ",
+};
+
+// Decode the entities TipTap emits
+export function decodeEntities(text: string): string {
+  return text.replace(/&(#\d+|#x[\da-f]+|\w+);/gi, (entity, name: string) => {
+    if (name[0] === "#") {
+      const code = name[1].toLowerCase() === "x"
+        ? parseInt(name.slice(2), 16)
+        : parseInt(name.slice(1), 10);
+      return code <= 0x10ffff ? String.fromCodePoint(code) : entity;
+    }
+    return ENTITIES[name.toLowerCase()] ?? entity;
+  });
+}
+
+// Plain text of the editor's HTML on one line: block boundaries become
+// spaces and tags go.
+export function htmlToText(html: string): string {
+  return decodeEntities(
+    html
+      .replace(/<\/(p|h[1-6]|li|blockquote|pre)>|<br\s*\/?>/gi, " ")
+      .replace(/<[^>]*>/g, "")
+  )
+    .replace(/\s+/g, " ")
+    .trim();
+}
+
+export function summarizeContent(content: string) {
+  const text = htmlToText(content);
+  let preview = text;
+  if (preview.length > PREVIEW_LENGTH) {
+    const cut = preview.lastIndexOf(" ", PREVIEW_LENGTH);
+    preview = preview.slice(0, cut > 0 ? cut : PREVIEW_LENGTH) + "…";
+  }
+  return {
+    size: new TextEncoder().encode(content).length,
+    wordCount: text ? text.split(" ").length : 0,
+    preview,
+  };
+}
+
+// Create or refresh the summary of a document after it was written. The
+// content is only re-summarized when it may have changed.
+export async function syncDocumentSummary(
+  ctx: MutationCtx,
+  document: Doc<"documents">,
+  contentChanged = true
+) {
+  const existing = await ctx.db
+    .query("documentSummaries")
+    .withIndex("by_document", (q) => q.eq("documentId", document._id))
+    .unique();
+  const summary = {
+    userId: document.userId,
+    title: document.title,
+    updatedAt: document.updatedAt,
+  };
+  if (!existing) {
+    await ctx.db.insert("documentSummaries", {
+      documentId: document._id,
+      ...summary,
+      ...summarizeContent(document.content),
+    });
+  } else if (contentChanged) {
+    await ctx.db.patch(existing._id, { ...summary, ...summarizeContent(document.content) });
+  } else {
+    await ctx.db.patch(existing._id, summary);
+  }
+}
+
+export async function deleteDocumentSummary(ctx: MutationCtx, documentId: Id<"documents">) {
+  const existing = await ctx.db
+    .query("documentSummaries")
+    .withIndex("by_document", (q) => q.eq("documentId", documentId))
+    .unique();
+  if (existing) {
+    await ctx.db.delete(existing._id);
+  }
+}
@@ -0,0 +1,24 @@
+// Compact Markdown-like text of the editor's HTML, which is what ai.chat
+// puts in the prompt: headings, list items and quotes keep their markers,
+// blocks are separated by blank lines and all other markup goes. The text of
+// the latest saved version is cached in documentTexts.
+import { decodeEntities } from "./documentSummary";
+
+export function documentToText(html: string): string {
+  const text = html
+    .replace(/<h([1-6])\b[^>]*>/gi, (_, level: string) => `\n\n${"#".repeat(Number(level))} `)
+    .replace(/<li\b[^>]*>/gi, "\n- ")
+    .replace(/<blockquote\b[^>]*>/gi, "\n\n> ")
+    .replace(/<\/?(strong|b)>/gi, "**")
+    .replace(/<\/?(em|i)>/gi, "_")
+    .replace(/<\/?code>/gi, "`")
+    .replace(/<br\s*\/?>/gi, "\n")
+    .replace(/<\/(p|h[1-6]|li|blockquote|pre|ul|ol)>/gi, "\n\n")
+    .replace(/<[^>]*>/g, "");
+  return decodeEntities(text)
+    .split("\n")
+    .map((line) => line.replace(/[ \t ]+/g, " ").trim())
+    .join("\n")
+    .replace(/\n{3,}/g, "\n\n")
+    .trim();
+}
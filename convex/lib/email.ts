@@ -0,0 +1,5 @@
+// Emails are matched case-insensitively: users.normalizedEmail holds this
+// form of users.email and is what lookups by email go through.
+export function normalizeEmail(email: string) {
+  return email.trim().toLowerCase();
+}
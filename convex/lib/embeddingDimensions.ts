@@ -0,0 +1,3 @@
+// Length of the knowledge embedding vectors. Kept apart from embeddings.ts
+// so the schema's vector index can use it without importing the OpenAI SDK.
+export const EMBEDDING_DIMENSIONS = 256;
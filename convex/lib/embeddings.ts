@@ -0,0 +1,76 @@
+// Text embeddings for knowledge retrieval. EMBEDDING_PROVIDER picks the
+// embedder: "openai" (text-embedding-3-small, shortened to
+// EMBEDDING_DIMENSIONS) or "local", a deterministic hashed bag of words that
+// needs no network. Without the variable OpenAI is used whenever
+// OPENAI_API_KEY is set. Vectors from different embedders are not
+// comparable, so re-embed (migrations:backfillKnowledgeEmbeddings) after
+// switching.
+import { EMBEDDING_DIMENSIONS } from "./embeddingDimensions";
+import { createOpenAI } from "./openai";
+
+export interface Embedder {
+  name: string;
+  embed(texts: string[]): Promise<number[][]>;
+}
+
+// 32-bit FNV-1a
+export function hashText(text: string): number {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+function normalize(vector: number[]): number[] {
+  const length = Math.hypot(...vector);
+  return length > 0 ? vector.map((value) => value / length) : vector;
+}
+
+// Each word adds ±1 to the dimension its hash selects, so texts sharing
+// words point the same way. Crude, but stable across runs and machines.
+export function localEmbedding(text: string): number[] {
+  const vector = new Array<number>(EMBEDDING_DIMENSIONS).fill(0);
+  for (const word of text.toLowerCase().match(/[\p{L}\p{N}]+/gu) ?? []) {
+    const hash = hashText(word);
+    vector[hash % EMBEDDING_DIMENSIONS] += hash & 0x80000000 ? -1 : 1;
+  }
+  return normalize(vector);
+}
+
+export const localEmbedder: Embedder = {
+  name: "local",
+  embed: async (texts) => texts.map(localEmbedding),
+};
+
+export const openAIEmbedder: Embedder = {
+  name: "openai",
+  embed: async (texts) => {
+    const response = await createOpenAI().embeddings.create({
+      model: "text-embedding-3-small",
+      input: texts,
+      dimensions: EMBEDDING_DIMENSIONS,
+    });
+    return response.data
+      .sort((a, b) => a.index - b.index)
+      .map((item) => item.embedding);
+  },
+};
+
+export function getEmbedder(): Embedder {
+  const provider =
+    process.env.EMBEDDING_PROVIDER ?? (process.env.OPENAI_API_KEY ? "openai" : "local");
+  if (provider === "openai") {
+    return openAIEmbedder;
+  }
+  if (provider === "local") {
+    return localEmbedder;
+  }
+  throw new Error(`Unknown EMBEDDING_PROVIDER: ${provider}`);
+}
+
+// What gets embedded for a knowledge item
+export function knowledgeText(item: { title: string; content: string }) {
+  return `${item.title}\n${item.content}`;
+}
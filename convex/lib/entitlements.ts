@@ -0,0 +1,123 @@
+// What a user's subscription entitles them to, denormalized into one
+// entitlements row per user so users.session reads a single document. The
+// mutations that write subscriptions, link them or change a user's email
+// call syncEntitlement (or syncSubscriptionEntitlement) afterwards.
+import type { MutationCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+import { normalizeEmail } from "./email";
+
+export interface Entitlement {
+  status: Doc<"subscriptions">["status"];
+  hasActiveSubscription: boolean;
+  currentPeriodEnd?: number;
+  // The subscription was found by email and is not linked to the user yet
+  needsLinking: boolean;
+}
+
+// The subscription bought with an email, in any case or spacing. Rows from
+// before normalizedEmail existed are still found by their exact email.
+export async function subscriptionByEmail(ctx: QueryCtx, email: string) {
+  const subscription = await ctx.db
+    .query("subscriptions")
+    .withIndex("by_normalized_email", (q) => q.eq("normalizedEmail", normalizeEmail(email)))
+    .first();
+  if (subscription) {
+    return subscription;
+  }
+  return await ctx.db
+    .query("subscriptions")
+    .withIndex("by_email", (q) => q.eq("email", email))
+    .first();
+}
+
+// The user signed up with an email, in any case or spacing. Users from
+// before normalizedEmail existed are still found by their exact email.
+export async function userByEmail(ctx: QueryCtx, email: string) {
+  const user = await ctx.db
+    .query("users")
+    .withIndex("by_normalized_email", (q) => q.eq("normalizedEmail", normalizeEmail(email)))
+    .first();
+  if (user) {
+    return user;
+  }
+  return await ctx.db
+    .query("users")
+    .withIndex("email", (q) => q.eq("email", email))
+    .first();
+}
+
+// The user's own subscription or, failing that, one bought with their email
+async function subscriptionFor(ctx: QueryCtx, userId: Id<"users">) {
+  const linked = await ctx.db
+    .query("subscriptions")
+    .withIndex("by_user", (q) => q.eq("userId", userId))
+    .first();
+  if (linked) {
+    return linked;
+  }
+  const user = await ctx.db.get(userId);
+  if (!user?.email) {
+    return null;
+  }
+  return await subscriptionByEmail(ctx, user.email);
+}
+
+async function computeEntitlement(ctx: QueryCtx, userId: Id<"users">): Promise<Entitlement> {
+  const subscription = await subscriptionFor(ctx, userId);
+  if (!subscription) {
+    return { status: "none", hasActiveSubscription: false, needsLinking: false };
+  }
+  return {
+    status: subscription.status,
+    hasActiveSubscription: subscription.status === "active",
+    currentPeriodEnd: subscription.currentPeriodEnd,
+    needsLinking: !subscription.userId,
+  };
+}
+
+// The stored entitlement, or the computed one for users it has not been
+// written for yet
+export async function entitlementOf(ctx: QueryCtx, userId: Id<"users">): Promise<Entitlement> {
+  const stored = await ctx.db
+    .query("entitlements")
+    .withIndex("by_user", (q) => q.eq("userId", userId))
+    .unique();
+  if (!stored) {
+    return await computeEntitlement(ctx, userId);
+  }
+  const { status, hasActiveSubscription, currentPeriodEnd, needsLinking } = stored;
+  return { status, hasActiveSubscription, currentPeriodEnd, needsLinking };
+}
+
+// Recompute a user's entitlement, writing only if it changed so sessions
+// are not invalidated for nothing
+export async function syncEntitlement(ctx: MutationCtx, userId: Id<"users">) {
+  const entitlement = await computeEntitlement(ctx, userId);
+  const stored = await ctx.db
+    .query("entitlements")
+    .withIndex("by_user", (q) => q.eq("userId", userId))
+    .unique();
+  if (!stored) {
+    await ctx.db.insert("entitlements", { userId, ...entitlement });
+  } else if (
+    stored.status !== entitlement.status ||
+    stored.hasActiveSubscription !== entitlement.hasActiveSubscription ||
+    stored.currentPeriodEnd !== entitlement.currentPeriodEnd ||
+    stored.needsLinking !== entitlement.needsLinking
+  ) {
+    await ctx.db.replace(stored._id, { userId, ...entitlement });
+  }
+}
+
+// After a subscription was written: sync its user, or the user signed up
+// with its email if it is not linked yet
+export async function syncSubscriptionEntitlement(
+  ctx: MutationCtx,
+  subscription: Doc<"subscriptions">
+) {
+  const userId =
+    subscription.userId ?? (await userByEmail(ctx, subscription.email))?._id;
+  if (userId) {
+    await syncEntitlement(ctx, userId);
+  }
+}
@@ -0,0 +1,10 @@
+import OpenAI from "openai";
+
+// OPENAI_BASE_URL points the client at a compatible server such as the e2e
+// suite's mock.
+export function createOpenAI() {
+  return new OpenAI({
+    apiKey: process.env.OPENAI_API_KEY,
+    baseURL: process.env.OPENAI_BASE_URL,
+  });
+}
@@ -0,0 +1,354 @@
+// Prompt assembly for ai.chat under a token budget. The fixed instructions
+// and the user's message are always sent; what remains is shared between the
+// custom instructions, selected-text snippets, the document, knowledge and
+// the conversation so far, each trimmed by relevance to fit its share.
+// buildChatPrompt reports how many tokens each part ended up with.
+
+// Input tokens per request, well inside gpt-4o-mini's window; larger prompts
+// mostly cost latency.
+export const PROMPT_TOKEN_BUDGET = 12_000;
+
+// Shares of the budget left after the fixed parts. A part needing less than
+// its share passes the rest on, document first, then knowledge and history.
+const SHARES = {
+  instructions: 0.1,
+  snippets: 0.1,
+  document: 0.4,
+  knowledge: 0.2,
+  history: 0.2,
+};
+
+// Below this a truncated piece is not worth sending
+const MIN_PIECE_TOKENS = 32;
+
+// About four characters per token for English with the GPT-4o tokenizer; no
+// tokenizer is bundled, so this is an estimate.
+export function estimateTokens(text: string): number {
+  return Math.ceil(text.length / 4);
+}
+
+export function truncateToTokens(text: string, tokens: number): string {
+  if (estimateTokens(text) <= tokens) {
+    return text;
+  }
+  const limit = Math.max(0, tokens * 4 - 1);
+  const cut = text.lastIndexOf(" ", limit);
+  return text.slice(0, cut > limit / 2 ? cut : limit) + "…";
+}
+
+function words(text: string): Set<string> {
+  return new Set(text.toLowerCase().match(/[\p{L}\p{N}]{3,}/gu) ?? []);
+}
+
+// Blocks of the document's text (see documentToText), in document order
+export function documentSections(text: string): string[] {
+  return text
+    .split(/\n{2,}/)
+    .map((section) => section.trim())
+    .filter((section) => section.length > 0);
+}
+
+// Selected text is plain, so snippets and sections are compared without the
+// Markdown markers
+function plain(text: string) {
+  return text
+    .replace(/^(#{1,6}|-|>) /gm, "")
+    .replace(/\*\*|[_`]/g, "")
+    .replace(/\s+/g, " ")
+    .trim()
+    .toLowerCase();
+}
+
+// Keep the document sections most relevant to the message and snippets:
+// those containing a snippet and their neighbours, then those sharing the
+// most words with the message, later sections winning ties. Kept sections
+// stay in document order with gaps marked.
+function fitDocument(sections: string[], query: string, snippets: string[], budget: number) {
+  const all = sections.join("\n\n");
+  if (estimateTokens(all) <= budget) {
+    return all;
+  }
+  const queryWords = words(query);
+  const selected = snippets.map(plain).filter(Boolean);
+  const scores = sections.map((section) => {
+    const sectionWords = words(section);
+    let shared = 0;
+    for (const word of sectionWords) {
+      if (queryWords.has(word)) shared++;
+    }
+    return sectionWords.size > 0 ? shared / Math.sqrt(sectionWords.size) : 0;
+  });
+  sections.forEach((section, index) => {
+    const text = plain(section);
+    if (selected.some((snippet) => text.includes(snippet) || snippet.includes(text))) {
+      scores[index] += 100;
+      if (index > 0) scores[index - 1] += 50;
+      if (index < sections.length - 1) scores[index + 1] += 50;
+    }
+  });
+  const ranked = sections
+    .map((_, index) => index)
+    .sort((a, b) => scores[b] - scores[a] || b - a);
+
+  const kept = new Map<number, string>();
+  let used = 0;
+  for (const index of ranked) {
+    const cost = estimateTokens(sections[index]) + 1;
+    if (used + cost <= budget) {
+      kept.set(index, sections[index]);
+      used += cost;
+    }
+  }
+  // No section fits whole, e.g. pasted text without paragraph breaks: send
+  // the most relevant one truncated rather than nothing
+  if (kept.size === 0 && ranked.length > 0 && budget - 1 >= MIN_PIECE_TOKENS) {
+    kept.set(ranked[0], truncateToTokens(sections[ranked[0]], budget - 1));
+  }
+  const parts: string[] = [];
+  let previous = -1;
+  for (let index = 0; index < sections.length; index++) {
+    const section = kept.get(index);
+    if (section === undefined) continue;
+    if (index !== previous + 1) parts.push("[…]");
+    parts.push(section);
+    previous = index;
+  }
+  if (previous !== sections.length - 1 && parts.length > 0) parts.push("[…]");
+  return parts.join("\n\n");
+}
+
+// Whole pieces in the given (relevance) order while they fit, then the next
+// one truncated if enough room is left.
+function fitPieces(pieces: string[], budget: number) {
+  const kept: string[] = [];
+  let used = 0;
+  for (const piece of pieces) {
+    const cost = estimateTokens(piece);
+    if (used + cost <= budget) {
+      kept.push(piece);
+      used += cost;
+      continue;
+    }
+    if (budget - used >= MIN_PIECE_TOKENS) {
+      kept.push(truncateToTokens(piece, budget - used));
+    }
+    break;
+  }
+  return { kept, dropped: pieces.length - kept.length };
+}
+
+// Give each part up to its share, then hand what is left to the parts that
+// still need more.
+function allocate(needs: Record<keyof typeof SHARES, number>, available: number) {
+  const budgets = { instructions: 0, snippets: 0, document: 0, knowledge: 0, history: 0 };
+  let left = available;
+  for (const part of Object.keys(SHARES) as (keyof typeof SHARES)[]) {
+    budgets[part] = Math.min(needs[part], Math.floor(available * SHARES[part]));
+    left -= budgets[part];
+  }
+  for (const part of ["document", "knowledge", "history", "snippets", "instructions"] as const) {
+    const extra = Math.min(needs[part] - budgets[part], left);
+    budgets[part] += extra;
+    left -= extra;
+  }
+  return budgets;
+}
+
+export interface ChatTurn {
+  role: "user" | "assistant";
+  content: string;
+}
+
+// The summary of older turns gets up to half of the history budget; the
+// rest goes to the latest turns, newest first and whole, so the model never
+// sees a turn without the ones after it. Only a newest turn too long on its
+// own is truncated.
+function fitHistory(summary: string, turns: ChatTurn[], budget: number) {
+  const fittedSummary =
+    estimateTokens(summary) <= budget / 2
+      ? summary
+      : budget / 2 >= MIN_PIECE_TOKENS
+        ? truncateToTokens(summary, Math.floor(budget / 2))
+        : "";
+  let left = budget - estimateTokens(fittedSummary);
+  const kept: ChatTurn[] = [];
+  for (let index = turns.length - 1; index >= 0; index--) {
+    const turn = turns[index];
+    const cost = estimateTokens(turn.content) + 4;
+    if (cost <= left) {
+      kept.unshift(turn);
+      left -= cost;
+      continue;
+    }
+    if (kept.length === 0 && left - 4 >= MIN_PIECE_TOKENS) {
+      kept.unshift({ role: turn.role, content: truncateToTokens(turn.content, left - 4) });
+    }
+    break;
+  }
+  return { summary: fittedSummary, turns: kept };
+}
+
+function snippetLine(snippet: string, index: number) {
+  return `[Selected Text ${index + 1}]: "${snippet}"`;
+}
+
+// The user's message as stored in the chat: selected text first, then the
+// question.
+export function withSnippets(message: string, snippets: string[]) {
+  if (snippets.length === 0) {
+    return message;
+  }
+  return `${snippets.map(snippetLine).join("\n")}\n\n${message}`;
+}
+
+export interface ChatPromptInput {
+  userMessage: string;
+  snippets: string[];
+  // The document as compact text, from documentToText
+  documentText: string;
+  // Most relevant first
+  knowledge: { title: string; content: string }[];
+  globalInstructions: string;
+  documentInstructions: string;
+  // Rolling summary of the turns before history
+  conversationSummary?: string;
+  // Latest turns of the chat, oldest first
+  history?: ChatTurn[];
+  budget?: number;
+}
+
+export interface PromptBreakdown {
+  budget: number;
+  total: number;
+  base: number;
+  userMessage: number;
+  instructions: number;
+  snippets: number;
+  document: number;
+  knowledge: number;
+  history: number;
+  // Parts that did not fit whole
+  trimmed: string[];
+}
+
+const INTRO =
+  "You are an intelligent writing assistant helping users write and edit documents. You have access to reference knowledge that the user has provided to inform your writing.";
+
+const GUIDELINES = `When the user asks you to write or edit content:
+1. Consider the existing document content and any reference knowledge provided
+2. Match the tone and style of the existing document when adding content
+3. Be helpful and provide well-structured, clear writing
+4. If asked to edit specific sections, make targeted changes
+5. You can suggest improvements or ask clarifying questions if needed
+6. Follow any custom instructions provided by the user above
+
+Respond with the text you've written or edited. If providing a full replacement or addition, make it clear where it should go in the document.`;
+
+export function buildChatPrompt(input: ChatPromptInput) {
+  const budget = input.budget ?? PROMPT_TOKEN_BUDGET;
+  const trimmed: string[] = [];
+
+  const base = estimateTokens(INTRO) + estimateTokens(GUIDELINES) + 20;
+  const question = input.userMessage;
+  const available = Math.max(0, budget - base - estimateTokens(question));
+
+  const instructionPieces = [
+    input.globalInstructions && `\n### User's Global Guidelines:\n${input.globalInstructions}\n`,
+    input.documentInstructions && `\n### Document-Specific Guidelines:\n${input.documentInstructions}\n`,
+  ].filter(Boolean) as string[];
+  const snippetPieces = input.snippets.map(snippetLine);
+  const sections = documentSections(input.documentText);
+  const knowledgePieces = input.knowledge.map(
+    (item) => `\n### ${item.title}\n${item.content}\n`
+  );
+
+  const conversationSummary = input.conversationSummary ?? "";
+  const turns = input.history ?? [];
+
+  const sum = (pieces: string[]) =>
+    pieces.reduce((total, piece) => total + estimateTokens(piece), 0);
+  const turnTokens = (list: ChatTurn[]) =>
+    list.reduce((total, turn) => total + estimateTokens(turn.content) + 4, 0);
+  const budgets = allocate(
+    {
+      instructions: sum(instructionPieces),
+      snippets: sum(snippetPieces),
+      document: estimateTokens(sections.join("\n\n")),
+      knowledge: sum(knowledgePieces),
+      history: estimateTokens(conversationSummary) + turnTokens(turns),
+    },
+    available
+  );
+
+  // Custom instructions share their budget evenly; the shorter block goes
+  // first so what it does not use is left to the other.
+  const fitted: string[] = [];
+  let instructionsLeft = budgets.instructions;
+  instructionPieces
+    .map((piece, index) => ({ piece, index }))
+    .sort((a, b) => a.piece.length - b.piece.length)
+    .forEach(({ piece, index }, position, order) => {
+      const share = Math.floor(instructionsLeft / (order.length - position));
+      const fit =
+        estimateTokens(piece) <= share
+          ? piece
+          : share >= MIN_PIECE_TOKENS
+            ? truncateToTokens(piece, share)
+            : "";
+      fitted[index] = fit;
+      instructionsLeft -= estimateTokens(fit);
+    });
+  const instructions = fitted.filter(Boolean);
+  if (fitted.some((piece, i) => piece !== instructionPieces[i])) {
+    trimmed.push("instructions");
+  }
+  const snippets = fitPieces(snippetPieces, budgets.snippets);
+  if (snippets.dropped > 0 || snippets.kept.some((piece, i) => piece !== snippetPieces[i])) {
+    trimmed.push("snippets");
+  }
+  const document = fitDocument(sections, question, input.snippets, budgets.document);
+  if (document !== sections.join("\n\n")) {
+    trimmed.push("document");
+  }
+  const knowledge = fitPieces(knowledgePieces, budgets.knowledge);
+  if (knowledge.dropped > 0 || knowledge.kept.some((piece, i) => piece !== knowledgePieces[i])) {
+    trimmed.push("knowledge");
+  }
+  const history = fitHistory(conversationSummary, turns, budgets.history);
+  if (history.summary !== conversationSummary || turnTokens(history.turns) !== turnTokens(turns)) {
+    trimmed.push("history");
+  }
+
+  const customInstructions =
+    instructions.length > 0 ? `\n\n## Custom Instructions:\n${instructions.join("")}` : "";
+  const knowledgeContext =
+    knowledge.kept.length > 0 ? `\n\n## Reference Knowledge:\n${knowledge.kept.join("")}` : "";
+  const earlierConversation = history.summary
+    ? `\n\n## Earlier in this conversation:\n${history.summary}`
+    : "";
+
+  const system = `${INTRO}
+${customInstructions}
+Current document content:
+---
+${document || "(Document is empty)"}
+---
+${knowledgeContext}${earlierConversation}
+
+${GUIDELINES}`;
+  const user = snippets.kept.length > 0 ? `${snippets.kept.join("\n")}\n\n${question}` : question;
+
+  const breakdown: PromptBreakdown = {
+    budget,
+    total: estimateTokens(system) + turnTokens(history.turns) + estimateTokens(user),
+    base,
+    userMessage: estimateTokens(question),
+    instructions: estimateTokens(customInstructions),
+    snippets: sum(snippets.kept),
+    document: estimateTokens(document),
+    knowledge: estimateTokens(knowledgeContext),
+    history: estimateTokens(earlierConversation) + turnTokens(history.turns),
+    trimmed,
+  };
+  return { system, history: history.turns, user, breakdown };
+}
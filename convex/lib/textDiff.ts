@@ -0,0 +1,64 @@
+// Text edits for the delta save path (documents.applyEdits). Shared by the
+// editor, which diffs its HTML against the last saved version, and the
+// server, which replays the edits. Offsets are UTF-16 code units, as in
+// JavaScript strings, and refer to the text before the batch is applied.
+
+export interface TextEdit {
+  from: number;
+  to: number;
+  insert: string;
+}
+
+function isHighSurrogate(code: number) {
+  return code >= 0xd800 && code <= 0xdbff;
+}
+
+function isLowSurrogate(code: number) {
+  return code >= 0xdc00 && code <= 0xdfff;
+}
+
+// Typing between two saves touches one contiguous range, so trimming the
+// common prefix and suffix yields a single edit the size of the change.
+export function diffText(before: string, after: string): TextEdit[] {
+  if (before === after) {
+    return [];
+  }
+  const shorter = Math.min(before.length, after.length);
+  let start = 0;
+  while (start < shorter && before.charCodeAt(start) === after.charCodeAt(start)) {
+    start++;
+  }
+  let endBefore = before.length;
+  let endAfter = after.length;
+  while (
+    endBefore > start &&
+    endAfter > start &&
+    before.charCodeAt(endBefore - 1) === after.charCodeAt(endAfter - 1)
+  ) {
+    endBefore--;
+    endAfter--;
+  }
+  // Never split a surrogate pair: a lone half cannot be sent as a string.
+  if (start > 0 && isHighSurrogate(before.charCodeAt(start - 1))) {
+    start--;
+  }
+  if (endBefore < before.length && isLowSurrogate(before.charCodeAt(endBefore))) {
+    endBefore++;
+    endAfter++;
+  }
+  return [{ from: start, to: endBefore, insert: after.slice(start, endAfter) }];
+}
+
+// Edits must be sorted and non-overlapping.
+export function applyTextEdits(text: string, edits: TextEdit[]): string {
+  let result = "";
+  let cursor = 0;
+  for (const edit of edits) {
+    if (edit.from < cursor || edit.to < edit.from || edit.to > text.length) {
+      throw new Error("Invalid text edit");
+    }
+    result += text.slice(cursor, edit.from) + edit.insert;
+    cursor = edit.to;
+  }
+  return result + text.slice(cursor);
+}
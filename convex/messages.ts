@@ -1,23 +1,79 @@
 import { v } from "convex/values";
-import { mutation, query } from "./_generated/server";
+import { paginationOptsValidator } from "convex/server";
+import { internalMutation, internalQuery, mutation, query } from "./_generated/server";
+import type { QueryCtx } from "./_generated/server";
+import type { Doc, Id } from "./_generated/dataModel";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { internal } from "./_generated/api";
 
+// Conversation memory for ai.chat: the latest messages are sent as they are
+// (as many as fit the prompt budget) and older ones as a rolling summary in
+// chatSummaries. Once CHAT_HISTORY_MESSAGES messages are waiting, all but
+// the newest KEEP_UNSUMMARIZED are folded into the summary in the
+// background by ai.summarizeChat.
+const CHAT_HISTORY_MESSAGES = 12;
+const KEEP_UNSUMMARIZED = 4;
+// Messages folded into the summary per run, bounding its input
+const MAX_SUMMARIZED_PER_RUN = 40;
+
+// Cleared messages deleted per purgeClearedMessages run
+const PURGE_BATCH = 500;
+
+// Messages up to chatClearedAt are cleared and only wait to be purged
+function clearedThrough(document: Doc<"documents"> | null) {
+  return document?.chatClearedAt ?? 0;
+}
+
+async function chatSummaryOf(ctx: QueryCtx, documentId: Id<"documents">) {
+  return await ctx.db
+    .query("chatSummaries")
+    .withIndex("by_document", (q) => q.eq("documentId", documentId))
+    .unique();
+}
+
+// Messages newer than the summary and the last clear, oldest first
+async function unsummarizedMessages(
+  ctx: QueryCtx,
+  documentId: Id<"documents">,
+  limit: number,
+  order: "asc" | "desc"
+) {
+  const summary = await chatSummaryOf(ctx, documentId);
+  const after = Math.max(
+    summary?.summarizedThrough ?? 0,
+    clearedThrough(await ctx.db.get(documentId))
+  );
+  const messages = await ctx.db
+    .query("messages")
+    .withIndex("by_document", (q) =>
+      q.eq("documentId", documentId).gt("_creationTime", after)
+    )
+    .order(order)
+    .take(limit);
+  return { summary, messages: order === "desc" ? messages.reverse() : messages };
+}
+
+// A page of the chat, newest first, for the sidebar to load as the user
+// scrolls back
 export const list = query({
-  args: { documentId: v.id("documents") },
+  args: { documentId: v.id("documents"), paginationOpts: paginationOptsValidator },
   handler: async (ctx, args) => {
     const userId = await getAuthUserId(ctx);
     if (!userId) {
-      return [];
+      return { page: [], isDone: true, continueCursor: "" };
     }
     // Verify document ownership
     const document = await ctx.db.get(args.documentId);
-    if (!document || document.userId !== userId) {
-      return [];
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      return { page: [], isDone: true, continueCursor: "" };
     }
     return await ctx.db
       .query("messages")
-      .withIndex("by_document", (q) => q.eq("documentId", args.documentId))
-      .collect();
+      .withIndex("by_document", (q) =>
+        q.eq("documentId", args.documentId).gt("_creationTime", clearedThrough(document))
+      )
+      .order("desc")
+      .paginate(args.paginationOpts);
   },
 });
 
@@ -34,7 +90,7 @@ export const create = mutation({
     }
     // Verify document ownership
     const document = await ctx.db.get(args.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Document not found");
     }
     return await ctx.db.insert("messages", {
@@ -45,6 +101,180 @@ export const create = mutation({
   },
 });
 
+// Auth and ownership check run by ai.chat before it pays for embedding the
+// message; loadChatContext checks again in its own transaction
+export const checkChatAccess = internalQuery({
+  args: { documentId: v.id("documents") },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      throw new Error("Not authenticated");
+    }
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      throw new Error("Document not found");
+    }
+  },
+});
+
+// Everything ai.chat needs besides the model, read in one transaction: the
+// document, the knowledge items and both levels of custom instructions.
+// With knowledgeEmbeddingIds (vector search results, best first) only those
+// items are returned, plus any whose embedding is still pending; without,
+// all of the document's knowledge. The conversation so far comes as the
+// rolling summary plus the latest messages after it.
+//
+// The document comes as its cached chat text when there is one for the
+// saved version. Its HTML is returned instead when nothing is cached yet, or
+// when the client has unsaved edits against the saved version
+// (editsBaseVersion) that need applying first.
+export const loadChatContext = internalQuery({
+  args: {
+    documentId: v.id("documents"),
+    knowledgeEmbeddingIds: v.optional(v.array(v.id("knowledgeEmbeddings"))),
+    editsBaseVersion: v.optional(v.number()),
+  },
+  handler: async (ctx, args) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      throw new Error("Not authenticated");
+    }
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
+      throw new Error("Document not found");
+    }
+    let knowledge: Doc<"knowledge">[];
+    if (args.knowledgeEmbeddingIds === undefined) {
+      knowledge = await ctx.db
+        .query("knowledge")
+        .withIndex("by_document", (q) => q.eq("documentId", args.documentId))
+        .collect();
+    } else {
+      knowledge = [];
+      for (const embeddingId of args.knowledgeEmbeddingIds) {
+        const embedding = await ctx.db.get(embeddingId);
+        const item = embedding && (await ctx.db.get(embedding.knowledgeId));
+        if (item && item.documentId === args.documentId) {
+          knowledge.push(item);
+        }
+      }
+      const pending = await ctx.db
+        .query("knowledge")
+        .withIndex("by_document_pending", (q) =>
+          q.eq("documentId", args.documentId).eq("embeddingPending", true)
+        )
+        .collect();
+      const retrieved = new Set(knowledge.map((item) => item._id));
+      knowledge.push(...pending.filter((item) => !retrieved.has(item._id)));
+    }
+    const settings = await ctx.db
+      .query("userSettings")
+      .withIndex("by_user", (q) => q.eq("userId", userId))
+      .first();
+    const version = document.version ?? 0;
+    let documentText: string | null = null;
+    if (args.editsBaseVersion !== version) {
+      const cached = await ctx.db
+        .query("documentTexts")
+        .withIndex("by_document", (q) => q.eq("documentId", args.documentId))
+        .unique();
+      if (cached && cached.version === version) {
+        documentText = cached.text;
+      }
+    }
+    const chat = await unsummarizedMessages(
+      ctx,
+      args.documentId,
+      CHAT_HISTORY_MESSAGES,
+      "desc"
+    );
+    return {
+      conversationSummary: chat.summary?.summary ?? "",
+      history: chat.messages
+        .filter((message) => message.status !== "streaming" && message.content)
+        .map(({ role, content }) => ({ role, content })),
+      version,
+      documentText,
+      documentContent: documentText === null ? document.content : null,
+      knowledge: knowledge.map(({ title, content }) => ({ title, content })),
+      globalInstructions: settings?.aiSystemInstructions || "",
+      documentInstructions: document.aiSystemInstructions || "",
+    };
+  },
+});
+
+// Store a user message and the assistant's reply together, so the chat
+// never shows one without the other. A streaming reply starts out empty and
+// is filled in by updateAssistantMessage. Ownership was checked by
+// loadChatContext; the document may have been deleted since.
+export const appendExchange = internalMutation({
+  args: {
+    documentId: v.id("documents"),
+    userMessage: v.string(),
+    assistantMessage: v.string(),
+    streaming: v.optional(v.boolean()),
+  },
+  handler: async (ctx, args): Promise<Id<"messages">> => {
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.deletedAt !== undefined) {
+      throw new Error("Document not found");
+    }
+    await ctx.db.insert("messages", {
+      documentId: args.documentId,
+      role: "user",
+      content: args.userMessage,
+    });
+    const messageId = await ctx.db.insert("messages", {
+      documentId: args.documentId,
+      role: "assistant",
+      content: args.assistantMessage,
+      ...(args.streaming && { status: "streaming" as const }),
+    });
+    const { messages } = await unsummarizedMessages(
+      ctx,
+      args.documentId,
+      CHAT_HISTORY_MESSAGES,
+      "asc"
+    );
+    if (messages.length >= CHAT_HISTORY_MESSAGES) {
+      await ctx.scheduler.runAfter(0, internal.ai.summarizeChat, {
+        documentId: args.documentId,
+      });
+    }
+    return messageId;
+  },
+});
+
+// Returns false once the message is gone or cleared, so the caller can stop
+// streaming.
+export const updateAssistantMessage = internalMutation({
+  args: {
+    messageId: v.id("messages"),
+    content: v.string(),
+    status: v.optional(
+      v.union(v.literal("streaming"), v.literal("complete"), v.literal("error"))
+    ),
+  },
+  handler: async (ctx, args) => {
+    const message = await ctx.db.get(args.messageId);
+    const document = message && (await ctx.db.get(message.documentId));
+    if (
+      !message ||
+      !document ||
+      document.deletedAt !== undefined ||
+      message._creationTime <= clearedThrough(document)
+    ) {
+      return false;
+    }
+    await ctx.db.patch(args.messageId, {
+      content: args.content,
+      ...(args.status !== undefined && { status: args.status }),
+    });
+    return true;
+  },
+});
+
+// Hide the chat at once and delete its messages in the background
 export const clear = mutation({
   args: { documentId: v.id("documents") },
   handler: async (ctx, args) => {
@@ -54,16 +284,102 @@ export const clear = mutation({
     }
     // Verify document ownership
     const document = await ctx.db.get(args.documentId);
-    if (!document || document.userId !== userId) {
+    if (!document || document.userId !== userId || document.deletedAt !== undefined) {
       throw new Error("Document not found");
     }
-    const messages = await ctx.db
+    await ctx.db.patch(args.documentId, { chatClearedAt: Date.now() });
+    const summary = await chatSummaryOf(ctx, args.documentId);
+    if (summary) {
+      await ctx.db.delete(summary._id);
+    }
+    await ctx.scheduler.runAfter(0, internal.messages.purgeClearedMessages, {
+      documentId: args.documentId,
+    });
+  },
+});
+
+// Delete a batch of cleared messages, scheduling the next batch until none
+// are left. Any left over by a failed run are picked up by the next clear or
+// the document's purge.
+export const purgeClearedMessages = internalMutation({
+  args: { documentId: v.id("documents") },
+  handler: async (ctx, args): Promise<{ deleted: number; isDone: boolean }> => {
+    const document = await ctx.db.get(args.documentId);
+    if (!document) {
+      return { deleted: 0, isDone: true };
+    }
+    const cleared = await ctx.db
       .query("messages")
-      .withIndex("by_document", (q) => q.eq("documentId", args.documentId))
-      .collect();
-    for (const message of messages) {
+      .withIndex("by_document", (q) =>
+        q.eq("documentId", args.documentId).lte("_creationTime", clearedThrough(document))
+      )
+      .take(PURGE_BATCH);
+    for (const message of cleared) {
       await ctx.db.delete(message._id);
     }
+    const isDone = cleared.length < PURGE_BATCH;
+    if (!isDone) {
+      await ctx.scheduler.runAfter(0, internal.messages.purgeClearedMessages, args);
+    }
+    return { deleted: cleared.length, isDone };
+  },
+});
+
+// The messages for ai.summarizeChat to fold into the summary: all but the
+// newest KEEP_UNSUMMARIZED, stopping before a reply still streaming. Null
+// when there is too little to be worth a summarization.
+export const loadChatSummaryInput = internalQuery({
+  args: { documentId: v.id("documents") },
+  handler: async (ctx, args) => {
+    const { summary, messages } = await unsummarizedMessages(
+      ctx,
+      args.documentId,
+      MAX_SUMMARIZED_PER_RUN + KEEP_UNSUMMARIZED,
+      "asc"
+    );
+    let fold = messages.slice(0, messages.length - KEEP_UNSUMMARIZED);
+    const streaming = fold.findIndex((message) => message.status === "streaming");
+    if (streaming !== -1) {
+      fold = fold.slice(0, streaming);
+    }
+    if (fold.length < 2) {
+      return null;
+    }
+    return {
+      summary: summary?.summary ?? "",
+      summarizedThrough: summary?.summarizedThrough ?? 0,
+      throughMessageId: fold[fold.length - 1]._id,
+      messages: fold.map(({ role, content }) => ({ role, content })),
+    };
+  },
+});
+
+// Store a new summary covering the chat through throughMessageId. Dropped
+// if another run got there first (the summary moved past
+// previousSummarizedThrough) or the chat was cleared meanwhile.
+export const saveChatSummary = internalMutation({
+  args: {
+    documentId: v.id("documents"),
+    summary: v.string(),
+    previousSummarizedThrough: v.number(),
+    throughMessageId: v.id("messages"),
+  },
+  handler: async (ctx, args) => {
+    const through = await ctx.db.get(args.throughMessageId);
+    const document = await ctx.db.get(args.documentId);
+    if (!through || !document || through._creationTime <= clearedThrough(document)) {
+      return;
+    }
+    const existing = await chatSummaryOf(ctx, args.documentId);
+    if ((existing?.summarizedThrough ?? 0) !== args.previousSummarizedThrough) {
+      return;
+    }
+    const summary = { summary: args.summary, summarizedThrough: through._creationTime };
+    if (existing) {
+      await ctx.db.patch(existing._id, summary);
+    } else {
+      await ctx.db.insert("chatSummaries", { documentId: args.documentId, ...summary });
+    }
   },
 });
 
@@ -0,0 +1,128 @@
+import { v } from "convex/values";
+import { internal } from "./_generated/api";
+import { internalMutation } from "./_generated/server";
+import { syncDocumentSummary } from "./lib/documentSummary";
+import { normalizeEmail } from "./lib/email";
+import { syncEntitlement } from "./lib/entitlements";
+
+// One-off data migrations. Each walks its table in batches, scheduling the
+// next batch itself, so it can be started once after a deploy:
+//
+//   npx convex run migrations:backfillDocumentSummaries
+
+const BATCH_SIZE = 100;
+
+// Write a documentSummaries row for every document, including those created
+// before the table existed, except removed ones. Safe to re-run.
+export const backfillDocumentSummaries = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ processed: number; isDone: boolean }> => {
+    const page = await ctx.db
+      .query("documents")
+      .paginate({ numItems: BATCH_SIZE, cursor: args.cursor ?? null });
+    for (const document of page.page) {
+      if (document.deletedAt === undefined) {
+        await syncDocumentSummary(ctx, document);
+      }
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.migrations.backfillDocumentSummaries, {
+        cursor: page.continueCursor,
+      });
+    }
+    return { processed: page.page.length, isDone: page.isDone };
+  },
+});
+
+// Embed every knowledge item, e.g. those added before retrieval existed or
+// after switching EMBEDDING_PROVIDER. Until its embedding is saved an item is
+// sent to the model on every chat message, as before.
+export const backfillKnowledgeEmbeddings = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ processed: number; isDone: boolean }> => {
+    const page = await ctx.db
+      .query("knowledge")
+      .paginate({ numItems: BATCH_SIZE, cursor: args.cursor ?? null });
+    for (const item of page.page) {
+      await ctx.db.patch(item._id, { embeddingPending: true });
+    }
+    if (page.page.length > 0) {
+      await ctx.scheduler.runAfter(0, internal.knowledge.embed, {
+        knowledgeIds: page.page.map((item) => item._id),
+      });
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.migrations.backfillKnowledgeEmbeddings, {
+        cursor: page.continueCursor,
+      });
+    }
+    return { processed: page.page.length, isDone: page.isDone };
+  },
+});
+
+// Fill in users.normalizedEmail for users who signed up before it existed;
+// until then the webhook cannot link their subscriptions by email.
+export const backfillNormalizedEmails = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ processed: number; isDone: boolean }> => {
+    const page = await ctx.db
+      .query("users")
+      .paginate({ numItems: BATCH_SIZE, cursor: args.cursor ?? null });
+    for (const user of page.page) {
+      const normalizedEmail = user.email ? normalizeEmail(user.email) : undefined;
+      if (user.normalizedEmail !== normalizedEmail) {
+        await ctx.db.patch(user._id, { normalizedEmail });
+      }
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.migrations.backfillNormalizedEmails, {
+        cursor: page.continueCursor,
+      });
+    }
+    return { processed: page.page.length, isDone: page.isDone };
+  },
+});
+
+// Fill in subscriptions.normalizedEmail for subscriptions created before it
+// existed. Until then they are only found by their exact email, so one
+// bought with a differently cased address stays unlinked.
+export const backfillSubscriptionEmails = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ processed: number; isDone: boolean }> => {
+    const page = await ctx.db
+      .query("subscriptions")
+      .paginate({ numItems: BATCH_SIZE, cursor: args.cursor ?? null });
+    for (const subscription of page.page) {
+      const normalizedEmail = normalizeEmail(subscription.email);
+      if (subscription.normalizedEmail !== normalizedEmail) {
+        await ctx.db.patch(subscription._id, { normalizedEmail });
+      }
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.migrations.backfillSubscriptionEmails, {
+        cursor: page.continueCursor,
+      });
+    }
+    return { processed: page.page.length, isDone: page.isDone };
+  },
+});
+
+// Write the entitlements row of every user. Until then users.session
+// computes it from their subscription on each read.
+export const backfillEntitlements = internalMutation({
+  args: { cursor: v.optional(v.union(v.string(), v.null())) },
+  handler: async (ctx, args): Promise<{ processed: number; isDone: boolean }> => {
+    const page = await ctx.db
+      .query("users")
+      .paginate({ numItems: BATCH_SIZE, cursor: args.cursor ?? null });
+    for (const user of page.page) {
+      await syncEntitlement(ctx, user._id);
+    }
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.migrations.backfillEntitlements, {
+        cursor: page.continueCursor,
+      });
+    }
+    return { processed: page.page.length, isDone: page.isDone };
+  },
+});
@@ -0,0 +1,168 @@
+import { v } from "convex/values";
+import { internal } from "./_generated/api";
+import { internalMutation, internalQuery } from "./_generated/server";
+import type { MutationCtx } from "./_generated/server";
+import type { Doc, Id } from "./_generated/dataModel";
+
+// Cache of ai.chat replies, keyed by a hash of everything that shaped the
+// reply (see chatCacheKey in ai.ts). Entries expire RESPONSE_CACHE_TTL_MS
+// after they were stored, and beyond MAX_ENTRIES the least recently used go
+// first. Hits, misses and entries are counted in responseCacheStats:
+//
+//   npx convex run responseCache:stats
+//
+// The counters are split over STATS_SHARDS rows, each request updating a
+// random one, so concurrent chats do not conflict on a single document.
+// Every entry belongs to the shard that stored it, and each shard evicts its
+// own least recently used entries beyond its part of MAX_ENTRIES.
+
+export const RESPONSE_CACHE_TTL_MS = 24 * 60 * 60 * 1000;
+const MAX_ENTRIES = 5_000;
+const STATS_SHARDS = 16;
+// Entries deleted per eviction batch
+const EVICT_BATCH = 200;
+
+function randomShard() {
+  return Math.floor(Math.random() * STATS_SHARDS);
+}
+
+// The counters of a shard; undefined is the single row from before sharding
+async function statsRow(ctx: MutationCtx, shard: number | undefined) {
+  const stats = await ctx.db
+    .query("responseCacheStats")
+    .withIndex("by_shard", (q) => q.eq("shard", shard))
+    .first();
+  if (stats) {
+    return stats;
+  }
+  const id = await ctx.db.insert("responseCacheStats", { shard, hits: 0, misses: 0, entries: 0 });
+  return (await ctx.db.get(id))!;
+}
+
+// Take deleted entries off the counts of the shards they belonged to
+async function countDeleted(ctx: MutationCtx, entries: Doc<"responseCache">[]) {
+  const perShard = new Map<number | undefined, number>();
+  for (const entry of entries) {
+    perShard.set(entry.shard, (perShard.get(entry.shard) ?? 0) + 1);
+  }
+  for (const [shard, deleted] of perShard) {
+    const stats = await statsRow(ctx, shard);
+    await ctx.db.patch(stats._id, { entries: Math.max(0, stats.entries - deleted) });
+  }
+}
+
+// The cached reply for key, if any and still fresh. Counts the hit or miss
+// and marks the entry as recently used.
+export const lookup = internalMutation({
+  args: { key: v.string() },
+  handler: async (ctx, args) => {
+    const entry = await ctx.db
+      .query("responseCache")
+      .withIndex("by_key", (q) => q.eq("key", args.key))
+      .unique();
+    const now = Date.now();
+    const fresh = entry !== null && now - entry.createdAt < RESPONSE_CACHE_TTL_MS;
+    const stats = await statsRow(ctx, randomShard());
+    if (!fresh) {
+      await ctx.db.patch(stats._id, { misses: stats.misses + 1 });
+      return null;
+    }
+    await ctx.db.patch(stats._id, { hits: stats.hits + 1 });
+    await ctx.db.patch(entry._id, { lastUsedAt: now });
+    return entry.response;
+  },
+});
+
+// Store or refresh the reply for key, evicting the least recently used
+// entries of its shard over the shard's part of MAX_ENTRIES.
+export const store = internalMutation({
+  args: {
+    key: v.string(),
+    documentId: v.id("documents"),
+    response: v.string(),
+  },
+  handler: async (ctx, args) => {
+    const document = await ctx.db.get(args.documentId);
+    if (!document || document.deletedAt !== undefined) {
+      return;
+    }
+    const now = Date.now();
+    const existing = await ctx.db
+      .query("responseCache")
+      .withIndex("by_key", (q) => q.eq("key", args.key))
+      .unique();
+    if (existing) {
+      await ctx.db.patch(existing._id, { response: args.response, createdAt: now, lastUsedAt: now });
+      return;
+    }
+    const shard = randomShard();
+    await ctx.db.insert("responseCache", { ...args, shard, createdAt: now, lastUsedAt: now });
+    const stats = await statsRow(ctx, shard);
+    const maxEntries = Math.ceil(MAX_ENTRIES / STATS_SHARDS);
+    let entries = stats.entries + 1;
+    if (entries > maxEntries) {
+      const leastRecent = await ctx.db
+        .query("responseCache")
+        .withIndex("by_shard_lastUsedAt", (q) => q.eq("shard", shard))
+        .take(Math.min(entries - maxEntries, EVICT_BATCH));
+      for (const entry of leastRecent) {
+        await ctx.db.delete(entry._id);
+      }
+      entries -= leastRecent.length;
+    }
+    await ctx.db.patch(stats._id, { entries });
+  },
+});
+
+// Delete expired entries, a batch at a time. Run hourly from crons.ts.
+export const evictExpired = internalMutation({
+  args: {},
+  handler: async (ctx): Promise<{ deleted: number }> => {
+    const expired = await ctx.db
+      .query("responseCache")
+      .withIndex("by_createdAt", (q) => q.lt("createdAt", Date.now() - RESPONSE_CACHE_TTL_MS))
+      .take(EVICT_BATCH);
+    for (const entry of expired) {
+      await ctx.db.delete(entry._id);
+    }
+    await countDeleted(ctx, expired);
+    if (expired.length === EVICT_BATCH) {
+      await ctx.scheduler.runAfter(0, internal.responseCache.evictExpired, {});
+    }
+    return { deleted: expired.length };
+  },
+});
+
+// Delete up to limit of a deleted document's entries; returns how many
+export async function deleteDocumentResponses(
+  ctx: MutationCtx,
+  documentId: Id<"documents">,
+  limit: number
+) {
+  const entries = await ctx.db
+    .query("responseCache")
+    .withIndex("by_document", (q) => q.eq("documentId", documentId))
+    .take(limit);
+  for (const entry of entries) {
+    await ctx.db.delete(entry._id);
+  }
+  await countDeleted(ctx, entries);
+  return entries.length;
+}
+
+export const stats = internalQuery({
+  args: {},
+  handler: async (ctx) => {
+    const shards = await ctx.db.query("responseCacheStats").collect();
+    const total = (field: "hits" | "misses" | "entries") =>
+      shards.reduce((sum, stats) => sum + stats[field], 0);
+    const hits = total("hits");
+    const misses = total("misses");
+    return {
+      hits,
+      misses,
+      entries: total("entries"),
+      hitRate: hits + misses > 0 ? hits / (hits + misses) : 0,
+    };
+  },
+});
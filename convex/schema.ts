@@ -1,9 +1,33 @@
 import { defineSchema, defineTable } from "convex/server";
 import { v } from "convex/values";
 import { authTables } from "@convex-dev/auth/server";
+import { EMBEDDING_DIMENSIONS } from "./lib/embeddingDimensions";
+
+const subscriptionStatus = v.union(
+  v.literal("active"),
+  v.literal("canceled"),
+  v.literal("past_due"),
+  v.literal("none")
+);
 
 export default defineSchema({
   ...authTables,
+
+  // The auth library's users table plus normalizedEmail, kept in step with
+  // email (auth.ts, users.updateProfile) so users can be found by email
+  // through an index.
+  users: defineTable({
+    name: v.optional(v.string()),
+    image: v.optional(v.string()),
+    email: v.optional(v.string()),
+    emailVerificationTime: v.optional(v.number()),
+    phone: v.optional(v.string()),
+    phoneVerificationTime: v.optional(v.number()),
+    isAnonymous: v.optional(v.boolean()),
+    normalizedEmail: v.optional(v.string()),
+  }).index("email", ["email"])
+    .index("phone", ["phone"])
+    .index("by_normalized_email", ["normalizedEmail"]),
   
   // User settings for global AI instructions
   userSettings: defineTable({
@@ -17,34 +41,159 @@ export default defineSchema({
     content: v.string(),
     updatedAt: v.number(),
     aiSystemInstructions: v.optional(v.string()),
-  }).index("by_user", ["userId"]),
+    // Bumped on every content change; absent on documents never edited since
+    // versions were introduced, which count as version 0.
+    version: v.optional(v.number()),
+    // Messages created up to this time were cleared from the chat; they are
+    // hidden at once and deleted in the background.
+    chatClearedAt: v.optional(v.number()),
+    // Set by documents.remove. The document is treated as gone while its
+    // rows are purged in batches (documents.purgeDocument), which count
+    // their progress here.
+    deletedAt: v.optional(v.number()),
+    purgedRows: v.optional(v.number()),
+    purgeUpdatedAt: v.optional(v.number()),
+  }).index("by_user", ["userId"])
+    .index("by_deletedAt", ["deletedAt"]),
+
+  // Recent content edits, so open editors can follow a document by version
+  // instead of re-reading all of its content.
+  documentEdits: defineTable({
+    documentId: v.id("documents"),
+    version: v.number(),
+    changes: v.array(
+      v.object({ from: v.number(), to: v.number(), insert: v.string() })
+    ),
+  }).index("by_document_version", ["documentId", "version"]),
+
+  // The content of a document's latest version as compact text for the AI
+  // chat (lib/documentText), derived once per version on first use
+  documentTexts: defineTable({
+    documentId: v.id("documents"),
+    version: v.number(),
+    text: v.string(),
+  }).index("by_document", ["documentId"]),
+
+  // What the dashboard shows of each document, maintained by the document
+  // mutations so listing never reads document content.
+  documentSummaries: defineTable({
+    documentId: v.id("documents"),
+    userId: v.id("users"),
+    title: v.string(),
+    updatedAt: v.number(),
+    // Content size in UTF-8 bytes
+    size: v.number(),
+    wordCount: v.number(),
+    preview: v.string(),
+  }).index("by_document", ["documentId"])
+    .index("by_user_updatedAt", ["userId", "updatedAt"]),
 
   knowledge: defineTable({
     documentId: v.id("documents"),
     title: v.string(),
     content: v.string(),
-  }).index("by_document", ["documentId"]),
+    // Set while the item's embedding is missing or out of date; ai.chat
+    // includes such items without retrieval.
+    embeddingPending: v.optional(v.boolean()),
+  }).index("by_document", ["documentId"])
+    .index("by_document_pending", ["documentId", "embeddingPending"]),
+
+  // One embedding per knowledge item, for top-k retrieval in ai.chat
+  knowledgeEmbeddings: defineTable({
+    knowledgeId: v.id("knowledge"),
+    documentId: v.id("documents"),
+    embedding: v.array(v.float64()),
+    // hashText of the title and content that were embedded
+    textHash: v.number(),
+  }).index("by_knowledge", ["knowledgeId"])
+    .index("by_document", ["documentId"])
+    .vectorIndex("by_embedding", {
+      vectorField: "embedding",
+      dimensions: EMBEDDING_DIMENSIONS,
+      filterFields: ["documentId"],
+    }),
 
   messages: defineTable({
     documentId: v.id("documents"),
     role: v.union(v.literal("user"), v.literal("assistant")),
     content: v.string(),
+    // Set on assistant replies written while they stream in; absent means
+    // complete.
+    status: v.optional(
+      v.union(v.literal("streaming"), v.literal("complete"), v.literal("error"))
+    ),
+  }).index("by_document", ["documentId"]),
+
+  // Rolling summary of a document's chat up to and including the message
+  // created at summarizedThrough; later messages are sent to the model as
+  // they are.
+  chatSummaries: defineTable({
+    documentId: v.id("documents"),
+    summary: v.string(),
+    summarizedThrough: v.number(),
   }).index("by_document", ["documentId"]),
 
+  // ai.chat replies by a hash of their inputs (responseCache.ts)
+  responseCache: defineTable({
+    key: v.string(),
+    documentId: v.id("documents"),
+    response: v.string(),
+    // The counter shard that stored it; missing on entries from before
+    // sharding, which only leave by expiring
+    shard: v.optional(v.number()),
+    createdAt: v.number(),
+    lastUsedAt: v.number(),
+  }).index("by_key", ["key"])
+    .index("by_document", ["documentId"])
+    .index("by_createdAt", ["createdAt"])
+    .index("by_shard_lastUsedAt", ["shard", "lastUsedAt"]),
+
+  // Response cache counters, one row per shard (missing on the row from
+  // before sharding)
+  responseCacheStats: defineTable({
+    shard: v.optional(v.number()),
+    hits: v.number(),
+    misses: v.number(),
+    entries: v.number(),
+  }).index("by_shard", ["shard"]),
+
   subscriptions: defineTable({
     userId: v.optional(v.id("users")),
     polarCustomerId: v.optional(v.string()),
     polarSubscriptionId: v.optional(v.string()),
-    status: v.union(
-      v.literal("active"),
-      v.literal("canceled"),
-      v.literal("past_due"),
-      v.literal("none")
-    ),
+    status: subscriptionStatus,
     email: v.string(),
+    // normalizeEmail(email), which lookups by email go through; missing
+    // until migrations:backfillSubscriptionEmails has run
+    normalizedEmail: v.optional(v.string()),
     currentPeriodEnd: v.optional(v.number()),
   }).index("by_user", ["userId"])
     .index("by_email", ["email"])
+    .index("by_normalized_email", ["normalizedEmail"])
     .index("by_polar_subscription", ["polarSubscriptionId"]),
+
+  // Each user's subscription state as users.session serves it, maintained
+  // by lib/entitlements whenever subscriptions or emails change
+  entitlements: defineTable({
+    userId: v.id("users"),
+    status: subscriptionStatus,
+    hasActiveSubscription: v.boolean(),
+    currentPeriodEnd: v.optional(v.number()),
+    needsLinking: v.boolean(),
+  }).index("by_user", ["userId"]),
+
+  // One per opened Polar checkout, completed by the webhook once the
+  // subscription is active (see checkout.ts)
+  checkoutSessions: defineTable({
+    userId: v.id("users"),
+    // Normalized, as the webhook matches it against the customer's email
+    email: v.string(),
+    status: v.union(v.literal("pending"), v.literal("completed"), v.literal("expired")),
+    createdAt: v.number(),
+    expiresAt: v.number(),
+    resolvedAt: v.optional(v.number()),
+  }).index("by_user", ["userId"])
+    .index("by_user_status", ["userId", "status"])
+    .index("by_email_status", ["email", "status"]),
 });
 
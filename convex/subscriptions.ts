@@ -1,6 +1,15 @@
 import { v } from "convex/values";
 import { query, mutation, internalMutation } from "./_generated/server";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { completeCheckoutSessions } from "./checkout";
+import { normalizeEmail } from "./lib/email";
+import {
+  entitlementOf,
+  subscriptionByEmail,
+  syncEntitlement,
+  syncSubscriptionEntitlement,
+  userByEmail,
+} from "./lib/entitlements";
 
 export const getSubscriptionStatus = query({
   args: {},
@@ -9,45 +18,14 @@ export const getSubscriptionStatus = query({
     if (!userId) {
       return null;
     }
-
-    // First try to find by userId
-    let subscription = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_user", (q) => q.eq("userId", userId))
-      .first();
-
-    // If not found by userId, try to find by user's email
-    if (!subscription) {
-      const user = await ctx.db.get(userId);
-      if (user?.email) {
-        const email = user.email;
-        subscription = await ctx.db
-          .query("subscriptions")
-          .withIndex("by_email", (q) => q.eq("email", email))
-          .first();
-      }
-    }
-
-    if (!subscription) {
-      return { status: "none" as const, hasActiveSubscription: false };
-    }
-
-    return {
-      status: subscription.status,
-      hasActiveSubscription: subscription.status === "active",
-      currentPeriodEnd: subscription.currentPeriodEnd,
-      needsLinking: !subscription.userId,
-    };
+    return await entitlementOf(ctx, userId);
   },
 });
 
 export const checkSubscriptionByEmail = query({
   args: { email: v.string() },
   handler: async (ctx, args) => {
-    const subscription = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_email", (q) => q.eq("email", args.email))
-      .first();
+    const subscription = await subscriptionByEmail(ctx, args.email);
 
     if (!subscription) {
       return { hasActiveSubscription: false };
@@ -75,10 +53,7 @@ export const createOrUpdateSubscription = internalMutation({
   },
   handler: async (ctx, args) => {
     // First, try to find an existing subscription by email
-    const existingByEmail = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_email", (q) => q.eq("email", args.email))
-      .first();
+    const existingByEmail = await subscriptionByEmail(ctx, args.email);
 
     // Also try to find by polar subscription ID if provided
     let existingByPolarId = null;
@@ -100,26 +75,37 @@ export const createOrUpdateSubscription = internalMutation({
         polarCustomerId: args.polarCustomerId ?? existing.polarCustomerId,
         polarSubscriptionId: args.polarSubscriptionId ?? existing.polarSubscriptionId,
         currentPeriodEnd: args.currentPeriodEnd ?? existing.currentPeriodEnd,
+        normalizedEmail: normalizeEmail(existing.email),
       });
+      const subscription = (await ctx.db.get(existing._id))!;
+      await syncSubscriptionEntitlement(ctx, subscription);
+      if (args.status === "active") {
+        await completeCheckoutSessions(ctx, args.email, subscription.userId);
+      }
       return existing._id;
     }
 
     // Try to find the user by email to link the subscription
-    const user = await ctx.db
-      .query("users")
-      .filter((q) => q.eq(q.field("email"), args.email))
-      .first();
+    const user = await userByEmail(ctx, args.email);
 
     // Create new subscription (with or without user link)
     const subscriptionId = await ctx.db.insert("subscriptions", {
       userId: user?._id,
       email: args.email,
+      normalizedEmail: normalizeEmail(args.email),
       polarCustomerId: args.polarCustomerId,
       polarSubscriptionId: args.polarSubscriptionId,
       status: args.status,
       currentPeriodEnd: args.currentPeriodEnd,
     });
 
+    if (user) {
+      await syncEntitlement(ctx, user._id);
+    }
+    if (args.status === "active") {
+      await completeCheckoutSessions(ctx, args.email, user?._id);
+    }
+
     console.log(`Created subscription for ${args.email}, linked to user: ${user?._id ?? 'none'}`);
 
     return subscriptionId;
@@ -133,15 +119,13 @@ export const linkSubscriptionToUser = internalMutation({
     userId: v.id("users"),
   },
   handler: async (ctx, args) => {
-    const subscription = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_email", (q) => q.eq("email", args.email))
-      .first();
+    const subscription = await subscriptionByEmail(ctx, args.email);
 
     if (subscription && !subscription.userId) {
       await ctx.db.patch(subscription._id, {
         userId: args.userId,
       });
+      await syncEntitlement(ctx, args.userId);
     }
   },
 });
@@ -160,11 +144,7 @@ export const linkSubscriptionToCurrentUser = mutation({
       return { linked: false, reason: "no email" };
     }
 
-    const email = user.email;
-    const subscription = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_email", (q) => q.eq("email", email))
-      .first();
+    const subscription = await subscriptionByEmail(ctx, user.email);
 
     if (!subscription) {
       return { linked: false, reason: "no subscription found" };
@@ -175,6 +155,7 @@ export const linkSubscriptionToCurrentUser = mutation({
     }
 
     await ctx.db.patch(subscription._id, { userId });
+    await syncEntitlement(ctx, userId);
     return { linked: true, reason: "linked now" };
   },
 });
@@ -193,12 +174,8 @@ export const debugCreateSubscription = mutation({
       return { success: false, error: "no email on user" };
     }
 
-    const email = user.email;
     // Check if subscription already exists
-    const existing = await ctx.db
-      .query("subscriptions")
-      .withIndex("by_email", (q) => q.eq("email", email))
-      .first();
+    const existing = await subscriptionByEmail(ctx, user.email);
 
     if (existing) {
       // Update to active
@@ -206,6 +183,7 @@ export const debugCreateSubscription = mutation({
         status: "active",
         userId: userId,
       });
+      await syncEntitlement(ctx, userId);
       return { success: true, action: "updated existing subscription to active" };
     }
 
@@ -213,10 +191,12 @@ export const debugCreateSubscription = mutation({
     await ctx.db.insert("subscriptions", {
       userId: userId,
       email: user.email,
+      normalizedEmail: normalizeEmail(user.email),
       status: "active",
       polarCustomerId: "debug_customer",
       polarSubscriptionId: "debug_subscription",
     });
+    await syncEntitlement(ctx, userId);
 
     return { success: true, action: "created new subscription" };
   },
@@ -0,0 +1,252 @@
+import { v } from "convex/values";
+import { createAccount } from "@convex-dev/auth/server";
+import { internal } from "./_generated/api";
+import { internalAction, internalMutation, internalQuery } from "./_generated/server";
+import type { MutationCtx } from "./_generated/server";
+import type { TableNames } from "./_generated/dataModel";
+import { syncDocumentSummary } from "./lib/documentSummary";
+import { normalizeEmail } from "./lib/email";
+import { syncEntitlement } from "./lib/entitlements";
+
+// Seeding and snapshot restore for the local e2e backend
+// (testsprite_tests/harness/backend.py). Every function here refuses to run
+// unless the deployment sets INKWELL_TESTING=1.
+
+// Restored in this order so references always point at rows restored earlier.
+const SNAPSHOT_TABLES = [
+  "users",
+  "authAccounts",
+  "userSettings",
+  "documents",
+  "documentEdits",
+  "documentSummaries",
+  "documentTexts",
+  "knowledge",
+  "knowledgeEmbeddings",
+  "messages",
+  "chatSummaries",
+  "responseCache",
+  "responseCacheStats",
+  "subscriptions",
+  "entitlements",
+  "checkoutSessions",
+] as const satisfies readonly TableNames[];
+
+// Per-login state that is wiped by a fresh seed but not part of a snapshot.
+const SESSION_TABLES = [
+  "authRefreshTokens",
+  "authSessions",
+  "authVerificationCodes",
+  "authVerifiers",
+  "authRateLimits",
+] as const satisfies readonly TableNames[];
+
+const subscriptionStatus = v.union(
+  v.literal("active"),
+  v.literal("canceled"),
+  v.literal("past_due"),
+  v.literal("none")
+);
+
+const subscriptionFixture = v.object({
+  status: subscriptionStatus,
+  currentPeriodEnd: v.optional(v.number()),
+});
+
+const documentFixture = v.object({
+  title: v.string(),
+  content: v.string(),
+  aiSystemInstructions: v.optional(v.string()),
+  knowledge: v.optional(
+    v.array(v.object({ title: v.string(), content: v.string() }))
+  ),
+  messages: v.optional(
+    v.array(
+      v.object({
+        role: v.union(v.literal("user"), v.literal("assistant")),
+        content: v.string(),
+      })
+    )
+  ),
+});
+
+const fixtureValidator = v.object({
+  users: v.array(
+    v.object({
+      name: v.string(),
+      email: v.string(),
+      password: v.string(),
+      aiSystemInstructions: v.optional(v.string()),
+      subscription: v.optional(subscriptionFixture),
+      documents: v.optional(v.array(documentFixture)),
+    })
+  ),
+});
+
+const snapshotValidator = v.record(v.string(), v.array(v.any()));
+
+type Snapshot = Record<string, Array<Record<string, any>>>;
+
+function assertTestingDeployment() {
+  if (process.env.INKWELL_TESTING !== "1") {
+    throw new Error("Testing functions are disabled on this deployment");
+  }
+}
+
+async function clearTable(ctx: MutationCtx, table: TableNames) {
+  for (const row of await ctx.db.query(table).collect()) {
+    await ctx.db.delete(row._id);
+  }
+}
+
+// Point references at the new id of any row that had to be re-inserted.
+function remapIds(fields: Record<string, any>, ids: Map<string, string>) {
+  return Object.fromEntries(
+    Object.entries(fields).map(([key, value]) => [
+      key,
+      typeof value === "string" ? ids.get(value) ?? value : value,
+    ])
+  );
+}
+
+export const clearAll = internalMutation({
+  args: {},
+  handler: async (ctx) => {
+    assertTestingDeployment();
+    for (const table of [...SESSION_TABLES, ...SNAPSHOT_TABLES]) {
+      await clearTable(ctx, table);
+    }
+  },
+});
+
+export const insertUserFixtures = internalMutation({
+  args: {
+    userId: v.id("users"),
+    email: v.string(),
+    aiSystemInstructions: v.optional(v.string()),
+    subscription: v.optional(subscriptionFixture),
+    documents: v.optional(v.array(documentFixture)),
+  },
+  handler: async (ctx, args) => {
+    assertTestingDeployment();
+    if (args.aiSystemInstructions !== undefined) {
+      await ctx.db.insert("userSettings", {
+        userId: args.userId,
+        aiSystemInstructions: args.aiSystemInstructions,
+      });
+    }
+    if (args.subscription) {
+      await ctx.db.insert("subscriptions", {
+        userId: args.userId,
+        email: args.email,
+        normalizedEmail: normalizeEmail(args.email),
+        ...args.subscription,
+      });
+    }
+    await syncEntitlement(ctx, args.userId);
+    // Oldest first, so the first fixture document ends up last on the dashboard.
+    let updatedAt = Date.now() - (args.documents?.length ?? 0) * 60_000;
+    for (const { knowledge, messages, ...document } of args.documents ?? []) {
+      updatedAt += 60_000;
+      const documentId = await ctx.db.insert("documents", {
+        userId: args.userId,
+        ...document,
+        updatedAt,
+      });
+      await syncDocumentSummary(ctx, (await ctx.db.get(documentId))!);
+      const knowledgeIds = [];
+      for (const item of knowledge ?? []) {
+        knowledgeIds.push(
+          await ctx.db.insert("knowledge", { documentId, ...item, embeddingPending: true })
+        );
+      }
+      if (knowledgeIds.length > 0) {
+        await ctx.scheduler.runAfter(0, internal.knowledge.embed, { knowledgeIds });
+      }
+      for (const message of messages ?? []) {
+        await ctx.db.insert("messages", { documentId, ...message });
+      }
+    }
+  },
+});
+
+export const snapshot = internalQuery({
+  args: {},
+  handler: async (ctx) => {
+    assertTestingDeployment();
+    const snapshot: Snapshot = {};
+    for (const table of SNAPSHOT_TABLES) {
+      snapshot[table] = await ctx.db.query(table).collect();
+    }
+    return snapshot;
+  },
+});
+
+export const seed = internalAction({
+  args: { fixtures: fixtureValidator },
+  handler: async (ctx, args): Promise<Snapshot> => {
+    assertTestingDeployment();
+    await ctx.runMutation(internal.testing.clearAll, {});
+    for (const { password, name, email, ...fixtures } of args.fixtures.users) {
+      // Goes through the Password provider so the secret is hashed exactly
+      // as a real sign-up would hash it.
+      const { user } = await createAccount(ctx, {
+        provider: "password",
+        account: { id: email, secret: password },
+        profile: { name, email },
+      });
+      await ctx.runMutation(internal.testing.insertUserFixtures, {
+        userId: user._id,
+        email,
+        ...fixtures,
+      });
+    }
+    return await ctx.runQuery(internal.testing.snapshot, {});
+  },
+});
+
+export const restore = internalMutation({
+  args: { snapshot: snapshotValidator },
+  handler: async (ctx, args) => {
+    assertTestingDeployment();
+    // Rows a test deleted come back under new ids; later tables are remapped.
+    const ids = new Map<string, string>();
+    for (const table of SNAPSHOT_TABLES) {
+      const rows = args.snapshot[table] ?? [];
+      const kept = new Set(rows.map((row) => row._id));
+      for (const row of await ctx.db.query(table).collect()) {
+        if (!kept.has(row._id)) {
+          await ctx.db.delete(row._id);
+        }
+      }
+      for (const { _id, _creationTime, ...fields } of rows) {
+        const restored = remapIds(fields, ids) as any;
+        const id = ctx.db.normalizeId(table, _id);
+        if (id && (await ctx.db.get(id))) {
+          await ctx.db.replace(id, restored);
+        } else {
+          ids.set(_id, await ctx.db.insert(table, restored));
+        }
+      }
+    }
+
+    // Sessions of the seeded users survive, so a cached sign-in stays valid;
+    // sessions of users a test signed up go with their user.
+    const users = new Set((args.snapshot.users ?? []).map((user) => user._id));
+    for (const session of await ctx.db.query("authSessions").collect()) {
+      if (users.has(session.userId)) {
+        continue;
+      }
+      const tokens = await ctx.db
+        .query("authRefreshTokens")
+        .withIndex("sessionId", (q) => q.eq("sessionId", session._id))
+        .collect();
+      for (const token of tokens) {
+        await ctx.db.delete(token._id);
+      }
+      await ctx.db.delete(session._id);
+    }
+    // Failed sign-in tests must not lock the account for the next test.
+    await clearTable(ctx, "authRateLimits");
+  },
+});
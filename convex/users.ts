@@ -1,6 +1,8 @@
 import { v } from "convex/values";
 import { mutation, query } from "./_generated/server";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { normalizeEmail } from "./lib/email";
+import { entitlementOf, syncEntitlement } from "./lib/entitlements";
 
 export const getCurrentUser = query({
   args: {},
@@ -21,6 +23,30 @@ export const getCurrentUser = query({
   },
 });
 
+// The signed-in user and what their subscription entitles them to, in one
+// query. The app subscribes to it once (SessionProvider) for all routes.
+export const session = query({
+  args: {},
+  handler: async (ctx) => {
+    const userId = await getAuthUserId(ctx);
+    if (!userId) {
+      return null;
+    }
+    const user = await ctx.db.get(userId);
+    if (!user) {
+      return null;
+    }
+    return {
+      user: {
+        id: user._id,
+        name: user.name ?? "",
+        email: user.email ?? "",
+      },
+      entitlement: await entitlementOf(ctx, userId),
+    };
+  },
+});
+
 // Get user settings (for AI instructions)
 export const getUserSettings = query({
   args: {},
@@ -82,20 +108,22 @@ export const updateProfile = mutation({
     await ctx.db.patch(userId, {
       name: args.name,
       email: args.email,
+      normalizedEmail: normalizeEmail(args.email),
     });
 
     // Also update the auth account's providerAccountId (email) for password provider
     const authAccounts = await ctx.db
       .query("authAccounts")
-      .filter((q) => q.eq(q.field("userId"), userId))
+      .withIndex("userIdAndProvider", (q) => q.eq("userId", userId).eq("provider", "password"))
       .collect();
 
     for (const account of authAccounts) {
-      if (account.provider === "password") {
-        await ctx.db.patch(account._id, {
-          providerAccountId: args.email,
-        });
-      }
+      await ctx.db.patch(account._id, {
+        providerAccountId: args.email,
+      });
     }
+
+    // An unlinked subscription is matched by email
+    await syncEntitlement(ctx, userId);
   },
 });
@@ -3,6 +3,7 @@ import { BrowserRouter, Routes, Route, Navigate, useNavigate } from 'react-route
 import { ConvexReactClient, useConvexAuth, useQuery } from 'convex/react';
 import { ConvexAuthProvider } from '@convex-dev/auth/react';
 import { api } from '../convex/_generated/api';
+import type { Id } from '../convex/_generated/dataModel';
 import { Landing } from './pages/Landing';
 import { Auth } from './pages/Auth';
 import { Dashboard } from './pages/Dashboard';
@@ -11,6 +12,7 @@ import { Profile } from './pages/Profile';
 import { Trial } from './pages/Trial';
 import { CheckoutSuccess } from './pages/CheckoutSuccess';
 import { StyleGuide } from './pages/StyleGuide';
+import { SessionProvider, useSession } from './components/SessionProvider';
 
 const convex = new ConvexReactClient(import.meta.env.VITE_CONVEX_URL as string);
 
@@ -48,48 +50,35 @@ function VerifyingSubscriptionScreen() {
 function ProtectedRoute({ children }: { children: React.ReactNode }) {
   const navigate = useNavigate();
   const { isLoading, isAuthenticated } = useConvexAuth();
-  const user = useQuery(api.users.getCurrentUser);
-  const subscriptionStatus = useQuery(api.subscriptions.getSubscriptionStatus);
-  const [isVerifyingSubscription, setIsVerifyingSubscription] = useState(false);
+  const session = useSession();
+  const user = session?.user;
+  const subscriptionStatus = session?.entitlement;
+  // The checkout that reported success and is waiting for the webhook
+  const [checkoutSessionId, setCheckoutSessionId] = useState<Id<'checkoutSessions'> | null>(null);
   const [showTrial, setShowTrial] = useState(true);
-  const pollCountRef = useRef(0);
-  const maxPolls = 30; // Poll for up to 30 seconds (30 * 1000ms)
+  const checkoutSession = useQuery(
+    api.checkout.getCheckoutSession,
+    checkoutSessionId ? { checkoutSessionId } : 'skip'
+  );
 
-  // Effect to check subscription status during verification
+  // The webhook completes the checkout session (or its wait expires); both
+  // arrive through the subscription, so there is nothing to poll
   useEffect(() => {
-    if (isVerifyingSubscription && subscriptionStatus?.hasActiveSubscription) {
+    if (!checkoutSessionId) return;
+    if (checkoutSession?.status === 'completed' || subscriptionStatus?.hasActiveSubscription) {
       // Subscription confirmed! Stop verifying and redirect to dashboard
-      setIsVerifyingSubscription(false);
+      setCheckoutSessionId(null);
       setShowTrial(false);
       navigate('/dashboard', { replace: true });
+    } else if (checkoutSession?.status === 'expired' || checkoutSession === null) {
+      // No confirmation came; the Trial page shows again
+      setCheckoutSessionId(null);
     }
-  }, [isVerifyingSubscription, subscriptionStatus, navigate]);
-
-  // Polling effect for subscription verification
-  useEffect(() => {
-    if (!isVerifyingSubscription) {
-      pollCountRef.current = 0;
-      return;
-    }
+  }, [checkoutSessionId, checkoutSession, subscriptionStatus, navigate]);
 
-    const pollInterval = setInterval(() => {
-      pollCountRef.current += 1;
-      
-      // If max polls reached, stop verifying and show trial again
-      if (pollCountRef.current >= maxPolls) {
-        setIsVerifyingSubscription(false);
-        // The subscription status query will have the latest status
-        // If still no subscription, Trial page will show
-      }
-    }, 1000);
-
-    return () => clearInterval(pollInterval);
-  }, [isVerifyingSubscription]);
-
-  const handleSubscriptionSuccess = useCallback(() => {
+  const handleSubscriptionSuccess = useCallback((id: Id<'checkoutSessions'>) => {
     // Start verifying subscription - wait for webhook to process
-    setIsVerifyingSubscription(true);
-    pollCountRef.current = 0;
+    setCheckoutSessionId(id);
   }, []);
 
   if (isLoading) {
@@ -100,13 +89,14 @@ function ProtectedRoute({ children }: { children: React.ReactNode }) {
     return <Navigate to="/auth" replace />;
   }
 
-  // Wait for user and subscription data to load
-  if (user === undefined || subscriptionStatus === undefined) {
+  // Wait for the session (user and subscription) to load; it stays loaded
+  // across route changes
+  if (session === undefined) {
     return <LoadingScreen />;
   }
 
   // Show verifying screen while waiting for webhook
-  if (isVerifyingSubscription) {
+  if (checkoutSessionId) {
     return <VerifyingSubscriptionScreen />;
   }
 
@@ -161,46 +151,48 @@ function PublicRoute({ children }: { children: React.ReactNode }) {
 function App() {
   return (
     <ConvexAuthProvider client={convex}>
-      <BrowserRouter>
-        <Routes>
-          <Route path="/" element={<Landing />} />
-          <Route
-            path="/auth"
-            element={
-              <PublicRoute>
-                <Auth />
-              </PublicRoute>
-            }
-          />
-          <Route
-            path="/dashboard"
-            element={
-              <ProtectedRoute>
-                <Dashboard />
-              </ProtectedRoute>
-            }
-          />
-          <Route
-            path="/document/:id"
-            element={
-              <ProtectedRoute>
-                <DocumentEditor />
-              </ProtectedRoute>
-            }
-          />
-          <Route
-            path="/profile"
-            element={
-              <ProtectedRoute>
-                <Profile />
-              </ProtectedRoute>
-            }
-          />
-          <Route path="/checkout/success" element={<CheckoutSuccess />} />
-          <Route path="/style-guide" element={<StyleGuide />} />
-          <Route path="*" element={<Navigate to="/" replace />} />
-        </Routes>
-      </BrowserRouter>
+      <SessionProvider>
+        <BrowserRouter>
+          <Routes>
+            <Route path="/" element={<Landing />} />
+            <Route
+              path="/auth"
+              element={
+                <PublicRoute>
+                  <Auth />
+                </PublicRoute>
+              }
+            />
+            <Route
+              path="/dashboard"
+              element={
+                <ProtectedRoute>
+                  <Dashboard />
+                </ProtectedRoute>
+              }
+            />
+            <Route
+              path="/document/:id"
+              element={
+                <ProtectedRoute>
+                  <DocumentEditor />
+                </ProtectedRoute>
+              }
+            />
+            <Route
+              path="/profile"
+              element={
+                <ProtectedRoute>
+                  <Profile />
+                </ProtectedRoute>
+              }
+            />
+            <Route path="/checkout/success" element={<CheckoutSuccess />} />
+            <Route path="/style-guide" element={<StyleGuide />} />
+            <Route path="*" element={<Navigate to="/" replace />} />
+          </Routes>
+        </BrowserRouter>
+      </SessionProvider>
     </ConvexAuthProvider>
   );
 }
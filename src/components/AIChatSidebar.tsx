@@ -1,13 +1,19 @@
-import { useState, useRef, useEffect } from 'react';
-import { useQuery, useAction, useMutation } from 'convex/react';
+import { useState, useRef, useEffect, useMemo, useCallback } from 'react';
+import { useQuery, useAction, useMutation, usePaginatedQuery } from 'convex/react';
 import { api } from '../../convex/_generated/api';
 import type { Id } from '../../convex/_generated/dataModel';
+import type { TextEdit } from '../../convex/lib/textDiff';
 import { Button } from './ui/Button';
 import { Card } from './ui/Card';
+import { VirtualList } from './VirtualList';
+
+// Messages loaded when the chat opens and per scroll back
+const MESSAGE_PAGE_SIZE = 30;
 
 interface AIChatSidebarProps {
   documentId: Id<"documents">;
-  documentContent: string;
+  // The editor's changes since its last saved version
+  getUnsavedEdits: () => { baseVersion: number; edits: TextEdit[] };
   onInsertText: (text: string) => void;
   contextSnippets?: string[];
   onRemoveContext?: (index: number) => void;
@@ -16,7 +22,7 @@ interface AIChatSidebarProps {
 
 export function AIChatSidebar({ 
   documentId, 
-  documentContent, 
+  getUnsavedEdits, 
   onInsertText, 
   contextSnippets = [], 
   onRemoveContext, 
@@ -28,11 +34,19 @@ export function AIChatSidebar({
   const [docInstructions, setDocInstructions] = useState('');
   const [isSavingInstructions, setIsSavingInstructions] = useState(false);
   const [saveSuccess, setSaveSuccess] = useState(false);
-  const messagesEndRef = useRef<HTMLDivElement>(null);
   const textareaRef = useRef<HTMLTextAreaElement>(null);
 
-  const messages = useQuery(api.messages.list, { documentId });
-  const documentData = useQuery(api.documents.get, { id: documentId });
+  // Newest first from the server, oldest first on screen
+  const { results: newestFirst, status: messagesStatus, loadMore } = usePaginatedQuery(
+    api.messages.list,
+    { documentId },
+    { initialNumItems: MESSAGE_PAGE_SIZE }
+  );
+  const messages = useMemo(
+    () => (messagesStatus === 'LoadingFirstPage' ? undefined : [...newestFirst].reverse()),
+    [newestFirst, messagesStatus]
+  );
+  const documentData = useQuery(api.documents.getMeta, { id: documentId });
   const chat = useAction(api.ai.chat);
   const clearMessages = useMutation(api.messages.clear);
   const updateDocument = useMutation(api.documents.update);
@@ -100,22 +114,23 @@ export function AIChatSidebar({
   const hasInstructionChanges = documentData && docInstructions !== (documentData.aiSystemInstructions || '');
   const hasExistingInstructions = documentData?.aiSystemInstructions && documentData.aiSystemInstructions.trim().length > 0;
 
-  useEffect(() => {
-    messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
-  }, [messages]);
+  const handleStartReached = useCallback(() => {
+    if (messagesStatus === 'CanLoadMore') {
+      loadMore(MESSAGE_PAGE_SIZE);
+    }
+  }, [messagesStatus, loadMore]);
+
+  // Once the reply's message exists it shows its own progress
+  const lastMessage = messages?.[messages.length - 1];
+  const isStreaming = lastMessage?.role === 'assistant' && lastMessage.status === 'streaming';
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!input.trim() || isLoading) return;
 
-    // Build the message with context if any
-    let userMessage = input.trim();
-    if (contextSnippets.length > 0) {
-      const contextText = contextSnippets
-        .map((snippet, i) => `[Selected Text ${i + 1}]: "${snippet}"`)
-        .join('\n');
-      userMessage = `${contextText}\n\n${userMessage}`;
-    }
+    // Selected text goes separately so the server can fit it into the prompt
+    const userMessage = input.trim();
+    const snippets = contextSnippets;
 
     setInput('');
     setIsLoading(true);
@@ -129,7 +144,8 @@ export function AIChatSidebar({
       await chat({
         documentId,
         userMessage,
-        documentContent,
+        ...getUnsavedEdits(),
+        ...(snippets.length > 0 && { contextSnippets: snippets }),
       });
     } catch (error) {
       console.error('Failed to get AI response:', error);
@@ -173,7 +189,7 @@ export function AIChatSidebar({
           className="fixed inset-0 bg-ink-900/50 backdrop-blur-sm flex items-center justify-center z-50 p-4"
           onClick={handleBackdropClick}
         >
-          <Card className="w-full max-w-md p-6 animate-in fade-in zoom-in duration-200">
+          <Card className="w-full max-w-md p-6 animate-in fade-in zoom-in duration-200" role="dialog" data-testid="chat-instructions-modal">
             {/* Header */}
             <div className="flex items-center justify-between mb-4">
               <div className="flex items-center gap-3">
@@ -191,6 +207,7 @@ export function AIChatSidebar({
               </div>
               <button
                 onClick={handleCloseModal}
+                data-testid="chat-instructions-close"
                 className="p-2 text-ink-400 hover:text-ink-600 hover:bg-cream-200 rounded-lg transition-colors"
               >
                 <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -208,6 +225,7 @@ export function AIChatSidebar({
             <textarea
               value={docInstructions}
               onChange={(e) => setDocInstructions(e.target.value)}
+              data-testid="chat-instructions-input"
               placeholder="Examples:&#10;• Write in a casual, friendly tone&#10;• Use British English spelling&#10;• Keep paragraphs short and concise&#10;• Avoid technical jargon"
               rows={5}
               className="w-full px-4 py-3 bg-cream-50 border border-cream-300 rounded-xl text-sm text-ink-700 placeholder-ink-300 resize-none focus:outline-none focus:ring-2 focus:ring-accent-400 focus:border-transparent mb-4"
@@ -220,6 +238,7 @@ export function AIChatSidebar({
                 <Button
                   onClick={handleSaveInstructions}
                   disabled={!hasInstructionChanges || isSavingInstructions}
+                  data-testid="chat-instructions-save"
                 >
                   {isSavingInstructions ? (
                     <>
@@ -250,7 +269,7 @@ export function AIChatSidebar({
         </div>
       )}
 
-      <div className="h-full flex flex-col bg-cream-50 border-l border-cream-200">
+      <div className="h-full flex flex-col bg-cream-50 border-l border-cream-200" data-testid="chat-sidebar">
         {/* Header */}
         <div className="p-4 border-b border-cream-200">
           <div className="flex items-center justify-between mb-2">
@@ -270,6 +289,7 @@ export function AIChatSidebar({
                 size="sm"
                 className={`p-1.5 ${hasExistingInstructions ? 'text-accent-500 bg-accent-50' : 'text-ink-400 hover:text-ink-600'}`}
                 title="AI Instructions"
+                data-testid="chat-instructions"
               >
                 <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9.75 3.104v5.714a2.25 2.25 0 01-.659 1.591L5 14.5M9.75 3.104c-.251.023-.501.05-.75.082m.75-.082a24.301 24.301 0 014.5 0m0 0v5.714c0 .597.237 1.17.659 1.591L19 14.5M14.25 3.104c.251.023.501.05.75.082M19 14.5l-2.47 2.47a3 3 0 01-2.12.878H9.59a3 3 0 01-2.12-.878L5 14.5" />
@@ -282,6 +302,7 @@ export function AIChatSidebar({
                   size="sm"
                   className="p-1.5 text-ink-400 hover:text-ink-600"
                   title="Clear chat"
+                  data-testid="chat-clear"
                 >
                   <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                     <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16" />
@@ -296,9 +317,9 @@ export function AIChatSidebar({
         </div>
 
       {/* Messages */}
-      <div className="flex-1 overflow-y-auto p-4 space-y-4">
-        {messages === undefined ? (
-          // Loading
+      {messages === undefined ? (
+        // Loading
+        <div className="flex-1 overflow-y-auto p-4">
           <div className="space-y-4">
             {[1, 2].map((i) => (
               <div key={i} className="animate-pulse">
@@ -306,9 +327,11 @@ export function AIChatSidebar({
               </div>
             ))}
           </div>
-        ) : messages.length === 0 ? (
-          // Empty state
-          <div className="h-full flex items-center justify-center">
+        </div>
+      ) : messages.length === 0 ? (
+        // Empty state
+        <div className="flex-1 overflow-y-auto p-4">
+          <div className="h-full flex items-center justify-center" data-testid="chat-empty">
             <div className="text-center">
               <div className="w-12 h-12 bg-cream-200 rounded-xl flex items-center justify-center mx-auto mb-3">
                 <svg className="w-6 h-6 text-ink-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -323,53 +346,66 @@ export function AIChatSidebar({
               </p>
             </div>
           </div>
-        ) : (
-          // Messages
-          <>
-            {messages.map((message) => (
+        </div>
+      ) : (
+        // Messages, only those near the viewport mounted
+        <VirtualList
+          items={messages}
+          getKey={(message) => message._id}
+          onStartReached={handleStartReached}
+          className="flex-1 overflow-y-auto px-4 pt-4"
+          itemClassName="pb-4"
+          header={messagesStatus === 'LoadingMore' && (
+            <p className="pb-4 text-center text-xs text-ink-300" data-testid="chat-loading-older">
+              Loading earlier messages…
+            </p>
+          )}
+          footer={isLoading && !isStreaming && (
+            <div className="flex justify-start pb-4" data-testid="chat-loading">
+              <div className="bg-cream-200 rounded-2xl px-4 py-3">
+                <TypingDots />
+              </div>
+            </div>
+          )}
+          renderItem={(message) => (
+            <div
+              data-testid="chat-message"
+              data-message-id={message._id}
+              data-role={message.role}
+              data-status={message.status ?? 'complete'}
+              className={`flex ${message.role === 'user' ? 'justify-end' : 'justify-start'}`}
+            >
               <div
-                key={message._id}
-                className={`flex ${message.role === 'user' ? 'justify-end' : 'justify-start'}`}
+                className={`max-w-[85%] rounded-2xl px-4 py-3 ${
+                  message.role === 'user'
+                    ? 'bg-ink-700 text-cream-50'
+                    : 'bg-cream-200 text-ink-700'
+                }`}
               >
-                <div
-                  className={`max-w-[85%] rounded-2xl px-4 py-3 ${
-                    message.role === 'user'
-                      ? 'bg-ink-700 text-cream-50'
-                      : 'bg-cream-200 text-ink-700'
-                  }`}
-                >
-                  <p className="text-sm whitespace-pre-wrap">{message.content}</p>
-                  {message.role === 'assistant' && (
-                    <Button
-                      onClick={() => handleInsert(message.content)}
-                      variant="ghost"
-                      size="sm"
-                      className="mt-2 text-xs text-accent-500 hover:text-accent-600 flex items-center gap-1"
-                    >
-                      <svg className="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                        <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
-                      </svg>
-                      Insert into document
-                    </Button>
-                  )}
-                </div>
+                {message.status === 'streaming' && !message.content ? (
+                  <TypingDots />
+                ) : (
+                  <p className="text-sm whitespace-pre-wrap" data-testid="chat-message-content">{message.content}</p>
+                )}
+                {message.role === 'assistant' && message.status !== 'streaming' && (
+                  <Button
+                    onClick={() => handleInsert(message.content)}
+                    data-testid="chat-insert"
+                    variant="ghost"
+                    size="sm"
+                    className="mt-2 text-xs text-accent-500 hover:text-accent-600 flex items-center gap-1"
+                  >
+                    <svg className="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
+                    </svg>
+                    Insert into document
+                  </Button>
+                )}
               </div>
-            ))}
-            {isLoading && (
-              <div className="flex justify-start">
-                <div className="bg-cream-200 rounded-2xl px-4 py-3">
-                  <div className="flex items-center gap-2">
-                    <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '0ms' }} />
-                    <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '150ms' }} />
-                    <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '300ms' }} />
-                  </div>
-                </div>
-              </div>
-            )}
-            <div ref={messagesEndRef} />
-          </>
-        )}
-      </div>
+            </div>
+          )}
+        />
+      )}
 
       {/* Input */}
       <form onSubmit={handleSubmit} className="p-4 border-t border-cream-200">
@@ -386,6 +422,7 @@ export function AIChatSidebar({
                   key={index}
                   className="flex items-center gap-1.5 px-2.5 py-1.5 bg-accent-100 text-accent-700 rounded-lg text-xs font-medium"
                   title={snippet}
+                  data-testid="chat-context-snippet"
                 >
                   <svg className="w-3 h-3 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                     <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M7 8h10M7 12h4m1 8l-4-4H5a2 2 0 01-2-2V6a2 2 0 012-2h14a2 2 0 012 2v8a2 2 0 01-2 2h-3l-4 4z" />
@@ -397,6 +434,7 @@ export function AIChatSidebar({
                       onClick={() => onRemoveContext(index)}
                       className="p-0.5 hover:bg-accent-200 rounded transition-colors"
                       title="Remove context"
+                      data-testid="chat-context-remove"
                     >
                       <svg className="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                         <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M6 18L18 6M6 6l12 12" />
@@ -410,6 +448,7 @@ export function AIChatSidebar({
               <button
                 type="button"
                 onClick={onClearContext}
+                data-testid="chat-context-clear"
                 className="px-2 py-1.5 text-xs text-ink-400 hover:text-ink-600 hover:bg-cream-200 rounded-lg transition-colors"
               >
                 Clear all
@@ -424,6 +463,7 @@ export function AIChatSidebar({
             value={input}
             onChange={(e) => setInput(e.target.value)}
             onKeyDown={handleKeyDown}
+            data-testid="chat-input"
             placeholder={contextSnippets.length > 0 ? "Ask about the selected text..." : "Ask AI to help write..."}
             rows={2}
             className="flex-1 px-4 py-3 bg-cream-100 border border-cream-300 rounded-xl text-ink-700 placeholder-ink-300 resize-none focus:outline-none focus:ring-2 focus:ring-accent-400 focus:border-transparent text-sm"
@@ -432,6 +472,7 @@ export function AIChatSidebar({
             type="submit"
             disabled={!input.trim() || isLoading}
             className="self-end p-3 aspect-square min-w-[44px]"
+            data-testid="chat-send"
           >
             <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 19l9 2-9-18-9 18 9-2zm0 0v-8" />
@@ -444,3 +485,12 @@ export function AIChatSidebar({
   );
 }
 
+function TypingDots() {
+  return (
+    <div className="flex items-center gap-2">
+      <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '0ms' }} />
+      <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '150ms' }} />
+      <div className="w-2 h-2 bg-ink-400 rounded-full animate-bounce" style={{ animationDelay: '300ms' }} />
+    </div>
+  );
+}
@@ -1,14 +1,13 @@
 import { useState, useRef, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { useQuery } from 'convex/react';
 import { useAuthActions } from '@convex-dev/auth/react';
-import { api } from '../../convex/_generated/api';
 import { Button } from './ui/Button';
+import { useSession } from './SessionProvider';
 
 export function AccountDropdown() {
   const navigate = useNavigate();
   const { signOut } = useAuthActions();
-  const user = useQuery(api.users.getCurrentUser);
+  const user = useSession()?.user;
   const [isOpen, setIsOpen] = useState(false);
   const dropdownRef = useRef<HTMLDivElement>(null);
 
@@ -49,6 +48,7 @@ export function AccountDropdown() {
         variant="ghost"
         className="flex items-center gap-2 p-1.5 focus:ring-2 focus:ring-ink-200"
         aria-label="Account menu"
+        data-testid="account-menu"
       >
         <div className="w-9 h-9 bg-ink-700 text-cream-50 rounded-full flex items-center justify-center text-sm font-medium">
           {initials}
@@ -79,6 +79,7 @@ export function AccountDropdown() {
           <div className="py-1">
             <Button
               onClick={handleProfileClick}
+              data-testid="account-profile"
               variant="ghost"
               className="w-full px-4 py-2.5 text-left text-ink-700 flex items-center gap-3"
             >
@@ -99,6 +100,7 @@ export function AccountDropdown() {
             </Button>
             <Button
               onClick={handleSignOut}
+              data-testid="account-sign-out"
               variant="ghost"
               className="w-full px-4 py-2.5 text-left text-ink-700 flex items-center gap-3"
             >
@@ -9,10 +9,12 @@ interface DocumentCardProps {
   id: Id<"documents">;
   title: string;
   updatedAt: number;
+  preview?: string;
+  wordCount?: number;
   onDelete: (id: Id<"documents">) => void;
 }
 
-export function DocumentCard({ id, title, updatedAt, onDelete }: DocumentCardProps) {
+export function DocumentCard({ id, title, updatedAt, preview, wordCount, onDelete }: DocumentCardProps) {
   const navigate = useNavigate();
   const [showDeleteDialog, setShowDeleteDialog] = useState(false);
   
@@ -51,6 +53,8 @@ export function DocumentCard({ id, title, updatedAt, onDelete }: DocumentCardPro
     <Card 
       hover 
       className="p-6 group"
+      data-testid="document-card"
+      data-document-id={id}
       onClick={() => navigate(`/document/${id}`)}
     >
       <div className="flex items-start justify-between gap-4">
@@ -61,12 +65,19 @@ export function DocumentCard({ id, title, updatedAt, onDelete }: DocumentCardPro
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
               </svg>
             </div>
-            <h3 className="font-serif text-lg font-medium text-ink-700 truncate">
+            <h3 className="font-serif text-lg font-medium text-ink-700 truncate" data-testid="document-card-title">
               {title || 'Untitled Document'}
             </h3>
           </div>
+          {preview !== undefined && (
+            // Fixed at two lines so every card, and every grid row, is equally tall
+            <p className="text-sm text-ink-500 line-clamp-2 h-10 mb-2" data-testid="document-card-preview">
+              {preview}
+            </p>
+          )}
           <p className="text-sm text-ink-400">
             Last edited {formatDate(updatedAt)}
+            {wordCount !== undefined && ` · ${wordCount} ${wordCount === 1 ? 'word' : 'words'}`}
           </p>
         </div>
         <Button
@@ -75,6 +86,7 @@ export function DocumentCard({ id, title, updatedAt, onDelete }: DocumentCardPro
           size="sm"
           className="p-2 text-ink-300 hover:text-red-500 hover:bg-red-50 opacity-0 group-hover:opacity-100"
           title="Delete document"
+          data-testid="document-card-delete"
         >
           <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
             <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16" />
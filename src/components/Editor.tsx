@@ -130,6 +130,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
             onClick={handleAddToContext}
             className="flex items-center gap-1.5 px-3 py-1.5 bg-ink-700 text-cream-50 rounded-lg shadow-lg hover:bg-ink-800 transition-colors text-sm font-medium"
             title="Add to AI context"
+            data-testid="editor-add-to-context"
           >
             <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
@@ -145,6 +146,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleBold().run()}
           active={editor.isActive('bold')}
           title="Bold"
+          testId="editor-toolbar-bold"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="currentColor">
             <path d="M6 4h8a4 4 0 0 1 4 4 4 4 0 0 1-4 4H6z M6 12h9a4 4 0 0 1 4 4 4 4 0 0 1-4 4H6z" stroke="currentColor" strokeWidth="2" fill="none"/>
@@ -154,6 +156,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleItalic().run()}
           active={editor.isActive('italic')}
           title="Italic"
+          testId="editor-toolbar-italic"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="currentColor">
             <line x1="19" y1="4" x2="10" y2="4" stroke="currentColor" strokeWidth="2"/>
@@ -165,6 +168,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleStrike().run()}
           active={editor.isActive('strike')}
           title="Strikethrough"
+          testId="editor-toolbar-strike"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <line x1="4" y1="12" x2="20" y2="12"/>
@@ -178,6 +182,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleHeading({ level: 1 }).run()}
           active={editor.isActive('heading', { level: 1 })}
           title="Heading 1"
+          testId="editor-toolbar-heading-1"
         >
           H1
         </ToolbarButton>
@@ -185,6 +190,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleHeading({ level: 2 }).run()}
           active={editor.isActive('heading', { level: 2 })}
           title="Heading 2"
+          testId="editor-toolbar-heading-2"
         >
           H2
         </ToolbarButton>
@@ -192,6 +198,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleHeading({ level: 3 }).run()}
           active={editor.isActive('heading', { level: 3 })}
           title="Heading 3"
+          testId="editor-toolbar-heading-3"
         >
           H3
         </ToolbarButton>
@@ -202,6 +209,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleBulletList().run()}
           active={editor.isActive('bulletList')}
           title="Bullet List"
+          testId="editor-toolbar-bullet-list"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <line x1="9" y1="6" x2="20" y2="6"/>
@@ -216,6 +224,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleOrderedList().run()}
           active={editor.isActive('orderedList')}
           title="Numbered List"
+          testId="editor-toolbar-ordered-list"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <line x1="10" y1="6" x2="20" y2="6"/>
@@ -233,6 +242,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleBlockquote().run()}
           active={editor.isActive('blockquote')}
           title="Quote"
+          testId="editor-toolbar-blockquote"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="currentColor">
             <path d="M10 8v8H6V12c0-2 2-4 4-4zm8 0v8h-4V12c0-2 2-4 4-4z"/>
@@ -242,6 +252,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().toggleCodeBlock().run()}
           active={editor.isActive('codeBlock')}
           title="Code Block"
+          testId="editor-toolbar-code-block"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <polyline points="16 18 22 12 16 6"/>
@@ -255,6 +266,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().undo().run()}
           disabled={!editor.can().undo()}
           title="Undo"
+          testId="editor-toolbar-undo"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <path d="M3 10h10a5 5 0 0 1 5 5v2"/>
@@ -266,6 +278,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
           onClick={() => editor.chain().focus().redo().run()}
           disabled={!editor.can().redo()}
           title="Redo"
+          testId="editor-toolbar-redo"
         >
           <svg className="w-4 h-4" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
             <path d="M21 10H11a5 5 0 0 0-5 5v2"/>
@@ -277,7 +290,7 @@ export function Editor({ content, onChange, placeholder = 'Start writing...', on
       
       {/* Editor Content */}
       <div className="flex-1 p-6 overflow-y-auto bg-cream-50 rounded-b-xl">
-        <EditorContent editor={editor} />
+        <EditorContent editor={editor} data-testid="editor-content" />
       </div>
     </div>
   );
@@ -288,15 +301,18 @@ interface ToolbarButtonProps {
   active?: boolean;
   disabled?: boolean;
   title?: string;
+  testId?: string;
   children: React.ReactNode;
 }
 
-function ToolbarButton({ onClick, active, disabled, title, children }: ToolbarButtonProps) {
+function ToolbarButton({ onClick, active, disabled, title, testId, children }: ToolbarButtonProps) {
   return (
     <Button
       onClick={onClick}
       disabled={disabled}
       title={title}
+      data-testid={testId}
+      data-active={active ? 'true' : undefined}
       variant={active ? '3d' : 'ghost'}
       size="sm"
       className={`p-2 ${disabled ? 'opacity-40 cursor-not-allowed' : ''}`}
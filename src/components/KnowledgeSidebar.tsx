@@ -73,7 +73,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
   };
 
   return (
-    <div className="h-full flex flex-col bg-cream-50 border-r border-cream-200">
+    <div className="h-full flex flex-col bg-cream-50 border-r border-cream-200" data-testid="knowledge-sidebar">
       {/* Header */}
       <div className="p-4 border-b border-cream-200">
         <div className="flex items-center justify-between mb-2">
@@ -85,6 +85,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
               size="sm"
               className="p-1.5 text-ink-500 hover:text-ink-700"
               title="Add knowledge"
+              data-testid="knowledge-add"
             >
               <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
@@ -102,12 +103,14 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
         <div className="p-4 border-b border-cream-200 space-y-3">
           <Input
             placeholder="Title"
+            data-testid="knowledge-title-input"
             value={title}
             onChange={(e) => setTitle(e.target.value)}
             className="text-sm"
           />
           <Textarea
             placeholder="Paste your reference content here..."
+            data-testid="knowledge-content-input"
             value={content}
             onChange={(e) => setContent(e.target.value)}
             rows={6}
@@ -119,10 +122,11 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
               onClick={editingId ? handleUpdate : handleAdd}
               disabled={!title.trim() || !content.trim()}
               className="flex-1"
+              data-testid="knowledge-submit"
             >
               {editingId ? 'Update' : 'Add Knowledge'}
             </Button>
-            <Button size="sm" variant="ghost" onClick={handleCancel}>
+            <Button size="sm" variant="ghost" onClick={handleCancel} data-testid="knowledge-cancel">
               Cancel
             </Button>
           </div>
@@ -152,7 +156,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
             <p className="text-sm text-ink-400 mb-3">
               No knowledge added yet
             </p>
-            <Button size="sm" variant="secondary" onClick={() => setIsAdding(true)}>
+            <Button size="sm" variant="secondary" onClick={() => setIsAdding(true)} data-testid="knowledge-empty-add">
               Add Knowledge
             </Button>
           </div>
@@ -162,6 +166,8 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
             {knowledgeItems.map((item) => (
               <div
                 key={item._id}
+                data-testid="knowledge-item"
+                data-knowledge-id={item._id}
                 className={`p-3 rounded-xl border transition-colors group ${
                   editingId === item._id
                     ? 'bg-accent-400/10 border-accent-400'
@@ -169,7 +175,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
                 }`}
               >
                 <div className="flex items-start justify-between gap-2">
-                  <h3 className="font-medium text-sm text-ink-700 truncate flex-1">
+                  <h3 className="font-medium text-sm text-ink-700 truncate flex-1" data-testid="knowledge-item-title">
                     {item.title}
                   </h3>
                   <div className="flex items-center gap-1 opacity-0 group-hover:opacity-100 transition-opacity">
@@ -179,6 +185,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
                       size="sm"
                       className="p-1 text-ink-400 hover:text-ink-600"
                       title="Edit"
+                      data-testid="knowledge-item-edit"
                     >
                       <svg className="w-3.5 h-3.5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                         <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z" />
@@ -190,6 +197,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
                       size="sm"
                       className="p-1 text-ink-400 hover:text-red-500 hover:bg-red-50"
                       title="Delete"
+                      data-testid="knowledge-item-delete"
                     >
                       <svg className="w-3.5 h-3.5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                         <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16" />
@@ -197,7 +205,7 @@ export function KnowledgeSidebar({ documentId }: KnowledgeSidebarProps) {
                     </Button>
                   </div>
                 </div>
-                <p className="text-xs text-ink-400 mt-1 line-clamp-2">
+                <p className="text-xs text-ink-400 mt-1 line-clamp-2" data-testid="knowledge-item-content">
                   {item.content}
                 </p>
               </div>
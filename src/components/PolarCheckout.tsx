@@ -1,9 +1,13 @@
 import { useEffect, useRef, useCallback } from 'react';
 import { PolarEmbedCheckout } from '@polar-sh/checkout/embed';
+import { useMutation } from 'convex/react';
+import { api } from '../../convex/_generated/api';
+import type { Id } from '../../convex/_generated/dataModel';
 
 interface PolarCheckoutProps {
   userEmail: string;
-  onSuccess: () => void;
+  // Called with the checkout session the webhook will complete
+  onSuccess: (checkoutSessionId: Id<'checkoutSessions'>) => void;
   onClose: () => void;
 }
 
@@ -14,10 +18,13 @@ const CHECKOUT_LINK = import.meta.env.VITE_POLAR_CHECKOUT_LINK ||
 export function PolarCheckout({ userEmail, onSuccess, onClose }: PolarCheckoutProps) {
   const checkoutRef = useRef<Awaited<ReturnType<typeof PolarEmbedCheckout.create>> | null>(null);
   const isInitializedRef = useRef(false);
+  const startCheckout = useMutation(api.checkout.startCheckout);
+  const reportCheckoutSuccess = useMutation(api.checkout.reportCheckoutSuccess);
 
-  const handleSuccess = useCallback(() => {
-    onSuccess();
-  }, [onSuccess]);
+  const handleSuccess = useCallback((checkoutSessionId: Id<'checkoutSessions'>) => {
+    void reportCheckoutSuccess({ checkoutSessionId });
+    onSuccess(checkoutSessionId);
+  }, [onSuccess, reportCheckoutSuccess]);
 
   const handleClose = useCallback(() => {
     onClose();
@@ -30,13 +37,17 @@ export function PolarCheckout({ userEmail, onSuccess, onClose }: PolarCheckoutPr
 
     const initCheckout = async () => {
       try {
+        // Record the checkout so the webhook can report when it went through
+        const checkoutSessionId = await startCheckout();
+
         // Build checkout URL with customer email prefilled and success URL
         const checkoutUrl = new URL(CHECKOUT_LINK);
         checkoutUrl.searchParams.set('customer_email', userEmail);
         
         // Set the success URL to redirect back to our app after checkout
-        const successUrl = `${window.location.origin}/checkout/success`;
-        checkoutUrl.searchParams.set('success_url', successUrl);
+        const successUrl = new URL('/checkout/success', window.location.origin);
+        successUrl.searchParams.set('checkout', checkoutSessionId);
+        checkoutUrl.searchParams.set('success_url', successUrl.toString());
         
         // Create the embedded checkout
         const checkout = await PolarEmbedCheckout.create(checkoutUrl.toString(), 'light');
@@ -45,7 +56,7 @@ export function PolarCheckout({ userEmail, onSuccess, onClose }: PolarCheckoutPr
         // Listen for success event (may fire before redirect)
         checkout.addEventListener('success', () => {
           console.log('Polar checkout success event received');
-          handleSuccess();
+          handleSuccess(checkoutSessionId);
         });
 
         // Listen for close event
@@ -71,7 +82,7 @@ export function PolarCheckout({ userEmail, onSuccess, onClose }: PolarCheckoutPr
         checkoutRef.current = null;
       }
     };
-  }, [userEmail, handleSuccess, handleClose]);
+  }, [userEmail, handleSuccess, handleClose, startCheckout]);
 
   // This component doesn't render anything visible - the checkout is rendered by Polar's SDK
   return null;
@@ -0,0 +1,21 @@
+import { createContext, useContext } from 'react';
+import type { ReactNode } from 'react';
+import { useQuery } from 'convex/react';
+import type { FunctionReturnType } from 'convex/server';
+import { api } from '../../convex/_generated/api';
+
+export type Session = FunctionReturnType<typeof api.users.session>;
+
+// undefined while the session is loading, null when signed out
+const SessionContext = createContext<Session | undefined>(undefined);
+
+// Subscribes to users.session once for the whole app, so moving between
+// protected pages never waits on the user or their subscription again.
+export function SessionProvider({ children }: { children: ReactNode }) {
+  const session = useQuery(api.users.session);
+  return <SessionContext.Provider value={session}>{children}</SessionContext.Provider>;
+}
+
+export function useSession() {
+  return useContext(SessionContext);
+}
@@ -2,10 +2,11 @@ import { useState } from 'react';
 import { Card } from './ui/Card';
 import { Button } from './ui/Button';
 import { PolarCheckout } from './PolarCheckout';
+import type { Id } from '../../convex/_generated/dataModel';
 
 interface TrialPopupProps {
   userEmail: string;
-  onSuccess: () => void;
+  onSuccess: (checkoutSessionId: Id<'checkoutSessions'>) => void;
 }
 
 export function TrialPopup({ userEmail, onSuccess }: TrialPopupProps) {
@@ -54,9 +55,9 @@ export function TrialPopup({ userEmail, onSuccess }: TrialPopupProps) {
     setShowCheckout(true);
   };
 
-  const handleCheckoutSuccess = () => {
+  const handleCheckoutSuccess = (checkoutSessionId: Id<'checkoutSessions'>) => {
     setShowCheckout(false);
-    onSuccess();
+    onSuccess(checkoutSessionId);
   };
 
   const handleCheckoutClose = () => {
@@ -66,7 +67,7 @@ export function TrialPopup({ userEmail, onSuccess }: TrialPopupProps) {
   return (
     <>
       <div className="fixed inset-0 bg-ink-900/50 backdrop-blur-sm flex items-center justify-center z-50 p-3 sm:p-4 overflow-y-auto">
-        <Card className="w-full max-w-lg p-5 sm:p-8 animate-in fade-in zoom-in duration-200 my-auto">
+        <Card className="w-full max-w-lg p-5 sm:p-8 animate-in fade-in zoom-in duration-200 my-auto" data-testid="trial-popup">
           {/* Header */}
           <div className="text-center mb-6 sm:mb-8">
             <div className="w-14 h-14 sm:w-16 sm:h-16 bg-accent-100 rounded-2xl flex items-center justify-center mx-auto mb-3 sm:mb-4">
@@ -114,6 +115,7 @@ export function TrialPopup({ userEmail, onSuccess }: TrialPopupProps) {
           {/* CTA Button */}
           <Button 
             onClick={handleStartTrial} 
+            data-testid="trial-start"
             className="w-full"
             size="lg"
           >
@@ -0,0 +1,103 @@
+import { useEffect, useLayoutEffect, useRef, useState } from 'react';
+import type { Key, ReactNode } from 'react';
+
+interface VirtualGridProps<T> {
+  items: T[];
+  getKey: (item: T) => Key;
+  renderItem: (item: T) => ReactNode;
+  // Called when the last rows come into view, to load the next page
+  onEndReached?: () => void;
+  // Rows rendered beyond the viewport on each side
+  overscan?: number;
+  className?: string;
+  'data-testid'?: string;
+}
+
+// Tailwind breakpoints of the card grid: grid-cols-1 sm:grid-cols-2 lg:grid-cols-3
+function columnsFor(width: number) {
+  if (width >= 1024) return 3;
+  if (width >= 640) return 2;
+  return 1;
+}
+
+// Row height used until the first row has been measured
+const ESTIMATED_ROW_HEIGHT = 180;
+
+// A window-scrolled grid of equally tall items that only mounts the rows
+// near the viewport, so the dashboard stays as cheap with thousands of
+// documents as with a handful.
+export function VirtualGrid<T>({
+  items,
+  getKey,
+  renderItem,
+  onEndReached,
+  overscan = 3,
+  className = '',
+  'data-testid': testId,
+}: VirtualGridProps<T>) {
+  const gridRef = useRef<HTMLDivElement>(null);
+  const [columns, setColumns] = useState(() => columnsFor(window.innerWidth));
+  const [rowStride, setRowStride] = useState(ESTIMATED_ROW_HEIGHT);
+  const [range, setRange] = useState({ start: 0, end: 0 });
+
+  const rowCount = Math.ceil(items.length / columns);
+
+  // Work out which rows intersect the viewport, plus the overscan
+  useEffect(() => {
+    const update = () => {
+      const grid = gridRef.current;
+      if (!grid) return;
+      setColumns(columnsFor(window.innerWidth));
+      const top = grid.getBoundingClientRect().top;
+      const first = Math.floor(-top / rowStride);
+      const last = Math.ceil((window.innerHeight - top) / rowStride);
+      const start = Math.max(0, first - overscan);
+      const end = Math.min(rowCount, Math.max(start, last + overscan));
+      setRange((previous) =>
+        previous.start === start && previous.end === end ? previous : { start, end }
+      );
+    };
+    update();
+    window.addEventListener('scroll', update, { passive: true });
+    window.addEventListener('resize', update);
+    return () => {
+      window.removeEventListener('scroll', update);
+      window.removeEventListener('resize', update);
+    };
+  }, [rowCount, rowStride, overscan]);
+
+  // Measure the real row height (item plus row gap) once items are mounted
+  useLayoutEffect(() => {
+    const grid = gridRef.current;
+    const item = grid?.firstElementChild;
+    if (!grid || !(item instanceof HTMLElement)) return;
+    const gap = parseFloat(getComputedStyle(grid).rowGap) || 0;
+    const stride = item.offsetHeight + gap;
+    if (stride > 0 && stride !== rowStride) {
+      setRowStride(stride);
+    }
+  });
+
+  useEffect(() => {
+    if (onEndReached && rowCount > 0 && range.end >= rowCount) {
+      onEndReached();
+    }
+  }, [onEndReached, range.end, rowCount]);
+
+  const visible = items.slice(range.start * columns, range.end * columns);
+  const paddingTop = range.start * rowStride;
+  const paddingBottom = Math.max(0, (rowCount - range.end) * rowStride);
+
+  return (
+    <div
+      ref={gridRef}
+      className={className}
+      style={{ paddingTop, paddingBottom }}
+      data-testid={testId}
+    >
+      {visible.map((item) => (
+        <div key={getKey(item)}>{renderItem(item)}</div>
+      ))}
+    </div>
+  );
+}
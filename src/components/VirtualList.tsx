@@ -0,0 +1,172 @@
+import { useEffect, useLayoutEffect, useRef, useState } from 'react';
+import type { Key, ReactNode } from 'react';
+
+interface VirtualListProps<T> {
+  // Oldest first; the list starts scrolled to the end
+  items: T[];
+  getKey: (item: T) => Key;
+  renderItem: (item: T) => ReactNode;
+  // Called when the top of the list comes into view, to load older items
+  onStartReached?: () => void;
+  // Rendered above the first item and after the last one
+  header?: ReactNode;
+  footer?: ReactNode;
+  // Applied to the wrapper of every item, e.g. for spacing
+  itemClassName?: string;
+  // Pixels rendered beyond the viewport on each side
+  overscan?: number;
+  className?: string;
+  'data-testid'?: string;
+}
+
+// Height used for items not measured yet
+const ESTIMATED_ITEM_HEIGHT = 96;
+// Distance from the end within which the list keeps following new content
+const STICK_THRESHOLD = 40;
+
+// A scrollable list of items of any height that only mounts those near the
+// viewport, for transcripts that grow at the end: it stays scrolled to the
+// end while new items arrive or the last one grows, and keeps the visible
+// items in place when older ones are added above.
+export function VirtualList<T>({
+  items,
+  getKey,
+  renderItem,
+  onStartReached,
+  header,
+  footer,
+  itemClassName = '',
+  overscan = 600,
+  className = '',
+  'data-testid': testId,
+}: VirtualListProps<T>) {
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const heights = useRef(new Map<Key, number>());
+  const [, setMeasured] = useState(0);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(0);
+  const atEnd = useRef(true);
+  const lastKey = useRef<Key | null>(null);
+  // The first rendered item and where it was, to keep it in place
+  const anchor = useRef<{ key: Key; offset: number } | null>(null);
+
+  const keys = items.map(getKey);
+  const offsets = new Array<number>(items.length + 1);
+  offsets[0] = 0;
+  keys.forEach((key, index) => {
+    offsets[index + 1] = offsets[index] + (heights.current.get(key) ?? ESTIMATED_ITEM_HEIGHT);
+  });
+  const total = offsets[items.length];
+
+  let start = 0;
+  while (start < items.length && offsets[start + 1] < scrollTop - overscan) start++;
+  let end = start;
+  while (end < items.length && offsets[end] < scrollTop + viewportHeight + overscan) end++;
+
+  const observer = useRef<ResizeObserver | null>(null);
+  const observed = useRef(new Map<Element, Key>());
+  useEffect(() => {
+    const resize = new ResizeObserver((entries) => {
+      let changed = false;
+      for (const entry of entries) {
+        const key = observed.current.get(entry.target);
+        const height = (entry.target as HTMLElement).offsetHeight;
+        if (key !== undefined && height > 0 && heights.current.get(key) !== height) {
+          heights.current.set(key, height);
+          changed = true;
+        }
+      }
+      if (changed) setMeasured((count) => count + 1);
+    });
+    observer.current = resize;
+    observed.current.forEach((_, element) => resize.observe(element));
+    return () => resize.disconnect();
+  }, []);
+
+  // One stable ref callback per item, so re-renders do not re-observe
+  const itemRefs = useRef(new Map<Key, (element: HTMLDivElement | null) => () => void>());
+  const itemRef = (key: Key) => {
+    let ref = itemRefs.current.get(key);
+    if (!ref) {
+      ref = (element) => {
+        if (element) {
+          observed.current.set(element, key);
+          observer.current?.observe(element);
+        }
+        return () => {
+          if (element) {
+            observed.current.delete(element);
+            observer.current?.unobserve(element);
+          }
+        };
+      };
+      itemRefs.current.set(key, ref);
+    }
+    return ref;
+  };
+
+  useEffect(() => {
+    const element = scrollRef.current;
+    if (!element) return;
+    const resize = new ResizeObserver(() => setViewportHeight(element.clientHeight));
+    resize.observe(element);
+    return () => resize.disconnect();
+  }, []);
+
+  const handleScroll = () => {
+    const element = scrollRef.current;
+    if (!element) return;
+    atEnd.current =
+      element.scrollHeight - element.scrollTop - element.clientHeight < STICK_THRESHOLD;
+    setScrollTop(element.scrollTop);
+  };
+
+  // Follow the end, or keep the anchored item where it was
+  useLayoutEffect(() => {
+    const element = scrollRef.current;
+    if (!element) return;
+    const newLast = keys.length > 0 ? keys[keys.length - 1] : null;
+    const appended = newLast !== lastKey.current;
+    lastKey.current = newLast;
+    if (atEnd.current || appended) {
+      element.scrollTop = element.scrollHeight;
+      atEnd.current = true;
+    } else if (anchor.current) {
+      const index = keys.indexOf(anchor.current.key);
+      if (index !== -1 && offsets[index] !== anchor.current.offset) {
+        element.scrollTop += offsets[index] - anchor.current.offset;
+      }
+    }
+    if (element.scrollTop !== scrollTop) {
+      setScrollTop(element.scrollTop);
+    }
+    anchor.current = start < keys.length ? { key: keys[start], offset: offsets[start] } : null;
+  });
+
+  // Checked against the live position, which the layout effect may just
+  // have moved to the end
+  const nearStart = scrollTop < overscan;
+  useEffect(() => {
+    const element = scrollRef.current;
+    if (onStartReached && element && items.length > 0 && element.scrollTop < overscan) {
+      onStartReached();
+    }
+  }, [onStartReached, nearStart, items.length, overscan]);
+
+  return (
+    <div ref={scrollRef} onScroll={handleScroll} className={className} data-testid={testId}>
+      {header}
+      <div style={{ height: offsets[start] }} />
+      {items.slice(start, end).map((item, index) => {
+        const key = keys[start + index];
+        return (
+          <div key={key} ref={itemRef(key)} className={itemClassName}>
+            {renderItem(item)}
+          </div>
+        );
+      })}
+      <div style={{ height: total - offsets[end] }} />
+      {footer}
+    </div>
+  );
+}
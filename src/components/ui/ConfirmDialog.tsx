@@ -62,6 +62,8 @@ export function ConfirmDialog({
       <Card
         ref={dialogRef}
         className="w-full max-w-sm p-6 animate-in fade-in zoom-in duration-200"
+        role="dialog"
+        data-testid="confirm-dialog"
       >
         {/* Icon */}
         <div className="flex justify-center mb-4">
@@ -116,12 +118,14 @@ export function ConfirmDialog({
             onClick={onCancel}
             variant="secondary"
             className="flex-1"
+            data-testid="confirm-dialog-cancel"
           >
             {cancelLabel}
           </Button>
           <Button
             onClick={onConfirm}
             variant="primary"
+            data-testid="confirm-dialog-confirm"
             className={`flex-1 ${
               variant === 'danger'
                 ? '!bg-red-500 hover:!bg-red-600 !shadow-[0_4px_0_0_#b91c1c,0_6px_12px_rgba(239,68,68,0.3)] active:!shadow-[0_1px_0_0_#b91c1c,0_2px_4px_rgba(239,68,68,0.2)] active:!translate-y-[3px]'
@@ -122,13 +122,14 @@ export function Auth() {
             </p>
           </div>
 
-          <form onSubmit={handleSubmit} className="space-y-5">
+          <form onSubmit={handleSubmit} className="space-y-5" data-testid="auth-form">
             {/* Use key prop to ensure React correctly identifies each input during mode switches */}
             {/* Always render name field container to maintain stable DOM structure */}
             <div key="name-container" className={isSignUp ? '' : 'hidden'}>
               <Input
                 ref={nameRef}
                 id="name"
+                data-testid="auth-name"
                 label="Name"
                 type="text"
                 placeholder="Your name"
@@ -139,6 +140,7 @@ export function Auth() {
               key="email"
               ref={emailRef}
               id="email"
+              data-testid="auth-email"
               label="Email"
               type="email"
               placeholder="you@example.com"
@@ -149,6 +151,7 @@ export function Auth() {
               key="password"
               ref={passwordRef}
               id="password"
+              data-testid="auth-password"
               label="Password"
               type="password"
               placeholder="••••••••"
@@ -158,12 +161,12 @@ export function Auth() {
             />
             
             {error && (
-              <div className="p-3 bg-red-50 border border-red-200 rounded-xl text-red-600 text-sm">
+              <div className="p-3 bg-red-50 border border-red-200 rounded-xl text-red-600 text-sm" data-testid="auth-error">
                 {error}
               </div>
             )}
 
-            <Button type="submit" className="w-full" disabled={loading}>
+            <Button type="submit" className="w-full" disabled={loading} data-testid="auth-submit">
               {loading ? (
                 <svg className="animate-spin h-5 w-5" viewBox="0 0 24 24">
                   <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4" fill="none" />
@@ -179,6 +182,7 @@ export function Auth() {
             <Button
               type="button"
               variant="ghost"
+              data-testid="auth-toggle-mode"
               onClick={() => {
                 setIsSignUp(!isSignUp);
                 setError('');
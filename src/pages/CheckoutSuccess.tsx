@@ -1,43 +1,43 @@
-import { useEffect, useState, useRef } from 'react';
-import { useNavigate } from 'react-router-dom';
-import { useConvexAuth, useQuery } from 'convex/react';
+import { useEffect, useRef } from 'react';
+import { useNavigate, useSearchParams } from 'react-router-dom';
+import { useConvexAuth, useMutation, useQuery } from 'convex/react';
 import { api } from '../../convex/_generated/api';
+import { useSession } from '../components/SessionProvider';
 
 export function CheckoutSuccess() {
   const navigate = useNavigate();
   const { isLoading: authLoading, isAuthenticated } = useConvexAuth();
-  const subscriptionStatus = useQuery(api.subscriptions.getSubscriptionStatus);
-  const [pollCount, setPollCount] = useState(0);
-  const maxPolls = 30; // Poll for up to 30 seconds
+  const subscriptionStatus = useSession()?.entitlement;
+  // Set by PolarCheckout; without it the user's latest checkout is used
+  const checkoutSessionId = useSearchParams()[0].get('checkout') ?? undefined;
+  const checkoutSession = useQuery(
+    api.checkout.getCheckoutSession,
+    isAuthenticated ? { checkoutSessionId } : 'skip'
+  );
+  const reportCheckoutSuccess = useMutation(api.checkout.reportCheckoutSuccess);
   const hasRedirectedRef = useRef(false);
 
-  // Poll for subscription status
+  // Only wait a short while for the webhook from here on
   useEffect(() => {
-    if (pollCount >= maxPolls) {
-      // Timeout - redirect to dashboard anyway, let ProtectedRoute handle it
-      if (!hasRedirectedRef.current) {
-        hasRedirectedRef.current = true;
-        navigate('/dashboard', { replace: true });
-      }
-      return;
+    if (isAuthenticated) {
+      void reportCheckoutSuccess({ checkoutSessionId });
     }
+  }, [isAuthenticated, checkoutSessionId, reportCheckoutSuccess]);
 
-    const timer = setTimeout(() => {
-      setPollCount(prev => prev + 1);
-    }, 1000);
-
-    return () => clearTimeout(timer);
-  }, [pollCount, navigate]);
-
-  // Check subscription status and redirect when confirmed
+  // Redirect as soon as the webhook completes the checkout. If it expired
+  // or is unknown, redirect anyway and let ProtectedRoute handle it.
   useEffect(() => {
-    if (hasRedirectedRef.current) return;
+    if (hasRedirectedRef.current || checkoutSession === undefined) return;
     
-    if (subscriptionStatus?.hasActiveSubscription) {
+    if (
+      subscriptionStatus?.hasActiveSubscription ||
+      checkoutSession === null ||
+      checkoutSession.status !== 'pending'
+    ) {
       hasRedirectedRef.current = true;
       navigate('/dashboard', { replace: true });
     }
-  }, [subscriptionStatus, navigate]);
+  }, [checkoutSession, subscriptionStatus, navigate]);
 
   // If not authenticated, redirect to auth
   useEffect(() => {
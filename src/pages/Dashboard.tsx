@@ -1,14 +1,22 @@
 import { useNavigate, Link } from 'react-router-dom';
-import { useQuery, useMutation } from 'convex/react';
+import { usePaginatedQuery, useMutation } from 'convex/react';
 import { api } from '../../convex/_generated/api';
 import type { Id } from '../../convex/_generated/dataModel';
 import { Button } from '../components/ui/Button';
 import { DocumentCard } from '../components/DocumentCard';
+import { VirtualGrid } from '../components/VirtualGrid';
 import { AccountDropdown } from '../components/AccountDropdown';
 
+// Documents fetched per page as the grid is scrolled
+const PAGE_SIZE = 30;
+
 export function Dashboard() {
   const navigate = useNavigate();
-  const documents = useQuery(api.documents.list);
+  const { results: documents, status, loadMore } = usePaginatedQuery(
+    api.documents.list,
+    {},
+    { initialNumItems: PAGE_SIZE }
+  );
   const createDocument = useMutation(api.documents.create);
   const deleteDocument = useMutation(api.documents.remove);
 
@@ -17,6 +25,12 @@ export function Dashboard() {
     navigate(`/document/${id}`);
   };
 
+  const handleEndReached = () => {
+    if (status === 'CanLoadMore') {
+      loadMore(PAGE_SIZE);
+    }
+  };
+
   const handleDeleteDocument = async (id: Id<"documents">) => {
     await deleteDocument({ id });
   };
@@ -46,7 +60,7 @@ export function Dashboard() {
             <h1 className="font-serif text-2xl sm:text-3xl font-semibold text-ink-800">
               Your Documents
             </h1>
-            <Button onClick={handleCreateDocument} className="w-full sm:w-auto">
+            <Button onClick={handleCreateDocument} className="w-full sm:w-auto" data-testid="dashboard-new-document">
               <svg className="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
               </svg>
@@ -58,7 +72,7 @@ export function Dashboard() {
           </p>
         </div>
 
-        {documents === undefined ? (
+        {status === 'LoadingFirstPage' ? (
           // Loading state
           <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4 sm:gap-6">
             {[1, 2, 3].map((i) => (
@@ -85,7 +99,7 @@ export function Dashboard() {
             <p className="text-ink-500 mb-8 max-w-md mx-auto">
               Create your first document and start writing with AI-powered assistance
             </p>
-            <Button size="lg" onClick={handleCreateDocument}>
+            <Button size="lg" onClick={handleCreateDocument} data-testid="dashboard-create-first-document">
               <svg className="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4v16m8-8H4" />
               </svg>
@@ -94,17 +108,23 @@ export function Dashboard() {
           </div>
         ) : (
           // Documents grid
-          <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4 sm:gap-6">
-            {documents.map((doc) => (
+          <VirtualGrid
+            items={documents}
+            getKey={(doc) => doc.documentId}
+            renderItem={(doc) => (
               <DocumentCard
-                key={doc._id}
-                id={doc._id}
+                id={doc.documentId}
                 title={doc.title}
                 updatedAt={doc.updatedAt}
+                preview={doc.preview}
+                wordCount={doc.wordCount}
                 onDelete={handleDeleteDocument}
               />
-            ))}
-          </div>
+            )}
+            onEndReached={handleEndReached}
+            className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4 sm:gap-6"
+            data-testid="dashboard-documents"
+          />
         )}
       </main>
     </div>
@@ -3,6 +3,7 @@ import { useParams, useNavigate, Link } from 'react-router-dom';
 import { useQuery, useMutation } from 'convex/react';
 import { api } from '../../convex/_generated/api';
 import type { Id } from '../../convex/_generated/dataModel';
+import { applyTextEdits, diffText } from '../../convex/lib/textDiff';
 import { Button } from '../components/ui/Button';
 import { Editor } from '../components/Editor';
 import { KnowledgeSidebar } from '../components/KnowledgeSidebar';
@@ -13,8 +14,13 @@ export function DocumentEditor() {
   const navigate = useNavigate();
   const documentId = id as Id<"documents">;
   
-  const document = useQuery(api.documents.get, { id: documentId });
+  // The content is read once; after that the page follows the document
+  // through its metadata and content edits, never the whole content again.
+  const [contentLoaded, setContentLoaded] = useState(false);
+  const document = useQuery(api.documents.getMeta, { id: documentId });
+  const initialDocument = useQuery(api.documents.get, contentLoaded ? 'skip' : { id: documentId });
   const updateDocument = useMutation(api.documents.update);
+  const applyEdits = useMutation(api.documents.applyEdits);
   
   const [title, setTitle] = useState('');
   const [content, setContent] = useState('');
@@ -27,15 +33,48 @@ export function DocumentEditor() {
   // Track if we've initialized from the document
   const initialized = useRef(false);
   
+  // Content and version the server last acknowledged: the base of the next delta
+  const savedContentRef = useRef('');
+  const versionRef = useRef(0);
+  const [knownVersion, setKnownVersion] = useState<number | null>(null);
+  const remoteEdits = useQuery(
+    api.documents.editsSince,
+    knownVersion === null ? 'skip' : { id: documentId, sinceVersion: knownVersion }
+  );
+  
   // Initialize state from document
   useEffect(() => {
-    if (document && !initialized.current) {
-      setTitle(document.title);
-      setContent(document.content);
-      setLastSaved(new Date(document.updatedAt));
+    if (initialDocument && !initialized.current) {
+      setTitle(initialDocument.title);
+      setContent(initialDocument.content);
+      setLastSaved(new Date(initialDocument.updatedAt));
+      savedContentRef.current = initialDocument.content;
+      versionRef.current = initialDocument.version ?? 0;
+      setKnownVersion(versionRef.current);
+      setContentLoaded(true);
       initialized.current = true;
     }
-  }, [document]);
+  }, [initialDocument]);
+  
+  // Keep the delta base in step with saves from this and other clients.
+  // The editor itself is not updated, so a later save still wins as before.
+  useEffect(() => {
+    if (!remoteEdits) return;
+    if (remoteEdits.version > versionRef.current) {
+      if ('content' in remoteEdits) {
+        savedContentRef.current = remoteEdits.content;
+      } else {
+        for (const edit of remoteEdits.edits) {
+          if (edit.version > versionRef.current) {
+            savedContentRef.current = applyTextEdits(savedContentRef.current, edit.changes);
+          }
+        }
+      }
+      versionRef.current = remoteEdits.version;
+    }
+    // Re-subscribe from the newest version so only later edits are sent.
+    setKnownVersion(versionRef.current);
+  }, [remoteEdits]);
   
   // Auto-redirect to dashboard when document is deleted
   // This handles the case where a document is deleted while viewing it
@@ -49,21 +88,35 @@ export function DocumentEditor() {
   // Debounced save
   const saveTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   
+  // Send only what changed since the last saved version; if another client
+  // saved in between, fall back to writing the whole content.
+  const saveContent = useCallback(async (newContent: string) => {
+    const edits = diffText(savedContentRef.current, newContent);
+    if (edits.length === 0) return;
+    const result = await applyEdits({ id: documentId, baseVersion: versionRef.current, edits });
+    const version = result.conflict
+      ? await updateDocument({ id: documentId, content: newContent })
+      : result.version;
+    savedContentRef.current = newContent;
+    versionRef.current = Math.max(versionRef.current, version);
+  }, [documentId, applyEdits, updateDocument]);
+  
   const saveDocument = useCallback(async (newTitle?: string, newContent?: string) => {
     if (!documentId) return;
     
     setIsSaving(true);
     try {
-      await updateDocument({
-        id: documentId,
-        ...(newTitle !== undefined && { title: newTitle }),
-        ...(newContent !== undefined && { content: newContent }),
-      });
+      if (newTitle !== undefined) {
+        await updateDocument({ id: documentId, title: newTitle });
+      }
+      if (newContent !== undefined) {
+        await saveContent(newContent);
+      }
       setLastSaved(new Date());
     } finally {
       setIsSaving(false);
     }
-  }, [documentId, updateDocument]);
+  }, [documentId, updateDocument, saveContent]);
   
   const debouncedSave = useCallback((newTitle?: string, newContent?: string) => {
     if (saveTimeoutRef.current) {
@@ -84,6 +137,13 @@ export function DocumentEditor() {
     debouncedSave(undefined, newContent);
   };
   
+  // What the AI chat needs of the editor's content: the server reads the
+  // saved version, so only changes not saved yet are sent along.
+  const getUnsavedEdits = useCallback(() => ({
+    baseVersion: versionRef.current,
+    edits: diffText(savedContentRef.current, content),
+  }), [content]);
+
   const handleInsertText = (text: string) => {
     const newContent = content + (content ? '\n\n' : '') + text;
     setContent(newContent);
@@ -124,7 +184,7 @@ export function DocumentEditor() {
     return () => clearInterval(interval);
   }, []);
   
-  if (document === undefined) {
+  if (document === undefined || (document !== null && !contentLoaded)) {
     return (
       <div className="min-h-screen bg-cream-100 flex items-center justify-center">
         <div className="animate-pulse text-ink-400">Loading document...</div>
@@ -155,6 +215,7 @@ export function DocumentEditor() {
           to="/dashboard"
           className="p-2 text-ink-500 hover:text-ink-700 hover:bg-cream-200 rounded-lg transition-colors flex-shrink-0"
           title="Back to dashboard"
+          data-testid="document-back"
         >
           <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
             <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M10 19l-7-7m0 0l7-7m-7 7h18" />
@@ -178,6 +239,7 @@ export function DocumentEditor() {
             value={title}
             onChange={(e) => handleTitleChange(e.target.value)}
             placeholder="Untitled Document"
+            data-testid="document-title"
             className="bg-transparent font-serif text-base sm:text-xl text-ink-700 text-center border-none outline-none focus:ring-0 placeholder-ink-300 max-w-md w-full truncate"
           />
         </div>
@@ -192,7 +254,7 @@ export function DocumentEditor() {
               Saving...
             </span>
           ) : (
-            <span className="hidden sm:inline">{formatLastSaved()}</span>
+            <span className="hidden sm:inline" data-testid="document-last-saved">{formatLastSaved()}</span>
           )}
           
           {/* Sidebar toggle buttons */}
@@ -207,6 +269,7 @@ export function DocumentEditor() {
                   : 'text-ink-400 hover:text-ink-600'
               }`}
               title={showKnowledgeSidebar ? 'Hide Knowledge sidebar' : 'Show Knowledge sidebar'}
+              data-testid="document-toggle-knowledge"
             >
               <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 6.253v13m0-13C10.832 5.477 9.246 5 7.5 5S4.168 5.477 3 6.253v13C4.168 18.477 5.754 18 7.5 18s3.332.477 4.5 1.253m0-13C13.168 5.477 14.754 5 16.5 5c1.747 0 3.332.477 4.5 1.253v13C19.832 18.477 18.247 18 16.5 18c-1.746 0-3.332.477-4.5 1.253" />
@@ -222,6 +285,7 @@ export function DocumentEditor() {
                   : 'text-ink-400 hover:text-ink-600'
               }`}
               title={showAIChatSidebar ? 'Hide AI Assistant sidebar' : 'Show AI Assistant sidebar'}
+              data-testid="document-toggle-chat"
             >
               <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M8 10h.01M12 10h.01M16 10h.01M9 16H5a2 2 0 01-2-2V6a2 2 0 012-2h14a2 2 0 012 2v8a2 2 0 01-2 2h-5l-5 5v-5z" />
@@ -273,7 +337,7 @@ export function DocumentEditor() {
           <div className="w-full md:w-80 h-full">
             <AIChatSidebar
               documentId={documentId}
-              documentContent={content}
+              getUnsavedEdits={getUnsavedEdits}
               onInsertText={handleInsertText}
               contextSnippets={contextSnippets}
               onRemoveContext={handleRemoveContext}
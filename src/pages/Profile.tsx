@@ -6,10 +6,11 @@ import { Button } from '../components/ui/Button';
 import { Input } from '../components/ui/Input';
 import { Textarea } from '../components/ui/Textarea';
 import { AccountDropdown } from '../components/AccountDropdown';
+import { useSession } from '../components/SessionProvider';
 
 export function Profile() {
   const navigate = useNavigate();
-  const user = useQuery(api.users.getCurrentUser);
+  const user = useSession()?.user;
   const userSettings = useQuery(api.users.getUserSettings);
   const updateProfile = useMutation(api.users.updateProfile);
   const updateAIInstructions = useMutation(api.users.updateAIInstructions);
@@ -1,10 +1,11 @@
 import { useAuthActions } from '@convex-dev/auth/react';
 import { TrialPopup } from '../components/TrialPopup';
 import { Button } from '../components/ui/Button';
+import type { Id } from '../../convex/_generated/dataModel';
 
 interface TrialProps {
   userEmail: string;
-  onSuccess: () => void;
+  onSuccess: (checkoutSessionId: Id<'checkoutSessions'>) => void;
 }
 
 export function Trial({ userEmail, onSuccess }: TrialProps) {
@@ -26,6 +27,7 @@ export function Trial({ userEmail, onSuccess }: TrialProps) {
             variant="ghost"
             size="sm"
             onClick={handleLogout}
+            data-testid="trial-logout"
             className="text-accent-600 hover:text-accent-700 underline"
           >
             Log out
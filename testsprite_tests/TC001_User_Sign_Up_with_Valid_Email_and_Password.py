@@ -1,200 +1,35 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
+import re
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.config import BASE_URL
+from harness.pool import run_standalone
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    email = flows.unique_email("tc001")
+
+    # -> Open the sign-up form from the landing page's 'Get Started' button
+    await actions.goto(page, BASE_URL)
+    await actions.click(page.get_by_role("link", name="Get Started"))
+    await expect(page.get_by_test_id(L.AUTH_NAME)).to_be_visible()
+
+    # -> Fill Name, Email and Password and submit the form
+    await actions.fill(page.get_by_test_id(L.AUTH_NAME), "Arshin Kovska")
+    await actions.fill(page.get_by_test_id(L.AUTH_EMAIL), email)
+    await actions.fill(page.get_by_test_id(L.AUTH_PASSWORD), "R@d@2024")
+    await actions.click(page.get_by_test_id(L.AUTH_SUBMIT))
+
+    # --> Assertions to verify the new account is signed in and sent to onboarding
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Get Started' button to open the sign-up page (navigate to sign-up form).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Name field (index 125) with 'Arshin Kovska' (first immediate action).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the 'Create Account' button (index 137) to submit the sign-up form and then verify that the user is redirected to the dashboard or onboarding page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the current 'Create Account' button (index 190) to submit the sign-up form and verify redirection.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Name (index 187), Email (index 188), Password (index 189) fields with the test credentials and click the Create Account button (index 190) to attempt signup again.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the current 'Create Account' button (index 275) to submit the form and then verify whether the signup succeeds and redirects.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the current Name, Email and Password inputs (indexes 272, 273, 274) with the test credentials and click the Create Account button (index 275) to attempt sign-up again and then verify redirection.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Refill the visible sign-up inputs (current shadow inputs) and click the visible Create Account button to attempt sign-up once more (then verify redirect).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible Create Account button (index 360) to submit the sign-up form and then verify whether the app redirects to the dashboard or onboarding page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill Name (index 458), Email (index 459), Password (index 460) with the test credentials, then click Create Account (index 461) to submit the form.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible 'Create Account' button (index 461) to submit the sign-up form, then verify whether the app redirects to the dashboard or onboarding page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the visible Name, Email and Password inputs (indices 559, 560, 561) with the test credentials and click the visible Create Account button (index 562) to attempt signup and then verify whether the app redirects to the dashboard or onboarding page.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshin Kovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible 'Create Account' button (index 562) to submit the form, then verify whether the app redirects to the dashboard or shows an error message.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(page).to_have_url(re.compile(r"/dashboard$"))
+        # A brand-new account has no subscription yet, so the trial offer is its onboarding.
+        await expect(page.get_by_test_id(L.TRIAL_POPUP)).to_be_visible()
+        await expect(page.get_by_test_id(L.AUTH_ERROR)).to_have_count(0)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test signed up as '{email}' with a valid email and password and expected to land on the dashboard's trial onboarding, but the sign-up did not complete.")
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,96 +1,31 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
+import re
+from harness.actions import expect
+from harness import actions
+from harness import locators as L
+from harness.config import BASE_URL, LOGIN_EMAIL, LOGIN_PASSWORD
+from harness.pool import run_standalone
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # -> Open the sign-in form from the landing page
+    await actions.goto(page, BASE_URL)
+    await actions.click(page.get_by_role("link", name="Sign In").first)
+    await expect(page.get_by_test_id(L.AUTH_FORM)).to_be_visible()
+
+    # -> Enter the registered email and password and submit the form
+    await actions.fill(page.get_by_test_id(L.AUTH_EMAIL), LOGIN_EMAIL)
+    await actions.fill(page.get_by_test_id(L.AUTH_PASSWORD), LOGIN_PASSWORD)
+    await actions.click(page.get_by_test_id(L.AUTH_SUBMIT))
+
+    # --> Assertions to verify the user reaches the dashboard
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the Sign In button (index 62) to open the login form.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Enter the registered email into the email field (index 127), then enter the password (index 131), and submit the form (click index 134).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the Sign In submit button (index 215) to submit the login form and proceed to verify dashboard access.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Welcome to your dashboard').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test attempted to verify successful authentication and access to the dashboard after submitting valid credentials for arshinkovska@live.com, but the dashboard welcome text 'Welcome to your dashboard' did not appear; login or navigation likely failed.")
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        await expect(page).to_have_url(re.compile(r"/dashboard$"))
+        await expect(page.get_by_test_id(L.DASHBOARD_NEW_DOCUMENT)).to_be_visible()
+    except AssertionError:
+        raise AssertionError("Test case failed: The test signed in with the registered email and password and expected the dashboard, but it was not shown.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,72 +1,25 @@
 import asyncio
-from playwright import async_api
+import re
+from harness.actions import expect
+from harness import actions
+from harness import locators as L
+from harness.config import BASE_URL
+from harness.pool import run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    # -> Open the dashboard URL without signing in
+    await actions.goto(page, f"{BASE_URL}/dashboard")
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Navigate directly to http://localhost:5173/dashboard and verify whether an unauthenticated user is redirected to the sign-in page.
-        await page.goto("http://localhost:5173/dashboard", wait_until="commit", timeout=10000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        # Assert that the unauthenticated user was not kept on the dashboard URL
-        assert "/dashboard" not in page.url, f"Unauthenticated user remained on dashboard: {page.url}"
-        # Verify sign-in page content is present (checks visible text and email field)
-        assert await page.locator("text=Sign in").is_visible(), "User was not redirected to sign-in page: 'Sign in' text not visible"
-        assert await page.locator("text=Email").is_visible(), "Sign-in form email field not visible"
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # --> Assertions to verify the user is sent to the sign-in page
+    try:
+        await expect(page).to_have_url(re.compile(r"/auth$"))
+        await expect(page.get_by_test_id(L.AUTH_EMAIL)).to_be_visible()
+        await expect(page.get_by_test_id(L.DASHBOARD_NEW_DOCUMENT)).to_have_count(0)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test opened /dashboard without signing in and expected a redirect to the sign-in page, but ended on {page.url}.")
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
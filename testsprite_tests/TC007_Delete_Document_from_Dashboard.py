@@ -1,117 +1,37 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.config import BASE_URL
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    title = f"TC007 {uuid.uuid4().hex[:8]}"
+
+    # -> Make sure the dashboard has a document to delete
+    await flows.create_document(page, title)
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    card = L.document_card(page, title)
+    await expect(card).to_be_visible()
+
+    # -> Initiate the delete action on the document and confirm it in the dialog
+    await card.hover()
+    await actions.click(card.get_by_test_id(L.DOCUMENT_CARD_DELETE))
+    await actions.click(page.get_by_test_id(L.CONFIRM_DIALOG_CONFIRM))
+
+    # --> Assertions to verify the document is removed from the dashboard list
+    await actions.goto(page, f"{BASE_URL}/dashboard")
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the Sign In page by clicking the top 'Sign In' button (index 3).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields with provided credentials and submit the form (press Enter) to attempt login.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Fill the email and password fields with the provided credentials and click the 'Sign In' button (index 173) to attempt login and reach the dashboard.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields (indexes 269 and 270) with the provided credentials and click the 'Sign In' button (index 271) to log in and reach the dashboard.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Document deleted successfully').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test attempted to verify that after confirming deletion a success message 'Document deleted successfully' appeared on the dashboard indicating the document was removed from the document list, but the confirmation message did not appear.")
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        await expect(page.get_by_test_id(L.DASHBOARD_NEW_DOCUMENT)).to_be_visible()
+        await expect(L.document_card(page, title)).to_have_count(0)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test deleted the document '{title}' from the dashboard and confirmed the dialog, but the document was still listed afterwards.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
@@ -1,256 +1,36 @@
 import asyncio
-from playwright import async_api
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.pool import run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    text = f"Autosave check {uuid.uuid4().hex[:8]}"
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    # -> Open a document in the editor
+    document_url = await flows.create_document(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+    # -> Make edits to the document content and wait for the autosave mutation
+    # (the editor debounces saves by 1 second)
+    try:
+        await flows.type_in_editor(page, text)
+    except TimeoutError:
+        raise AssertionError("Test case failed: The test typed into the editor and expected the debounced autosave to reach the backend, but no save completed.")
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Sign In' button to open the login form so the document editor can be accessed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields and click 'Sign In' to authenticate and access the document editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Attempt sign-in again by filling email and password fields and clicking the 'Sign In' button to reach the documents list/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill email and password into the visible inputs (use indexes 257 and 258) and click the visible 'Sign In' button (index 259) to attempt authentication and reach the documents list/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Don't have an account? Sign up' button to open the registration flow (or reach a page to create or recover an account) so access to the document editor can be obtained.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Don't have an account? Sign up' button to open the registration flow (use the visible sign-up button index 407).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the signup form (Name, Email, Password) and submit the 'Create Account' button to create an account and reach the documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the 'Create Account' button (index 357) to create the account and reach the documents list or editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the registration page by clicking 'Don't have an account? Sign up' so account creation can be retried (then create account or sign in).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Create Account' button to create the account and reach the documents list or editor so a document can be opened.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the signup fields to ensure inputs are valid and submit the 'Create Account' form so the app can redirect to the documents list/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Open the registration page so account creation can be retried (click 'Don't have an account? Sign up').
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Create Account' button to submit the registration form and reach the documents list/editor so a document can be opened.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the Name, Email and Password inputs on the registration form and click 'Create Account' to attempt account creation and reach the documents list/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Open the registration page by clicking 'Don't have an account? Sign up' so account creation can be retried and the documents/editor can be accessed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill Name, Email and Password inputs on the registration form and click 'Create Account' to create the account and reach the documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Open the registration page so account creation can be retried (click the visible 'Don't have an account? Sign up' button).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Create Account' button to submit the registration form and reach the documents list/editor so a document can be opened.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill Name, Email and Password on the registration form and submit 'Create Account' to create an account and reach the documents list/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        await asyncio.sleep(5)
+    # -> Refresh the document page
+    await actions.goto(page, document_url)
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # --> Assertions to verify the document content reflects the saved changes
+    try:
+        await expect(page.get_by_test_id(L.EDITOR_CONTENT).locator(".tiptap")).to_contain_text(text)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test typed '{text}' into the editor, waited for the autosave and reloaded the page, but the saved content did not contain the text.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
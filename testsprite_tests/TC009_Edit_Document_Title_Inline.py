@@ -1,175 +1,37 @@
 import asyncio
-from playwright import async_api
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.config import BASE_URL
+from harness.pool import run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    title = f"Updated Document Title {uuid.uuid4().hex[:8]}"
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    # -> Open a document in the editor
+    document_url = await flows.create_document(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    # -> Change the title text inline and wait for the save
+    await flows.rename_document(page, title)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the Sign In button to open the login form so the test can authenticate and access the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill in the email and password fields and submit the Sign In form to authenticate (attempt 1 of 2).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields and submit the Sign In form (attempt 2 of 2) to authenticate
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Since sign-in attempts are exhausted and no navigation element to documents is available on the current page, navigate directly to the documents listing URL to try to reach the editor and open a document.
-        await page.goto("http://localhost:5173/documents", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Start Writing Free' button on the homepage to try to open the editor or a document creation flow (alternative to sign-in).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Name, Email, and Password fields on the sign-up form and click 'Create Account' to register and (if successful) reach the editor or documents list.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Automated Tester')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Submit the Create Account form by clicking the 'Create Account' button (index 454) to register and reach the documents/editor view.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the email and password fields on the signup form and submit Create Account again to attempt account creation and gain access to documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the signup form fields (name, email, password) and click the 'Create Account' button to attempt account creation (final allowed attempt). If signup still fails, stop and report failure.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Automated Tester')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the 'Create Account' button to submit the signup form and attempt to reach the documents/editor view (index 539).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Updated Document Title').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test attempted to edit the document title inline and save the changes; expected the new title 'Updated Document Title' to be visible in the editor, but it was not found.")
-        await asyncio.sleep(5)
+    # --> Assertions to verify the new title is saved and displayed
+    await actions.goto(page, document_url)
+    try:
+        await expect(page.get_by_test_id(L.DOCUMENT_TITLE)).to_have_value(title)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test edited the document title inline to '{title}' and reloaded the editor, but the saved title was not shown.")
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    try:
+        await expect(L.document_card(page, title)).to_be_visible()
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test renamed a document to '{title}', but the dashboard list still showed the old title.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
@@ -1,272 +1,61 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+
+# Toolbar button -> element the formatted line must render as.
+FORMATS = [
+    ("bold", "strong"),
+    ("italic", "em"),
+    ("strike", "s"),
+    ("heading-1", "h1"),
+    ("heading-2", "h2"),
+    ("heading-3", "h3"),
+    ("bullet-list", "ul"),
+    ("ordered-list", "ol"),
+    ("blockquote", "blockquote"),
+    ("code-block", "pre"),
+]
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # -> Open a document in the editor
+    document_url = await flows.create_document(page)
+    editor = page.get_by_test_id(L.EDITOR_CONTENT).locator(".tiptap")
+    await actions.click(editor)
+
+    # -> Write one plain line per formatting tool
+    for name, _ in FORMATS:
+        await page.keyboard.type(f"{name} text")
+        await page.keyboard.press("Enter")
+
+    # -> Select each line and apply its tool from the toolbar
+    before = actions.responses(page)
+    for name, _ in FORMATS:
+        await editor.get_by_text(f"{name} text", exact=True).click(click_count=3)
+        await actions.click(L.toolbar_button(page, name))
+    await actions.wait_for_response(page, before)
+
+    # --> Assertions to verify each formatting tool rendered its element
+    for name, tag in FORMATS:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+            await expect(editor.locator(tag, has_text=f"{name} text").first).to_be_visible()
+        except AssertionError:
+            raise AssertionError(f"Test case failed: The test applied the '{name}' toolbar tool and expected the text to render as <{tag}> in the editor, but no such element was found.")
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open a document in the editor by clicking the 'Start Writing Free' CTA on the page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the signup form (name, email, password) and click Create Account to open the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshinkovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the 'Create Account' button to submit signup and open the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Create Account' button to submit the signup form and open the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the signup form (Name, Email, Password) and click Create Account to open the editor, then wait for navigation.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshinkovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Refill the signup form (name, email, password) and click 'Create Account' to open the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arshinkovska')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Navigate to the Sign in page by clicking 'Already have an account? Sign in' so an alternate login path can be attempted.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in form with provided credentials and click 'Sign In' to open the documents list or editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Already have an account? Sign in' link/button (element index 488) to navigate to the sign-in page, then proceed to sign in with provided credentials.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in form with provided credentials and click 'Sign In' to authenticate and open the documents list or editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Already have an account? Sign in' button to navigate to the sign-in page so credentials can be submitted (immediate action). After navigation, sign in with provided credentials and open the documents/editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in form with provided credentials and click 'Sign In' to authenticate (attempt #3). If successful, proceed to open a document in the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Already have an account? Sign in' button (index 675) to navigate to the sign-in page so credentials can be submitted (then sign in and open the editor).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in inputs and submit the sign-in form programmatically (evaluate JS) to authenticate and open the documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Recover the app by reloading/navigating to the homepage so the SPA can re-render and interactive elements become available; then attempt authentication by available flows.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the sign-in page by clicking the top 'Sign In' button (index 872), then proceed to authenticate using available credentials.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in form (email/password) and submit the sign-in form programmatically to authenticate and open the documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Fill the sign-in form (email and password) and submit the Sign In button to authenticate and open the documents/editor (attempt sign-in #3). If sign-in succeeds, proceed to open a document in the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Recover the SPA/auth page by navigating to the site root (http://localhost:5173) and waiting for it to render so interactive elements become available; then re-attempt authentication via visible flows.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the sign-in page so authentication can be attempted (click the top Sign In button), then authenticate and open a document in the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the sign-in form with provided credentials and submit Sign In to authenticate and open the documents/editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # --> Assertions to verify the formatting survives a reload
+    await actions.goto(page, document_url)
+    try:
+        for name, tag in FORMATS:
+            await expect(editor.locator(tag, has_text=f"{name} text").first).to_be_visible()
+    except AssertionError:
+        raise AssertionError("Test case failed: The test formatted text with every toolbar tool and reloaded the document, but the saved content lost some of the formatting.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
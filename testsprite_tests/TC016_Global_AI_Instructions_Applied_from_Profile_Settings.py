@@ -1,197 +1,45 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness.config import BASE_URL
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+# Global instructions apply to every document, so keep other AI tests out of the way.
+EXCLUSIVE = True
+
+async def save_profile_instructions(page, instructions):
+    await actions.goto(page, f"{BASE_URL}/profile")
+    await actions.fill(page.locator("#aiInstructions"), instructions)
+    await actions.click(page.get_by_role("button", name="Save Instructions"))
+    await expect(page.get_by_text("Instructions saved")).to_be_visible()
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    marker = f"INK{uuid.uuid4().hex[:6].upper()}"
+
+    # -> Remember the current global instructions so they can be restored
+    await actions.goto(page, f"{BASE_URL}/profile")
+    original = await page.locator("#aiInstructions").input_value()
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+        # -> Set global AI instructions in the profile settings
+        await save_profile_instructions(page, f"Always end every reply with the word {marker}.")
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+        # -> Ask the AI chat something in a document
+        await flows.create_document(page)
+        reply = await flows.send_chat_message(page, "Write one sentence about autumn.")
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        # --> Assertions to verify the reply follows the profile instructions
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Sign In' button to authenticate with provided credentials.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Email and Password fields with provided credentials and click the Sign In button to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill Email and Password with provided credentials and click the Sign In button to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Extract the visible page text to look for any login error messages, then navigate back to the homepage via the Inkwell logo to retry a different approach.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Return to the homepage by clicking the Inkwell logo link so a different sign-in/navigation approach can be attempted.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Attempt an alternative entry path to sign in or create a session by clicking the 'Start Writing Free' button on the homepage so authentication can be retried via a different flow.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/div/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the alternate sign-in flow by clicking 'Already have an account? Sign in' on the signup page to try authentication via a different route.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click 'Already have an account? Sign in' on the signup page to open the sign-in flow via the alternate route.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields on the visible sign-in form and submit using the page Sign In button, then wait for authentication to complete and verify dashboard/profile access.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Reload the app (navigate to http://localhost:5173) to recover the SPA and reveal interactive elements, then inspect the page for the Profile/Settings navigation.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the top-right 'Sign In' button on the homepage (use element index 802) to open the authentication page via this alternate entry point.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the visible Email and Password inputs (indices 866 and 870) with the provided credentials and submit the form by clicking the Sign In button (index 873) to attempt authentication once more.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Extract the full visible text from the current authentication page to confirm any error messages, then return to the homepage via the Inkwell link to try an alternative navigation path.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the authentication page via the homepage Sign In button (use the visible Sign In button at index 996) to attempt authentication via a different entry point.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Sign In form via a homepage Sign In button (use a different Sign In element index to get a fresh auth flow and inspect error hints). Click Sign In (index 1133) to open the authentication form and examine any visible messages or UI changes.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        ```
-        try:
-            await expect(frame.locator('text=Following your profile instructions').first).to_be_visible(timeout=3000)
+            await expect(reply).to_contain_text(marker)
         except AssertionError:
-            raise AssertionError("Test case failed: Verify that global AI assistant instructions set in profile settings are applied during AI chat interactions — expected the assistant's chat reply to acknowledge or follow the profile instructions (e.g., 'Following your profile instructions'), but no such acknowledgement or behavior was found.")
-        ```
-        await asyncio.sleep(5)
-
+            raise AssertionError(f"Test case failed: The test set global AI instructions in the profile asking every reply to end with '{marker}', but the assistant's chat reply did not follow them.")
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        await save_profile_instructions(page, original)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
@@ -1,250 +1,42 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    marker = f"DOC{uuid.uuid4().hex[:6].upper()}"
+    instructions = f"Always end every reply with the word {marker}."
+
+    # -> Open a document and set document-specific AI instructions
+    document_url = await flows.create_document(page)
+    await actions.click(page.get_by_test_id(L.CHAT_INSTRUCTIONS))
+    await actions.fill(page.get_by_test_id(L.CHAT_INSTRUCTIONS_INPUT), instructions)
+    await actions.click(page.get_by_test_id(L.CHAT_INSTRUCTIONS_SAVE))
+
+    # --> Assertions to verify the instructions are saved with the document
+    await actions.goto(page, document_url)
+    await actions.click(page.get_by_test_id(L.CHAT_INSTRUCTIONS))
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+        await expect(page.get_by_test_id(L.CHAT_INSTRUCTIONS_INPUT)).to_have_value(instructions)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test saved document-specific AI instructions and reopened the document, but the instructions modal did not show them.")
+    await page.keyboard.press("Escape")
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    # -> Ask the AI chat something in this document
+    reply = await flows.send_chat_message(page, "Write one sentence about winter.")
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the document editor by clicking the 'Start Writing Free' button so a new document can be created and document-specific AI instructions added.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the signup form (Name, Email, Password) and click 'Create Account' to create the user account so the editor can be accessed.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the 'Create Account' button to submit the signup form and proceed to the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Create Account' button to submit the signup form and proceed to the editor (use current visible button element).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Submit the signup form by clicking the 'Create Account' button (use element index 278) and wait for the page to respond/redirect.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fix the email validation by re-entering the email field, then submit the signup form and wait for navigation to the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Ensure all signup fields are filled correctly and submit the signup form so the editor can be accessed (re-enter Name, Email, Password and click Create Account).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Re-enter all signup fields to ensure valid values, then submit the signup form by clicking the visible 'Create Account' button (element index 491). If submission succeeds, proceed to open/create a document in the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible 'Create Account' button (element index 491) to submit the signup form and proceed to the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Re-enter the Name, Email, and Password fields to ensure valid values, then submit the signup form by clicking the visible 'Create Account' button (index 554).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible 'Create Account' button (element index 554) to submit the signup form and wait for navigation to the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Reload or return to the app root (http://localhost:5173) to recover from the blank/unstable signup page, then attempt to reach the editor (sign up or sign in) so a document can be opened and document-specific AI instructions set.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Reload the app root to recover the UI so signup/signin or editor can be accessed (navigate to http://localhost:5173).
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Recover the app UI by waiting briefly and reloading (navigate to) the app root (http://localhost:5173) so signup/editor UI becomes available.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the signup page (/auth?mode=signup) to try loading the auth UI and proceed with account creation so the editor can be accessed.
-        await page.goto("http://localhost:5173/auth?mode=signup", wait_until="commit", timeout=10000)
-        
-        # -> Open the app in a new tab (http://localhost:5173) to recover the UI and check for interactive elements so signup or editor access can proceed.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the app root in a fresh tab to recover the UI (navigate to http://localhost:5173 in a new tab) and then check for interactive elements.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Try to recover the app UI by reloading/navigating to the app root (http://localhost:5173) and wait for it to load. If UI still blank, attempt another reload to gather a fresh page state for next steps.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the signup/auth flow by clicking the 'Start Writing Free' button so account creation can proceed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill Name, Email, and Password fields and click 'Create Account' to create the account and proceed to the editor.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        # -> Click the visible 'Create Account' button (element index 1485) to submit the signup form and wait for the page to respond / navigate to the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the visible 'Create Account' button (element index 1538) to submit the signup form and wait for navigation to the editor.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Re-enter the Email field to ensure the value is accepted, then submit the signup form by clicking the visible 'Create Account' button (index 1538).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Name field (index 1535) with 'Arsh' and then submit the signup form by clicking the Create Account button (index 1538).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Arsh')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # --> Assertions to verify the reply follows the document instructions
+    try:
+        await expect(reply).to_contain_text(marker)
+    except AssertionError:
+        raise AssertionError(f"Test case failed: The test set document-specific AI instructions asking every reply to end with '{marker}', but the assistant's chat reply did not follow them.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
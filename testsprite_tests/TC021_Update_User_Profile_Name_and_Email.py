@@ -1,100 +1,49 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import uuid
+from harness.actions import expect
+from harness import actions
+from harness.config import BASE_URL, LOGIN_EMAIL
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+# Changing the email also changes the sign-in email; no other test may sign in meanwhile.
+EXCLUSIVE = True
+
+async def save_profile(page, name, email):
+    await actions.fill(page.locator("#name"), name)
+    await actions.fill(page.locator("#email"), email)
+    await actions.click(page.get_by_role("button", name="Save Changes"))
+    await expect(page.get_by_text("Changes saved")).to_be_visible()
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    local, _, domain = LOGIN_EMAIL.partition("@")
+    name = f"Profile Test {uuid.uuid4().hex[:6]}"
+    email = f"{local}+tc021@{domain}"
+
+    # -> Navigate to Profile Settings and remember the current values
+    await actions.goto(page, f"{BASE_URL}/profile")
+    await expect(page.locator("#email")).not_to_have_value("")
+    original_name = await page.locator("#name").input_value()
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+        # -> Modify the name and email fields and save the changes
+        await save_profile(page, name, email)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        # --> Assertions to verify the updated name and email are saved and displayed
+        await actions.goto(page, f"{BASE_URL}/profile")
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Sign In' button (index 65) to open the login page and proceed with authentication.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields and submit the Sign In form to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the email and password fields with the provided credentials and submit the Sign In form to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
+            await expect(page.locator("#name")).to_have_value(name)
+            await expect(page.locator("#email")).to_have_value(email)
+            await expect(page.get_by_role("heading", name=name)).to_be_visible()
+        except AssertionError:
+            raise AssertionError(f"Test case failed: The test changed the profile name to '{name}' and the email to '{email}' and reloaded Profile Settings, but the saved values were not displayed.")
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        # Restore the account so later sign-ins keep working
+        await actions.goto(page, f"{BASE_URL}/profile")
+        await save_profile(page, original_name, LOGIN_EMAIL)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
@@ -1,158 +1,51 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
+import uuid
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.pool import run_standalone
+
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
+
+async def run_test(context):
+    # Client A: a page in the test's own browser context
+    page_a = await context.new_page()
+    suffix = uuid.uuid4().hex[:8]
+
+    # -> Open a document on client A
+    document_url = await flows.create_document(page_a, f"Sync {suffix}")
+
+    # -> Open the same document on client B, a second context signed in as the same user
+    context_b = await context.browser.new_context(storage_state=await context.storage_state())
+    await actions.instrument(context_b, actions.trace(context))
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
+        page_b = await context_b.new_page()
+        await actions.goto(page_b, document_url)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        # -> Make an edit on client A and verify it appears on client B without a reload
+        await flows.add_knowledge(page_a, f"From A {suffix}", "Added on client A.")
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+            await expect(L.knowledge_item(page_b, f"From A {suffix}")).to_be_visible()
+        except AssertionError:
+            raise AssertionError("Test case failed: The test added a knowledge item on client A and expected it to appear on client B in real time, but client B never showed it.")
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Sign In' button to start signing in on client A.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill email and password for client A and submit the Sign In form to log in.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Sign In' submit button to attempt logging in client A (use button index 217).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Retry clicking the Sign In submit button (index 217) once more, then check for navigation to the dashboard/documents. If no change, try an alternative (refresh or open a new tab to navigate to the app root) per navigation rules.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the visible Sign In submit button (element index 252) to attempt logging in client A.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Refill the email and password fields and click the Sign In submit button (index 252) to attempt logging in client A.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Email and Password fields and click the Sign In submit button (use elements 367, 368, then 369) to attempt logging in client A.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Allow SPA to load, then reload the app root to recover from blank page and retry sign-in flow.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open a fresh client tab at the auth route and attempt sign-in for client A (fill email+password and submit from the new tab). If the auth page fails to load, retry navigation or report website issue.
-        await page.goto("http://localhost:5173/auth", wait_until="commit", timeout=10000)
-        
-        # -> Reload the app root in the current tab to recover the SPA so interactive elements (Sign In, etc.) become available, then proceed with sign-in flow.
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open a fresh tab using an alternative host (127.0.0.1) to load the auth page and attempt sign-in for client A (if page loads, fill credentials and submit). If that fails, report website issue.
-        await page.goto("http://127.0.0.1:5173/auth", wait_until="commit", timeout=10000)
-        
-        # -> Retry loading the auth page by clicking the Reload button (index 74) on the current tab to recover the SPA. If reload fails, report website issue or try alternative navigation (open root or use different host).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the Reload button (index 201) on the current tab to retry loading the auth page. If the page still shows an empty response, report a website issue or attempt alternative host/navigation next.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+        # -> Make an edit on client B and verify it appears on client A without a reload
+        await flows.add_knowledge(page_b, f"From B {suffix}", "Added on client B.")
+        try:
+            await expect(L.knowledge_item(page_a, f"From B {suffix}")).to_be_visible()
+        except AssertionError:
+            raise AssertionError("Test case failed: The test added a knowledge item on client B and expected it to appear on client A in real time, but client A never showed it.")
 
+        # -> Edit the content on client A and verify client B loads the saved version
+        await flows.type_in_editor(page_a, f"Content written on client A {suffix}")
+        await actions.goto(page_b, document_url)
+        try:
+            await expect(page_b.get_by_test_id(L.EDITOR_CONTENT).locator(".tiptap")).to_contain_text(f"Content written on client A {suffix}")
+        except AssertionError:
+            raise AssertionError("Test case failed: The test edited the document content on client A and reopened it on client B, but client B did not show the saved content.")
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        await context_b.close()
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
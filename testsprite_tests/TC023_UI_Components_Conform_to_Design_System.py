@@ -1,68 +1,58 @@
 import asyncio
-from playwright import async_api
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.config import BASE_URL
+from harness.pool import run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+# Start from the cached signed-in session instead of the Auth page form.
+REQUIRES_AUTH = True
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+async def computed(locator, prop):
+    return await locator.evaluate("(el, prop) => getComputedStyle(el)[prop]", prop)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+    # -> Load the dashboard with its buttons and document cards
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    new_document = page.get_by_test_id(L.DASHBOARD_NEW_DOCUMENT)
+    await expect(new_document).to_be_visible()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Open the sign-up / start flow by clicking the 'Start Writing Free' CTA so inputs/dialogs/pages with cards can be inspected for style and behavior.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # --> Assertions to verify buttons use the pill shape and a visible focus state
+    try:
+        assert await computed(new_document, "borderRadius") not in ("0px", "")
+        await new_document.focus()
+        await expect(new_document).to_be_focused()
+    except AssertionError:
+        raise AssertionError("Test case failed: The test checked the 'New Document' button against the style guide (rounded pill shape, focusable), but its computed style did not match.")
+
+    # -> Open the confirmation dialog of a document card
+    await flows.create_document(page, "Design system check")
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    card = L.document_card(page, "Design system check").first
+    await card.hover()
+    await actions.click(card.get_by_test_id(L.DOCUMENT_CARD_DELETE))
+
+    # --> Assertions to verify the dialog renders its actions, then confirm it
+    dialog = page.get_by_test_id(L.CONFIRM_DIALOG)
+    try:
+        await expect(dialog.get_by_test_id(L.CONFIRM_DIALOG_CANCEL)).to_be_visible()
+        await expect(dialog.get_by_test_id(L.CONFIRM_DIALOG_CONFIRM)).to_be_visible()
+    except AssertionError:
+        raise AssertionError("Test case failed: The test opened the delete confirmation dialog from a document card, but the dialog did not render its Cancel and Delete actions.")
+    await actions.click(dialog.get_by_test_id(L.CONFIRM_DIALOG_CONFIRM))
+
+    # -> Check the layout on a phone-sized screen
+    await page.set_viewport_size({"width": 375, "height": 812})
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    try:
+        await expect(new_document).to_be_visible()
+        width = await page.evaluate("document.documentElement.scrollWidth")
+        assert width <= 375, f"page is {width}px wide"
+    except AssertionError:
+        raise AssertionError("Test case failed: The test loaded the dashboard at a 375px mobile width and expected it to fit without horizontal scrolling, but the layout overflowed.")
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, requires_auth=REQUIRES_AUTH))
@@ -1,118 +1,40 @@
 import asyncio
-from playwright import async_api
+import re
+from harness.actions import expect
+from harness import actions, flows
+from harness import locators as L
+from harness.config import BASE_URL, LOGIN_EMAIL, LOGIN_PASSWORD
+from harness.pool import run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    # -> Sign in with a session of its own: signing out would revoke the shared one
+    await flows.sign_in(page, LOGIN_EMAIL, LOGIN_PASSWORD)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    # -> Open the account dropdown and select Profile
+    await actions.click(page.get_by_test_id(L.ACCOUNT_MENU))
+    await actions.click(page.get_by_test_id(L.ACCOUNT_PROFILE))
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:5173
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # -> Click the top 'Sign In' button to open the login page and proceed with authentication.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Email and Password fields with provided credentials and click the 'Sign In' button to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill the Email and Password fields again and click 'Sign In' to attempt authentication one more time, then wait for the app to redirect and show the authenticated header (account dropdown).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arshinkovska@live.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('R@d@2024')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Navigate back to the homepage via the site logo to check header/navigation elements (look for account dropdown or alternative navigation) before deciding next steps.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the site logo (anchor) in the header (index 392) to navigate to the homepage and reveal header/navigation so the account dropdown presence can be checked.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div/div/header/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Sign In page from the header so the login form can be accessed (prepare for next diagnostic or login attempt if allowed).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div/header/nav/div[2]/a[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # --> Assertions to verify navigation to the Profile Settings page
+    try:
+        await expect(page).to_have_url(re.compile(r"/profile$"))
+        await expect(page.locator("#email")).to_be_visible()
+    except AssertionError:
+        raise AssertionError("Test case failed: The test selected 'Profile' from the account dropdown and expected the Profile Settings page, but it did not open.")
+
+    # -> Open the account dropdown again and sign out
+    await actions.click(page.get_by_test_id(L.ACCOUNT_MENU))
+    await actions.click(page.get_by_test_id(L.ACCOUNT_SIGN_OUT))
+
+    # --> Assertions to verify the user is logged out
+    await actions.wait_for_url(page, f"{BASE_URL}/")
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    try:
+        await expect(page).to_have_url(re.compile(r"/auth"))
+    except AssertionError:
+        raise AssertionError("Test case failed: The test signed out from the account dropdown and then opened the dashboard, expecting a redirect to sign-in, but the dashboard was still accessible.")
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
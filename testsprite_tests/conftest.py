@@ -0,0 +1,154 @@
+"""pytest fixtures and markers for the TC scripts.
+
+Each worker process starts Playwright and one browser for the whole session;
+every test gets a fresh, instrumented context on that browser.  ``--profile``
+picks the launch profile (see harness.profiles).  Markers come
+from ``testsprite_frontend_test_plan.json``::
+
+    pytest -m "functional and priority_high"
+    pytest -n 4
+
+``--local-backend`` runs the suite against a seeded local Convex deployment
+and resets it to the seed snapshot before every test (see harness.backend).
+
+Every test writes a Chrome trace of its steps to ``tmp/traces/`` and the run
+ends with the slowest steps across the suite (see harness.trace).
+"""
+
+import json
+import os
+import re
+
+import pytest
+import pytest_asyncio
+
+from harness import actions
+from harness.auth import AuthSession
+from harness.backend import LocalBackend, restore_snapshot
+from harness.config import SUITE_DIR
+from harness.pool import BrowserPool
+from harness.profiles import PROFILES, get_profile
+from harness.trace import TRACE_DIR, format_steps, slowest_steps, span_summary, write_summary
+
+TEST_PLAN = SUITE_DIR / "testsprite_frontend_test_plan.json"
+
+# Tests changing account-wide state run on one worker, one at a time.
+EXCLUSIVE_GROUP = "account"
+
+_plan_key = pytest.StashKey[dict]()
+_backend_key = pytest.StashKey[LocalBackend]()
+
+
+def _marker_name(value):
+    return re.sub(r"\W+", "_", value.strip().lower())
+
+
+def _load_plan():
+    return {case["id"]: case for case in json.loads(TEST_PLAN.read_text())}
+
+
+def _plan_markers(case):
+    markers = []
+    if case.get("category"):
+        markers.append(_marker_name(case["category"]))
+    if case.get("priority"):
+        markers.append(f"priority_{_marker_name(case['priority'])}")
+    return markers
+
+
+def pytest_addoption(parser):
+    parser.addoption("--headed", action="store_true",
+                     help="show the browsers instead of running headless")
+    parser.addoption("--local-backend", action="store_true",
+                     help="start a seeded local Convex backend and Vite dev server")
+    parser.addoption("--profile", choices=sorted(PROFILES),
+                     help="browser launch profile (default: $INKWELL_E2E_PROFILE or multi-process)")
+    parser.addoption("--slowest-steps", type=int, default=10, metavar="N",
+                     help="list the N slowest steps of the run (default: 10, 0 to disable)")
+
+
+def pytest_configure(config):
+    plan = _load_plan()
+    config.stash[_plan_key] = plan
+    for name in sorted({name for case in plan.values() for name in _plan_markers(case)}):
+        config.addinivalue_line("markers", f"{name}: from testsprite_frontend_test_plan.json")
+    # xdist workers inherit the backend the controller process started.
+    if config.getoption("local_backend") and not hasattr(config, "workerinput"):
+        backend = LocalBackend()
+        backend.start()
+        config.stash[_backend_key] = backend
+
+
+def pytest_unconfigure(config):
+    backend = config.stash.get(_backend_key, None)
+    if backend:
+        backend.stop()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    spans = []
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) != "teardown":
+                continue
+            test_id = report.nodeid.partition("_")[0]
+            for name, value in report.user_properties:
+                if name == "spans":
+                    spans.extend((test_id, span) for span in value)
+    if not spans:
+        return
+    steps = slowest_steps(spans, limit=None)
+    write_summary(steps)
+    limit = config.getoption("slowest_steps")
+    if limit > 0:
+        terminalreporter.write_sep("=", f"slowest {min(limit, len(steps))} steps")
+        for line in format_steps(steps[:limit]):
+            terminalreporter.write_line(line)
+
+
+def pytest_collection_modifyitems(config, items):
+    plan = config.stash[_plan_key]
+    for item in items:
+        test_id = item.path.stem.partition("_")[0]
+        for name in _plan_markers(plan.get(test_id, {})):
+            item.add_marker(name)
+        if getattr(item.module, "EXCLUSIVE", False):
+            item.add_marker(pytest.mark.xdist_group(EXCLUSIVE_GROUP))
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend(pytestconfig):
+    # Sharded workers share one deployment, so a reset would pull data out
+    # from under tests running elsewhere; they start from the seed only.
+    if pytestconfig.getoption("local_backend") and "PYTEST_XDIST_WORKER" not in os.environ:
+        restore_snapshot()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def pool(pytestconfig):
+    async with BrowserPool(
+        size=1,
+        headless=not pytestconfig.getoption("headed"),
+        profile=get_profile(pytestconfig.getoption("profile")),
+    ) as pool:
+        yield pool
+
+
+@pytest.fixture(scope="session")
+def auth_session():
+    return AuthSession()
+
+
+@pytest_asyncio.fixture
+async def context(request, pool, auth_session):
+    options = {"requires": getattr(request.module, "REQUIRES_RESOURCES", ())}
+    if getattr(request.module, "REQUIRES_AUTH", False):
+        options["storage_state"] = await auth_session.storage_state(pool.context)
+    async with pool.context(**options) as context:
+        yield context
+        trace = await actions.finish(context)
+        trace.write(TRACE_DIR / f"{request.node.path.stem}.json", name=request.node.nodeid)
+        spans = trace.spans
+        request.node.user_properties.append(("actions", len(spans)))
+        request.node.user_properties.append(("waited", round(sum(span.waited for span in spans), 3)))
+        request.node.user_properties.append(("spans", [span_summary(span) for span in spans]))
@@ -0,0 +1,6 @@
+"""Shared execution harness for the generated TestSprite e2e scripts.
+
+Run the whole suite concurrently from the ``testsprite_tests`` directory::
+
+    python -m harness --workers 4 --browsers 2
+"""
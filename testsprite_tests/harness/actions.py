@@ -0,0 +1,357 @@
+"""Event-driven page actions for the TC scripts.
+
+The generated scripts slept a fixed 3 s before every click and fill.  These
+helpers wait for what the step actually depends on instead: the element being
+actionable (Playwright's own visible/stable/enabled checks) and, afterwards,
+the Convex sync websocket going quiet so the next step sees the server's
+answer.  Every action, wait and ``expect`` assertion is recorded as a span on
+the context's ``Trace`` (see harness.trace), with how long it spent waiting
+and the Convex calls it caused, so slow steps show up in the reports.
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import re
+import time
+import weakref
+from dataclasses import dataclass, field
+
+from playwright.async_api import Page
+from playwright.async_api import expect as _expect
+
+from harness.trace import PERFORMANCE_OBSERVER, Trace
+
+# Default per-action timeout the generated scripts were written against.
+DEFAULT_TIMEOUT_MS = 5000
+NAVIGATION_TIMEOUT_MS = 10000
+
+# How long the Convex websocket must stay quiet before a step counts as settled.
+QUIET_PERIOD = 0.05
+
+# Client -> server messages that expect a server reply before the UI is current.
+_REQUEST_TYPES = {"Mutation", "Action"}
+_RESPONSE_TYPES = {"MutationResponse", "ActionResponse"}
+
+_traffic = weakref.WeakKeyDictionary()
+_traces = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class ActionRecord:
+    """One step of a test; a span in its trace."""
+
+    action: str
+    target: str
+    waited: float
+    duration: float
+    # Wall-clock start, comparable with the browser's performance timeline.
+    start: float = 0.0
+    calls: list = field(default_factory=list)
+    # Filled in by ``Trace.finish``: long-task time overlapping the step, in
+    # ms, and for a goto the page's Largest Contentful Paint.
+    long_tasks: float = 0.0
+    lcp: float = None
+    error: str = None
+
+
+class ConvexTraffic:
+    """Track in-flight Convex requests on a page's sync websocket.
+
+    Mutations and actions are outstanding until their response arrives;
+    ``ModifyQuerySet`` and ``Authenticate`` are outstanding until the next
+    ``Transition`` pushes the query results.  The quiet period after the last
+    response gives the server time to push the transition that carries a
+    mutation's writes.
+
+    Every function call is also logged on ``trace``: subscriptions until
+    their first result, mutations and actions until their response, and
+    server-pushed query updates as instants.
+    """
+
+    def __init__(self, trace=None):
+        self._trace = trace
+        self._queries = {}
+        self._calls = {}
+        self._requests = set()
+        self._awaiting_transition = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._responded = asyncio.Condition()
+        self.responses = 0
+
+    @property
+    def pending(self):
+        return len(self._requests) + self._awaiting_transition
+
+    def attach(self, websocket):
+        if "/sync" not in websocket.url:
+            return
+        websocket.on("framesent", self._on_sent)
+        websocket.on("framereceived", self._on_received)
+        websocket.on("close", lambda _: self._reset())
+
+    def _on_sent(self, payload):
+        message = _decode(payload)
+        kind = message.get("type")
+        if kind in _REQUEST_TYPES:
+            self._requests.add(message.get("requestId"))
+            self._start_call(("request", message.get("requestId")), kind.lower(), message.get("udfPath"))
+        elif kind in ("ModifyQuerySet", "Authenticate"):
+            self._awaiting_transition += 1
+            for change in message.get("modifications", []):
+                if change.get("type") == "Add":
+                    self._queries[change.get("queryId")] = change.get("udfPath")
+                    self._start_call(("query", change.get("queryId")), "query", change.get("udfPath"))
+        self._update()
+
+    def _on_received(self, payload):
+        message = _decode(payload)
+        kind = message.get("type")
+        if kind in _RESPONSE_TYPES:
+            self._requests.discard(message.get("requestId"))
+            self.responses += 1
+            self._end_call(("request", message.get("requestId")), message.get("success", True))
+            asyncio.ensure_future(self._notify())
+        elif kind == "Transition":
+            self._awaiting_transition = 0
+            for change in message.get("modifications", []):
+                if change.get("type") in ("QueryUpdated", "QueryFailed"):
+                    query_id = change.get("queryId")
+                    ok = change.get("type") == "QueryUpdated"
+                    if ("query", query_id) in self._calls:
+                        self._end_call(("query", query_id), ok)
+                    elif self._trace is not None:
+                        call = self._trace.start_call("update", self._queries.get(query_id))
+                        call.end, call.ok = call.start, ok
+        self._update()
+
+    def _start_call(self, key, kind, path):
+        if self._trace is not None:
+            self._calls[key] = self._trace.start_call(kind, path)
+
+    def _end_call(self, key, ok):
+        call = self._calls.pop(key, None)
+        if call is not None:
+            call.end, call.ok = time.time(), bool(ok)
+
+    def _reset(self):
+        self._requests.clear()
+        self._awaiting_transition = 0
+        # Query ids are per connection; a reconnect starts over.
+        self._queries.clear()
+        self._calls.clear()
+        self._update()
+
+    def _update(self):
+        if self.pending:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    async def _notify(self):
+        async with self._responded:
+            self._responded.notify_all()
+
+    async def wait_for_response(self, after, timeout):
+        """Wait until more than ``after`` mutation/action responses have arrived."""
+        async with self._responded:
+            await asyncio.wait_for(
+                self._responded.wait_for(lambda: self.responses > after), timeout
+            )
+
+    async def wait_idle(self, timeout):
+        """Wait until no request is in flight for ``QUIET_PERIOD`` seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._idle.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+            await asyncio.sleep(QUIET_PERIOD)
+            if self._idle.is_set():
+                return True
+
+
+def _decode(payload):
+    try:
+        message = json.loads(payload)
+    except (TypeError, ValueError):
+        return {}
+    return message if isinstance(message, dict) else {}
+
+
+def _describe(target):
+    if isinstance(target, Page):
+        return target.url
+    match = re.search(r"selector='(.*)'>$", repr(target))
+    return match.group(1) if match else repr(target)
+
+
+def _attach(page, trace):
+    traffic = ConvexTraffic(trace)
+    _traffic[page] = traffic
+    page.on("websocket", traffic.attach)
+
+
+async def instrument(context, trace=None):
+    """Watch Convex traffic and page performance on every page the context opens.
+
+    Pass another context's ``trace`` to record both on one timeline.
+    """
+    trace = _traces[context] = trace or Trace()
+    await context.add_init_script(PERFORMANCE_OBSERVER)
+    for page in context.pages:
+        _attach(page, trace)
+    context.on("page", lambda page: _attach(page, trace))
+
+
+def trace(context):
+    """Return the ``Trace`` collected for ``context``."""
+    return _traces.get(context)
+
+
+def records(context):
+    """Return the ``ActionRecord`` spans collected for ``context``."""
+    collected = _traces.get(context)
+    return collected.spans if collected else []
+
+
+async def finish(context):
+    """Collect the browser metrics of ``context`` into its trace and return it."""
+    collected = _traces.get(context)
+    if collected is not None:
+        await collected.finish(context)
+    return collected
+
+
+@contextlib.asynccontextmanager
+async def step(page, action, target, *, waiting=False):
+    """Record the enclosed block as one span on ``page``'s trace.
+
+    The yielded record's ``waited`` can be set by the block; ``waiting=True``
+    counts the whole step as waiting, as for waits and assertions.
+    """
+    record = ActionRecord(action, target, waited=0.0, duration=0.0, start=time.time())
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception as exc:
+        message = str(exc).strip()
+        record.error = f"{type(exc).__name__}: {message.splitlines()[0]}" if message else type(exc).__name__
+        raise
+    finally:
+        record.duration = time.perf_counter() - started
+        if waiting:
+            record.waited = record.duration
+        collected = _traces.get(page.context)
+        if collected is not None:
+            collected.add(record)
+
+
+async def _harvest(page):
+    collected = _traces.get(page.context)
+    if collected is not None:
+        await collected.harvest(page)
+
+
+async def settle(page, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait for the page's Convex requests to finish; return False on timeout."""
+    traffic = _traffic.get(page)
+    if traffic is None:
+        return True
+    return await traffic.wait_idle(timeout / 1000)
+
+
+def responses(page):
+    """Number of Convex mutation/action responses the page has received."""
+    traffic = _traffic.get(page)
+    return traffic.responses if traffic else 0
+
+
+async def wait_for_response(page, after, *, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait for the page's next Convex write after ``responses(page) == after``.
+
+    Use it around debounced saves: read ``responses(page)``, type, then wait,
+    instead of sleeping past the debounce interval.
+    """
+    async with step(page, "wait", "convex response", waiting=True):
+        await _traffic[page].wait_for_response(after, timeout / 1000)
+
+
+async def wait_for_url(page, url, *, timeout=NAVIGATION_TIMEOUT_MS):
+    """``page.wait_for_url`` recorded as a wait step."""
+    async with step(page, "wait", str(url), waiting=True):
+        await page.wait_for_url(url, timeout=timeout)
+
+
+async def goto(page, url, *, timeout=NAVIGATION_TIMEOUT_MS):
+    """Navigate and wait for the DOM and the initial Convex queries."""
+    # Keep the performance entries of the page being left.
+    await _harvest(page)
+    async with step(page, "goto", url) as record:
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        ready = time.perf_counter()
+        await settle(page)
+        record.waited = time.perf_counter() - ready
+    await _harvest(page)
+
+
+async def click(locator, *, timeout=DEFAULT_TIMEOUT_MS):
+    """Click once the element is actionable, then let Convex settle."""
+    page = locator.page
+    async with step(page, "click", _describe(locator)) as record:
+        started = time.perf_counter()
+        await locator.wait_for(state="visible", timeout=timeout)
+        record.waited = time.perf_counter() - started
+        await locator.click(timeout=timeout)
+        settling = time.perf_counter()
+        await settle(page)
+        record.waited += time.perf_counter() - settling
+
+
+async def fill(locator, value, *, timeout=DEFAULT_TIMEOUT_MS):
+    """Fill once the element is editable.
+
+    Typing only touches local React state, so there is nothing to settle.
+    """
+    page = locator.page
+    async with step(page, "fill", _describe(locator)) as record:
+        started = time.perf_counter()
+        await locator.wait_for(state="visible", timeout=timeout)
+        record.waited = time.perf_counter() - started
+        await locator.fill(value, timeout=timeout)
+
+
+class _TimedAssertions:
+    """Wrap Playwright assertions so each one is recorded as a step."""
+
+    def __init__(self, assertions, page, target):
+        self._assertions = assertions
+        self._page = page
+        self._target = target
+
+    def __getattr__(self, name):
+        assertion = getattr(self._assertions, name)
+        if not callable(assertion):
+            return assertion
+
+        @functools.wraps(assertion)
+        async def timed(*args, **kwargs):
+            async with step(self._page, "assert", f"{name} {self._target}", waiting=True):
+                await assertion(*args, **kwargs)
+
+        return timed
+
+
+def expect(actual, message=None):
+    """``playwright.async_api.expect`` with every assertion recorded as a step."""
+    assertions = _expect(actual, message)
+    page = actual if isinstance(actual, Page) else getattr(actual, "page", None)
+    if page is None:
+        return assertions
+    return _TimedAssertions(assertions, page, _describe(actual))
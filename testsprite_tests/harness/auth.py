@@ -0,0 +1,125 @@
+"""Sign in once per run and share the session through Playwright storage state.
+
+Convex Auth keeps the session in ``localStorage`` (``__convexAuthJWT_*`` and
+``__convexAuthRefreshToken_*``), so a saved ``storage_state`` is enough for a
+new context to start out signed in.  The state is cached on disk between runs
+and refreshed when it is older than ``max_age``, when its JWT is close to
+expiry, or when the server no longer accepts it.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from pathlib import Path
+
+from harness import actions
+from harness import locators as L
+from harness.config import BASE_URL, LOGIN_EMAIL, LOGIN_PASSWORD, SUITE_DIR
+
+STATE_PATH = SUITE_DIR / ".auth" / "storage_state.json"
+
+JWT_PREFIX = "__convexAuthJWT_"
+
+# Convex Auth JWTs live for an hour.  Contexts share one refresh token, so the
+# cached JWT must outlive the whole run rather than be refreshed by every
+# context at once.
+DEFAULT_MAX_AGE = 30 * 60
+EXPIRY_MARGIN = 15 * 60
+
+
+def session_jwt(state):
+    """The Convex Auth JWT saved in a storage state, or None."""
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item["name"].startswith(JWT_PREFIX):
+                return item["value"]
+    return None
+
+
+def _jwt_expiry(state):
+    token = session_jwt(state)
+    if token is None:
+        return None
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+
+
+class AuthSession:
+    """Lazily produce a signed-in storage state file for the test account."""
+
+    def __init__(self, path=STATE_PATH, *, email=LOGIN_EMAIL, password=LOGIN_PASSWORD,
+                 base_url=BASE_URL, max_age=DEFAULT_MAX_AGE):
+        self.path = Path(path)
+        self.email = email
+        self.password = password
+        self.base_url = base_url
+        self.max_age = max_age
+        self._verified = False
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self):
+        """Whether the cached state exists, is recent and its JWT is valid."""
+        if not self.path.exists():
+            return False
+        if time.time() - self.path.stat().st_mtime > self.max_age:
+            return False
+        try:
+            expiry = _jwt_expiry(json.loads(self.path.read_text()))
+        except (ValueError, KeyError, IndexError):
+            return False
+        return expiry is not None and expiry - time.time() > EXPIRY_MARGIN
+
+    def invalidate(self):
+        """Drop the cached state so the next ``storage_state`` call signs in again."""
+        self.path.unlink(missing_ok=True)
+        self._verified = False
+
+    async def storage_state(self, new_context):
+        """Return the path of a valid storage state, signing in if needed.
+
+        ``new_context(**options)`` must return an async context manager that
+        yields a browser context, e.g. ``BrowserPool.context``.
+        """
+        async with self._lock:
+            if self.is_fresh() and (self._verified or await self._accepted(new_context)):
+                self._verified = True
+                return str(self.path)
+            await self._sign_in(new_context)
+            self._verified = True
+            return str(self.path)
+
+    async def _accepted(self, new_context):
+        # A state cached by an earlier run may have been revoked server-side
+        # (sign-out, password change); the app then bounces to /auth.
+        async with new_context(storage_state=str(self.path)) as context:
+            page = await context.new_page()
+            await actions.goto(page, f"{self.base_url}/dashboard")
+            # The loading screen has no headings; the dashboard, trial and
+            # auth pages all do.
+            await page.wait_for_selector("h1, h2")
+            return "/auth" not in page.url
+
+    async def _sign_in(self, new_context):
+        if not self.email or not self.password:
+            raise RuntimeError("No test account configured; set INKWELL_E2E_EMAIL and INKWELL_E2E_PASSWORD")
+        async with new_context() as context:
+            page = await context.new_page()
+            await actions.goto(page, f"{self.base_url}/auth")
+            await actions.fill(page.get_by_test_id(L.AUTH_EMAIL), self.email)
+            await actions.fill(page.get_by_test_id(L.AUTH_PASSWORD), self.password)
+            await actions.click(page.get_by_test_id(L.AUTH_SUBMIT))
+            await actions.wait_for_url(page, "**/dashboard")
+            await page.wait_for_function(
+                "prefix => Object.keys(localStorage).some(key => key.startsWith(prefix))",
+                arg=JWT_PREFIX,
+            )
+            state = await context.storage_state()
+        # Parallel workers may read the cache while another one refreshes it;
+        # replace the file atomically so nobody sees half a JSON document.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        partial.write_text(json.dumps(state))
+        os.replace(partial, self.path)
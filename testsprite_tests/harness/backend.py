@@ -0,0 +1,193 @@
+"""Local Convex backend with seeded fixtures for hermetic e2e runs.
+
+``LocalBackend`` starts ``npx convex dev --local`` (an anonymous local
+deployment, no Convex login needed), pushes ``convex/``, configures Convex
+Auth, seeds it from ``fixtures/seed.json`` through ``testing:seed`` and serves
+the app from Vite against it.  ``ai.chat`` talks to a ``MockOpenAI`` started
+alongside, so no OpenAI key or network is needed.  The seed returns a
+snapshot of every app table; ``restore()`` puts the database back to that
+snapshot in one mutation (``testing:restore``) instead of undoing a test
+through the UI.
+
+``convex dev`` rewrites ``.env.local``; the original file is put back when the
+backend stops.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from harness.config import BASE_URL, SUITE_DIR
+from harness.mock_openai import MockConfig, MockOpenAI
+
+PROJECT_DIR = SUITE_DIR.parent
+ENV_FILE = PROJECT_DIR / ".env.local"
+FIXTURES_PATH = SUITE_DIR / "fixtures" / "seed.json"
+STATE_DIR = SUITE_DIR / ".backend"
+SNAPSHOT_PATH = STATE_DIR / "snapshot.json"
+
+READY_TIMEOUT = 180
+# Printed by ``convex dev`` once the functions are pushed.
+READY_MARKER = "Convex functions ready"
+
+
+class BackendError(RuntimeError):
+    pass
+
+
+def _npx(*args):
+    return ["npx", *args]
+
+
+def _read_env_file():
+    if not ENV_FILE.exists():
+        return {}
+    values = {}
+    for line in ENV_FILE.read_text().splitlines():
+        match = re.match(r"\s*([A-Z_][A-Z0-9_]*)\s*=\s*(.*?)\s*(#.*)?$", line)
+        if match:
+            values[match.group(1)] = match.group(2).strip("'\"")
+    return values
+
+
+def deployment_url():
+    """The Convex deployment the app talks to, as Vite would resolve it."""
+    return os.environ.get("VITE_CONVEX_URL") or _read_env_file().get("VITE_CONVEX_URL")
+
+
+def _wait_for_http(url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise BackendError(f"{url} did not respond within {timeout}s")
+
+
+def convex_run(function, args=None):
+    """Run a Convex function (internal ones included) with the CLI's admin key."""
+    result = subprocess.run(
+        _npx("convex", "run", function, json.dumps(args or {})),
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise BackendError(f"convex run {function} failed:\n{result.stderr or result.stdout}")
+    output = result.stdout.strip()
+    return json.loads(output) if output else None
+
+
+def restore_snapshot(path=SNAPSHOT_PATH):
+    """Reset the local deployment to the snapshot taken after seeding."""
+    convex_run("testing:restore", {"snapshot": json.loads(path.read_text())})
+
+
+class LocalBackend:
+    """Run a seeded local Convex deployment and the Vite dev server against it."""
+
+    def __init__(self, fixtures_path=FIXTURES_PATH, *, base_url=BASE_URL, openai_config=None):
+        self.fixtures_path = fixtures_path
+        self.base_url = base_url
+        self.openai = MockOpenAI(openai_config or MockConfig())
+        self.convex_url = None
+        self._convex = None
+        self._vite = None
+        self._env_backup = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        STATE_DIR.mkdir(exist_ok=True)
+        self._env_backup = ENV_FILE.read_text() if ENV_FILE.exists() else None
+        self.openai.start()
+        try:
+            self._start_convex()
+            self._configure()
+            self.seed()
+            self._start_vite()
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        for process in (self._vite, self._convex):
+            if process and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        self._vite = self._convex = None
+        self.openai.stop()
+        if self._env_backup is not None:
+            ENV_FILE.write_text(self._env_backup)
+        elif ENV_FILE.exists():
+            ENV_FILE.unlink()
+
+    def seed(self):
+        """Replace all data with the fixtures and save the resulting snapshot."""
+        fixtures = json.loads(self.fixtures_path.read_text())
+        snapshot = convex_run("testing:seed", {"fixtures": fixtures})
+        SNAPSHOT_PATH.write_text(json.dumps(snapshot))
+
+    def restore(self):
+        restore_snapshot()
+
+    def _start_convex(self):
+        log_path = STATE_DIR / "convex.log"
+        with open(log_path, "w") as log:
+            self._convex = subprocess.Popen(
+                _npx("convex", "dev", "--local", "--tail-logs", "disable"),
+                cwd=PROJECT_DIR, stdout=log, stderr=subprocess.STDOUT,
+                env={**os.environ, "CONVEX_AGENT_MODE": "anonymous"},
+            )
+        deadline = time.monotonic() + READY_TIMEOUT
+        while READY_MARKER not in log_path.read_text():
+            if self._convex.poll() is not None:
+                raise BackendError(f"convex dev exited; see {log_path}")
+            if time.monotonic() > deadline:
+                raise BackendError(f"convex dev was not ready within {READY_TIMEOUT}s; see {log_path}")
+            time.sleep(0.2)
+        self.convex_url = _read_env_file().get("VITE_CONVEX_URL")
+        if not self.convex_url:
+            raise BackendError(f"convex dev did not write VITE_CONVEX_URL to {ENV_FILE}")
+
+    def _configure(self):
+        keys = subprocess.run(
+            ["node", "generateKeys.mjs"], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        settings = dict(line.split("=", 1) for line in keys.splitlines() if "=" in line)
+        settings["JWT_PRIVATE_KEY"] = settings["JWT_PRIVATE_KEY"].strip('"')
+        settings["SITE_URL"] = self.base_url
+        settings["INKWELL_TESTING"] = "1"
+        settings["OPENAI_BASE_URL"] = self.openai.base_url
+        settings["OPENAI_API_KEY"] = "mock-key"
+        for name, value in settings.items():
+            # "--" keeps a value starting with "-----BEGIN" from parsing as a flag.
+            subprocess.run(
+                _npx("convex", "env", "set", name, "--", value),
+                cwd=PROJECT_DIR, capture_output=True, check=True,
+            )
+
+    def _start_vite(self):
+        port = urlsplit(self.base_url).port or 80
+        # Variables already in the environment win over .env files in Vite.
+        with open(STATE_DIR / "vite.log", "w") as log:
+            self._vite = subprocess.Popen(
+                _npx("vite", "--port", str(port), "--strictPort"),
+                cwd=PROJECT_DIR, stdout=log, stderr=subprocess.STDOUT,
+                env={**os.environ, "VITE_CONVEX_URL": self.convex_url},
+            )
+        _wait_for_http(self.base_url, READY_TIMEOUT)
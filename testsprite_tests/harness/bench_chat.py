@@ -0,0 +1,207 @@
+"""Measure how soon an AI reply becomes visible in the chat sidebar.
+
+A signed-in browser context keeps a new document open, subscribed to
+``api.messages.list`` like a writer's would be.  The benchmark calls
+``ai:chat`` through the Convex HTTP API with the test account's session,
+once buffered (``stream: false``, the whole completion is stored at the end)
+and once streaming (the reply is written into its message as tokens
+arrive), and a ``MutationObserver`` in the page records:
+
+* first token: the request leaving to the first reply text in the sidebar;
+* complete: the request leaving to the reply being marked complete.
+
+Run it against the mock OpenAI server so the model's timing is fixed; with
+``--local-backend`` the mock is started with ``--ttft`` and
+``--tokens-per-second``::
+
+    python -m harness.bench_chat --local-backend --ttft 0.4 --tokens-per-second 40
+    python -m harness.bench_chat --requests 20 --reply-tokens 400 --json chat.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from playwright.async_api import Error as PlaywrightError
+
+from harness import flows
+from harness.auth import AuthSession, session_jwt
+from harness.backend import LocalBackend, deployment_url
+from harness.mock_openai import MockConfig
+from harness.pool import BrowserPool
+from harness.profiles import PROFILES, get_profile
+from harness.stats import summarize
+
+MODES = {"buffered": False, "streaming": True}
+REPLY_TIMEOUT = 120.0
+
+# Timestamps (epoch ms) of the next assistant reply: when it first shows
+# text and when it is marked complete.  The transcript only mounts messages
+# near the viewport, so the reply is the first one with an id not seen yet.
+_WATCH_REPLY = """() => {
+  const now = () => performance.timeOrigin + performance.now();
+  const timing = (window.__inkwellReply = {});
+  const selector = '[data-testid="chat-message"][data-role="assistant"]';
+  const seen = new Set([...document.querySelectorAll(selector)].map(
+    (message) => message.dataset.messageId));
+  const check = () => {
+    const reply = [...document.querySelectorAll(selector)].find(
+      (message) => !seen.has(message.dataset.messageId));
+    const text = reply?.querySelector('[data-testid="chat-message-content"]')?.textContent;
+    if (!text) return;
+    timing.first ??= now();
+    if (reply.dataset.status !== "streaming") {
+      timing.done = now();
+      observer.disconnect();
+    }
+  };
+  const observer = new MutationObserver(check);
+  observer.observe(document.body, {
+    subtree: true, childList: true, characterData: true, attributes: true,
+  });
+  check();
+}"""
+
+
+@dataclass
+class ChatResult:
+    mode: str
+    requests: int
+    failures: int
+    first_token: dict
+    complete: dict
+
+
+def call_action(convex_url, token, path, args):
+    """Run a public Convex action over HTTP as the session's user."""
+    request = urllib.request.Request(
+        f"{convex_url}/api/action",
+        data=json.dumps({"path": path, "args": args, "format": "json"}).encode(),
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+    )
+    with urllib.request.urlopen(request, timeout=REPLY_TIMEOUT) as response:
+        body = json.loads(response.read())
+    if body.get("status") != "success":
+        raise RuntimeError(f"{path} failed: {body.get('errorMessage')}")
+    return body["value"]
+
+
+def _question(reply_tokens):
+    # The mock echoes the question, so its length sets the reply's.
+    words = " ".join(f"word{index}" for index in range(reply_tokens))
+    return f"bench-chat {uuid.uuid4().hex[:8]} {words}"
+
+
+async def bench_mode(page, convex_url, token, document_id, mode, *, requests=10, reply_tokens=200):
+    """Send ``requests`` chat messages in ``mode`` and time the replies."""
+    first_token, complete = [], []
+    failures = 0
+    for _ in range(requests):
+        await page.evaluate(_WATCH_REPLY)
+        started = time.time() * 1000
+        try:
+            await asyncio.to_thread(call_action, convex_url, token, "ai:chat", {
+                "documentId": document_id,
+                "userMessage": _question(reply_tokens),
+                "stream": MODES[mode],
+                "bypassCache": True,
+            })
+            handle = await page.wait_for_function(
+                "() => window.__inkwellReply.done && window.__inkwellReply",
+                timeout=REPLY_TIMEOUT * 1000,
+            )
+        except (OSError, RuntimeError, PlaywrightError) as error:
+            print(f"{mode}: request failed: {error}")
+            failures += 1
+            continue
+        timing = await handle.json_value()
+        first_token.append((timing["first"] - started) / 1000)
+        complete.append((timing["done"] - started) / 1000)
+    return ChatResult(
+        mode=mode,
+        requests=requests,
+        failures=failures,
+        first_token=summarize(first_token),
+        complete=summarize(complete),
+    )
+
+
+async def bench_chat(pool, auth, convex_url, modes, *, requests=10, reply_tokens=200):
+    storage_state = await auth.storage_state(pool.context)
+    token = session_jwt(json.loads(Path(storage_state).read_text()))
+    async with pool.context(storage_state=storage_state) as context:
+        page = await context.new_page()
+        document_url = await flows.create_document(page, f"Chat benchmark {uuid.uuid4().hex[:8]}")
+        document_id = document_url.rstrip("/").rsplit("/", 1)[-1]
+        return [
+            await bench_mode(page, convex_url, token, document_id, mode,
+                             requests=requests, reply_tokens=reply_tokens)
+            for mode in modes
+        ]
+
+
+def _ms(value):
+    return f"{value * 1000:8.0f}" if value is not None else f"{'-':>8}"
+
+
+def _report(results):
+    print(f"{'mode':<10} {'n':>4} {'failed':>6}   first token ms (p50 / p95)   complete ms (p50 / p95)")
+    for result in results:
+        first, done = result.first_token, result.complete
+        print(f"{result.mode:<10} {first['n']:>4} {result.failures:>6}   "
+              f"{_ms(first['p50'])} {_ms(first['p95'])}          {_ms(done['p50'])} {_ms(done['p95'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.bench_chat", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES),
+                        help="reply modes to measure (default: buffered streaming)")
+    parser.add_argument("-n", "--requests", type=int, default=10,
+                        help="chat messages sent per mode (default: 10)")
+    parser.add_argument("--reply-tokens", type=int, default=200,
+                        help="approximate length of each reply in tokens (default: 200)")
+    parser.add_argument("--ttft", type=float, default=0.4,
+                        help="mock time to first token with --local-backend (default: 0.4)")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0,
+                        help="mock token rate with --local-backend (default: 40)")
+    parser.add_argument("--profile", choices=sorted(PROFILES),
+                        help="browser launch profile (default: $INKWELL_E2E_PROFILE or multi-process)")
+    parser.add_argument("--headed", action="store_true",
+                        help="show the browser instead of running headless")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="run against a seeded local Convex backend and the mock OpenAI server")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    async def bench_all(convex_url):
+        async with BrowserPool(size=1, headless=not args.headed,
+                               profile=get_profile(args.profile)) as pool:
+            return await bench_chat(pool, AuthSession(), convex_url, args.modes,
+                                    requests=args.requests, reply_tokens=args.reply_tokens)
+
+    with contextlib.ExitStack() as stack:
+        if args.local_backend:
+            mock = MockConfig(ttft=args.ttft, tokens_per_second=args.tokens_per_second)
+            backend = stack.enter_context(LocalBackend(openai_config=mock))
+            convex_url = backend.convex_url
+        else:
+            convex_url = deployment_url()
+        if not convex_url:
+            parser.error("no Convex deployment; set VITE_CONVEX_URL or use --local-backend")
+        results = asyncio.run(bench_all(convex_url))
+
+    _report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(result) for result in results], indent=2))
+    return 0 if all(result.failures == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
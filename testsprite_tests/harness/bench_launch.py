@@ -0,0 +1,158 @@
+"""Compare browser launch profiles by per-test wall time.
+
+Runs the selected TC scripts under each profile ``--repeat`` times through
+``run_suite`` and reports, per profile, the cold launch time, the per-test
+and whole-suite wall time and how many tests failed.  The fastest profile
+without failures is the one to run the suite with::
+
+    python -m harness.bench_launch --repeat 3 -k TC00
+    python -m harness.bench_launch --profiles multi-process single-process --local-backend
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from harness.backend import LocalBackend
+from harness.pool import launch_browser
+from harness.profiles import PROFILES
+from harness.runner import discover, run_suite
+from harness.stats import summarize
+
+
+@dataclass
+class ProfileResult:
+    profile: str
+    launch: dict
+    test: dict
+    suite: dict
+    failures: int
+    runs: int
+    per_test: dict = field(default_factory=dict)
+
+    @property
+    def stable(self):
+        return self.failures == 0
+
+
+async def _launch_time(profile, headless):
+    """Seconds from launching Chromium to a blank page being ready."""
+    async with async_playwright() as playwright:
+        started = time.perf_counter()
+        browser = await launch_browser(playwright, headless=headless, profile=profile)
+        try:
+            page = await browser.new_page()
+            await page.goto("about:blank")
+            return time.perf_counter() - started
+        finally:
+            await browser.close()
+
+
+async def bench_profile(profile, paths, *, repeat=3, workers=4, browsers=2, headless=True,
+                        between_runs=None):
+    """Run ``paths`` ``repeat`` times under ``profile`` and summarize the timings."""
+    launches, suites, tests = [], [], []
+    per_test = defaultdict(list)
+    failures = 0
+    for _ in range(repeat):
+        if between_runs:
+            between_runs()
+        launches.append(await _launch_time(profile, headless))
+        started = time.perf_counter()
+        results = await run_suite(paths, workers=workers, browsers=browsers,
+                                  headless=headless, profile=profile)
+        suites.append(time.perf_counter() - started)
+        for result in results:
+            tests.append(result.duration)
+            per_test[result.test_id].append(result.duration)
+            failures += not result.passed
+    return ProfileResult(
+        profile=profile.name,
+        launch=summarize(launches),
+        test=summarize(tests),
+        suite=summarize(suites),
+        failures=failures,
+        runs=len(tests),
+        per_test={test_id: summarize(times) for test_id, times in sorted(per_test.items())},
+    )
+
+
+def fastest_stable(results):
+    """The profile with the lowest median test time among those without failures."""
+    stable = [result for result in results if result.stable]
+    return min(stable, key=lambda result: result.test["p50"], default=None)
+
+
+def _report(results):
+    print(f"{'profile':<16}{'launch p50':>12}{'test p50':>10}{'test p95':>10}"
+          f"{'suite p50':>11}{'failures':>10}")
+    for result in results:
+        print(f"{result.profile:<16}{result.launch['p50']:>11.2f}s{result.test['p50']:>9.2f}s"
+              f"{result.test['p95']:>9.2f}s{result.suite['p50']:>10.1f}s"
+              f"{result.failures:>5}/{result.runs}")
+
+    test_ids = sorted({test_id for result in results for test_id in result.per_test})
+    print(f"\n{'median per test':<16}" + "".join(f"{result.profile:>16}" for result in results))
+    for test_id in test_ids:
+        cells = []
+        for result in results:
+            timing = result.per_test.get(test_id)
+            cells.append(f"{timing['p50']:>15.2f}s" if timing else f"{'-':>16}")
+        print(f"{test_id:<16}" + "".join(cells))
+
+    best = fastest_stable(results)
+    print(f"\nFastest stable profile: {best.profile}" if best
+          else "\nEvery profile had failures; no stable profile to recommend.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.bench_launch", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES),
+                        help="profiles to compare (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="suite runs per profile (default: 3)")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="number of tests to run at once (default: 4)")
+    parser.add_argument("-b", "--browsers", type=int, default=2,
+                        help="number of long-lived browsers to share (default: 2)")
+    parser.add_argument("-k", "--keyword",
+                        help="only run TC scripts whose file name contains KEYWORD")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="run against a seeded local Convex backend, restored before every run")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    paths = discover(keyword=args.keyword)
+    if not paths:
+        parser.error("no TC scripts matched")
+
+    async def bench_all(backend):
+        return [
+            await bench_profile(
+                PROFILES[name], paths, repeat=args.repeat, workers=args.workers,
+                browsers=args.browsers, between_runs=backend.restore if backend else None,
+            )
+            for name in args.profiles
+        ]
+
+    with contextlib.ExitStack() as stack:
+        backend = stack.enter_context(LocalBackend()) if args.local_backend else None
+        results = asyncio.run(bench_all(backend))
+
+    _report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(result) for result in results], indent=2))
+    best = fastest_stable(results)
+    return 0 if best else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+"""Measure how fast a document edit reaches the other clients that have it open.
+
+K browser contexts, all signed in as the test account, open one document.
+The first one (the writer) types a unique marker into the editor, which saves
+through the app's own path: Editor ``onUpdate`` -> ``debouncedSave`` ->
+``api.documents.applyEdits``.  The other K - 1 contexts only keep the document
+open, subscribed through ``useQuery(api.documents.editsSince)``.
+
+Timestamps come from the sync websockets, so no DOM polling skews them:
+
+* propagation: the writer's ``documents:applyEdits`` frame leaving the browser
+  to the first frame carrying the marker arriving at a subscriber;
+* end to end: the last keystroke to that arrival, which includes the
+  editor's 1 s save debounce.
+
+::
+
+    python -m harness.bench_sync --clients 2 10 50 --edits 20
+    python -m harness.bench_sync --local-backend --json sync.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from harness import actions, flows
+from harness import locators as L
+from harness.auth import AuthSession
+from harness.backend import LocalBackend
+from harness.pool import BrowserPool
+from harness.profiles import PROFILES, get_profile
+from harness.stats import summarize
+
+# Subscribers load the document this many at a time, so opening 50 clients
+# does not measure the dev server instead of the sync path.
+LOAD_CONCURRENCY = 8
+# How long an edit may take to reach every subscriber before it counts as missed.
+PROPAGATION_TIMEOUT = 30.0
+POLL_INTERVAL = 0.01
+
+
+@dataclass
+class SyncResult:
+    clients: int
+    edits: int
+    missed: int
+    propagation: dict
+    end_to_end: dict
+
+
+class MarkerWatch:
+    """Record when frames containing a marker cross a page's sync websocket."""
+
+    def __init__(self):
+        self.markers = set()
+        self.sent = {}
+        self.received = {}
+
+    def attach(self, websocket):
+        if "/sync" not in websocket.url:
+            return
+        websocket.on("framesent", lambda payload: self._scan(payload, self.sent))
+        websocket.on("framereceived", lambda payload: self._scan(payload, self.received))
+
+    def _scan(self, payload, seen):
+        now = time.perf_counter()
+        if isinstance(payload, bytes):
+            payload = payload.decode(errors="replace")
+        for marker in self.markers:
+            if marker not in seen and marker in payload:
+                seen[marker] = now
+
+
+async def _open_client(pool, storage_state, stack):
+    context = await stack.enter_async_context(pool.context(storage_state=storage_state))
+    page = await context.new_page()
+    watch = MarkerWatch()
+    page.on("websocket", watch.attach)
+    return page, watch
+
+
+async def _wait_for_marker(marker, watches, timeout):
+    deadline = time.monotonic() + timeout
+    while not all(marker in watch.received for watch in watches):
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(POLL_INTERVAL)
+    return True
+
+
+async def bench_clients(pool, auth, clients, *, edits=20):
+    """Run ``edits`` edits with ``clients`` contexts on one new document."""
+    if clients < 2:
+        raise ValueError("Need at least one writer and one subscriber")
+    storage_state = await auth.storage_state(pool.context)
+    async with contextlib.AsyncExitStack() as stack:
+        writer, writer_watch = await _open_client(pool, storage_state, stack)
+        document_url = await flows.create_document(writer, f"Sync benchmark {uuid.uuid4().hex[:8]}")
+
+        subscribers = [await _open_client(pool, storage_state, stack) for _ in range(clients - 1)]
+        loading = asyncio.Semaphore(LOAD_CONCURRENCY)
+
+        async def load(page):
+            async with loading:
+                await actions.goto(page, document_url)
+                await page.get_by_test_id(L.EDITOR_CONTENT).wait_for()
+
+        await asyncio.gather(*(load(page) for page, _ in subscribers))
+        watches = [watch for _, watch in subscribers]
+
+        propagation, end_to_end = [], []
+        missed = 0
+        await actions.click(writer.get_by_test_id(L.EDITOR_CONTENT).locator(".tiptap"))
+        for _ in range(edits):
+            marker = f"sync-{uuid.uuid4().hex[:12]}"
+            for watch in (writer_watch, *watches):
+                watch.markers = {marker}
+            await writer.keyboard.type(f" {marker}")
+            typed = time.perf_counter()
+            if not await _wait_for_marker(marker, watches, PROPAGATION_TIMEOUT):
+                missed += 1
+            sent = writer_watch.sent.get(marker)
+            for watch in watches:
+                arrived = watch.received.get(marker)
+                if arrived is None:
+                    continue
+                end_to_end.append(arrived - typed)
+                if sent is not None:
+                    propagation.append(arrived - sent)
+
+    return SyncResult(
+        clients=clients,
+        edits=edits,
+        missed=missed,
+        propagation=summarize(propagation),
+        end_to_end=summarize(end_to_end),
+    )
+
+
+def _ms(value):
+    return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def _report(results):
+    print(f"{'clients':>7} {'samples':>8} {'missed':>7}   propagation ms (p50 / p95 / p99)"
+          f"      end to end p50 ms")
+    for result in results:
+        p = result.propagation
+        print(f"{result.clients:>7} {p['n']:>8} {result.missed:>7}   "
+              f"{_ms(p['p50'])} {_ms(p['p95'])} {_ms(p['p99'])}   {_ms(result.end_to_end['p50'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.bench_sync", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--clients", type=int, nargs="+", default=[2, 10, 50],
+                        help="numbers of open clients to measure, writer included (default: 2 10 50)")
+    parser.add_argument("-e", "--edits", type=int, default=20,
+                        help="edits made by the writer per client count (default: 20)")
+    parser.add_argument("-b", "--browsers", type=int, default=2,
+                        help="browsers to spread the clients over (default: 2)")
+    parser.add_argument("--profile", choices=sorted(PROFILES),
+                        help="browser launch profile (default: $INKWELL_E2E_PROFILE or multi-process)")
+    parser.add_argument("--headed", action="store_true",
+                        help="show the browsers instead of running headless")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="run against a seeded local Convex backend and Vite dev server")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    async def bench_all():
+        auth = AuthSession()
+        async with BrowserPool(size=args.browsers, headless=not args.headed,
+                               profile=get_profile(args.profile)) as pool:
+            return [await bench_clients(pool, auth, clients, edits=args.edits)
+                    for clients in args.clients]
+
+    with contextlib.ExitStack() as stack:
+        if args.local_backend:
+            stack.enter_context(LocalBackend())
+        results = asyncio.run(bench_all())
+
+    _report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(result) for result in results], indent=2))
+    return 0 if all(result.missed == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
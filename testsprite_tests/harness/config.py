@@ -0,0 +1,20 @@
+"""Target app and test account, read from the TestSprite run config.
+
+``tmp/config.json`` is what TestSprite generated the scripts against; the
+``INKWELL_E2E_*`` environment variables override it for other deployments.
+"""
+
+import json
+import os
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+_config_path = SUITE_DIR / "tmp" / "config.json"
+_config = json.loads(_config_path.read_text()) if _config_path.exists() else {}
+
+BASE_URL = os.environ.get(
+    "INKWELL_E2E_BASE_URL", _config.get("localEndpoint", "http://localhost:5173")
+).rstrip("/")
+LOGIN_EMAIL = os.environ.get("INKWELL_E2E_EMAIL", _config.get("loginUser", ""))
+LOGIN_PASSWORD = os.environ.get("INKWELL_E2E_PASSWORD", _config.get("loginPassword", ""))
@@ -0,0 +1,96 @@
+"""Multi-step UI flows shared by several TC scripts."""
+
+import uuid
+
+from harness import actions
+from harness import locators as L
+from harness.actions import expect
+from harness.config import BASE_URL
+
+# AI replies go through OpenAI; give them far longer than a UI action.
+AI_REPLY_TIMEOUT_MS = 60000
+
+
+def unique_email(tag="e2e"):
+    """A never-registered address, so sign-up tests get a fresh account each run."""
+    return f"{tag}+{uuid.uuid4().hex[:8]}@inkwell.test"
+
+
+async def sign_in(page, email, password):
+    """Sign in through the Auth page form and wait for the dashboard."""
+    await actions.goto(page, f"{BASE_URL}/auth")
+    await actions.fill(page.get_by_test_id(L.AUTH_EMAIL), email)
+    await actions.fill(page.get_by_test_id(L.AUTH_PASSWORD), password)
+    await actions.click(page.get_by_test_id(L.AUTH_SUBMIT))
+    await actions.wait_for_url(page, "**/dashboard")
+
+
+async def sign_up(page, name, email, password):
+    """Create an account through the Auth page's sign-up mode."""
+    await actions.goto(page, f"{BASE_URL}/auth?mode=signup")
+    await expect(page.get_by_test_id(L.AUTH_NAME)).to_be_visible()
+    await actions.fill(page.get_by_test_id(L.AUTH_NAME), name)
+    await actions.fill(page.get_by_test_id(L.AUTH_EMAIL), email)
+    await actions.fill(page.get_by_test_id(L.AUTH_PASSWORD), password)
+    await actions.click(page.get_by_test_id(L.AUTH_SUBMIT))
+    await actions.wait_for_url(page, "**/dashboard")
+
+
+async def create_document(page, title=None):
+    """Create a document from the dashboard and leave the page in its editor.
+
+    Returns the document URL so a test can reopen it later.
+    """
+    await actions.goto(page, f"{BASE_URL}/dashboard")
+    await actions.click(page.get_by_test_id(L.DASHBOARD_NEW_DOCUMENT))
+    await actions.wait_for_url(page, "**/document/*")
+    if title is not None:
+        await rename_document(page, title)
+    return page.url
+
+
+async def rename_document(page, title):
+    """Edit the inline title and wait for the debounced save to land."""
+    before = actions.responses(page)
+    await actions.fill(page.get_by_test_id(L.DOCUMENT_TITLE), title)
+    await actions.wait_for_response(page, before)
+
+
+async def type_in_editor(page, text):
+    """Type into the TipTap editor and wait for the autosave mutation."""
+    await actions.click(page.get_by_test_id(L.EDITOR_CONTENT).locator(".tiptap"))
+    before = actions.responses(page)
+    await page.keyboard.type(text)
+    await actions.wait_for_response(page, before)
+
+
+async def add_knowledge(page, title, content):
+    """Add a knowledge item from the open document's Knowledge sidebar."""
+    await actions.click(page.get_by_test_id(L.KNOWLEDGE_ADD))
+    await actions.fill(page.get_by_test_id(L.KNOWLEDGE_TITLE_INPUT), title)
+    await actions.fill(page.get_by_test_id(L.KNOWLEDGE_CONTENT_INPUT), content)
+    await actions.click(page.get_by_test_id(L.KNOWLEDGE_SUBMIT))
+    await expect(L.knowledge_item(page, title)).to_be_visible()
+
+
+async def send_chat_message(page, text):
+    """Send a message to the AI sidebar and wait for the assistant's reply.
+
+    Replies stream into their bubble, so this waits for the bubble to be
+    marked complete.  The transcript only mounts messages near the viewport,
+    so the reply is told apart by its message id rather than by counting.
+    Returns the locator of the reply bubble.
+    """
+    replies = L.chat_messages(page, "assistant")
+    previous = await replies.last.get_attribute("data-message-id") if await replies.count() else None
+    await actions.fill(page.get_by_test_id(L.CHAT_INPUT), text)
+    await actions.click(page.get_by_test_id(L.CHAT_SEND))
+    if previous is None:
+        await expect(replies).not_to_have_count(0, timeout=AI_REPLY_TIMEOUT_MS)
+    else:
+        await expect(replies.last).not_to_have_attribute(
+            "data-message-id", previous, timeout=AI_REPLY_TIMEOUT_MS)
+    message_id = await replies.last.get_attribute("data-message-id")
+    reply = page.locator(f'[data-message-id="{message_id}"]')
+    await expect(reply).to_have_attribute("data-status", "complete", timeout=AI_REPLY_TIMEOUT_MS)
+    return reply
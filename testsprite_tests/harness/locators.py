@@ -0,0 +1,124 @@
+"""``data-testid`` locators for the Inkwell UI.
+
+The ids are set on the interactive elements of the React components (Auth,
+Dashboard, DocumentCard, DocumentEditor, Editor, KnowledgeSidebar,
+AIChatSidebar, ConfirmDialog, AccountDropdown, TrialPopup); keep both sides in
+sync.  A test-id lookup is a single attribute match, so it neither walks the
+document like the generated absolute xpaths did nor breaks when the layout
+around the element changes.
+"""
+
+# Auth page
+AUTH_FORM = "auth-form"
+AUTH_NAME = "auth-name"
+AUTH_EMAIL = "auth-email"
+AUTH_PASSWORD = "auth-password"
+AUTH_SUBMIT = "auth-submit"
+AUTH_TOGGLE_MODE = "auth-toggle-mode"
+AUTH_ERROR = "auth-error"
+
+# Dashboard and document cards
+DASHBOARD_NEW_DOCUMENT = "dashboard-new-document"
+DASHBOARD_CREATE_FIRST_DOCUMENT = "dashboard-create-first-document"
+DASHBOARD_DOCUMENTS = "dashboard-documents"
+DOCUMENT_CARD = "document-card"
+DOCUMENT_CARD_TITLE = "document-card-title"
+DOCUMENT_CARD_PREVIEW = "document-card-preview"
+DOCUMENT_CARD_DELETE = "document-card-delete"
+
+# Shared confirmation dialog
+CONFIRM_DIALOG = "confirm-dialog"
+CONFIRM_DIALOG_CONFIRM = "confirm-dialog-confirm"
+CONFIRM_DIALOG_CANCEL = "confirm-dialog-cancel"
+
+# Account menu and trial gate
+ACCOUNT_MENU = "account-menu"
+ACCOUNT_PROFILE = "account-profile"
+ACCOUNT_SIGN_OUT = "account-sign-out"
+TRIAL_POPUP = "trial-popup"
+TRIAL_START = "trial-start"
+TRIAL_LOGOUT = "trial-logout"
+
+# Document editor page
+DOCUMENT_BACK = "document-back"
+DOCUMENT_TITLE = "document-title"
+DOCUMENT_LAST_SAVED = "document-last-saved"
+DOCUMENT_TOGGLE_KNOWLEDGE = "document-toggle-knowledge"
+DOCUMENT_TOGGLE_CHAT = "document-toggle-chat"
+EDITOR_CONTENT = "editor-content"
+EDITOR_ADD_TO_CONTEXT = "editor-add-to-context"
+
+# Toolbar names accepted by ``toolbar_button``.
+TOOLBAR_BUTTONS = (
+    "bold", "italic", "strike",
+    "heading-1", "heading-2", "heading-3",
+    "bullet-list", "ordered-list", "blockquote", "code-block",
+    "undo", "redo",
+)
+
+# Knowledge sidebar
+KNOWLEDGE_SIDEBAR = "knowledge-sidebar"
+KNOWLEDGE_ADD = "knowledge-add"
+KNOWLEDGE_EMPTY_ADD = "knowledge-empty-add"
+KNOWLEDGE_TITLE_INPUT = "knowledge-title-input"
+KNOWLEDGE_CONTENT_INPUT = "knowledge-content-input"
+KNOWLEDGE_SUBMIT = "knowledge-submit"
+KNOWLEDGE_CANCEL = "knowledge-cancel"
+KNOWLEDGE_ITEM = "knowledge-item"
+KNOWLEDGE_ITEM_TITLE = "knowledge-item-title"
+KNOWLEDGE_ITEM_CONTENT = "knowledge-item-content"
+KNOWLEDGE_ITEM_EDIT = "knowledge-item-edit"
+KNOWLEDGE_ITEM_DELETE = "knowledge-item-delete"
+
+# AI chat sidebar
+CHAT_SIDEBAR = "chat-sidebar"
+CHAT_INSTRUCTIONS = "chat-instructions"
+CHAT_INSTRUCTIONS_MODAL = "chat-instructions-modal"
+CHAT_INSTRUCTIONS_INPUT = "chat-instructions-input"
+CHAT_INSTRUCTIONS_SAVE = "chat-instructions-save"
+CHAT_INSTRUCTIONS_CLOSE = "chat-instructions-close"
+CHAT_CLEAR = "chat-clear"
+CHAT_EMPTY = "chat-empty"
+CHAT_MESSAGE = "chat-message"
+CHAT_MESSAGE_CONTENT = "chat-message-content"
+CHAT_LOADING = "chat-loading"
+CHAT_INSERT = "chat-insert"
+CHAT_CONTEXT_SNIPPET = "chat-context-snippet"
+CHAT_CONTEXT_REMOVE = "chat-context-remove"
+CHAT_CONTEXT_CLEAR = "chat-context-clear"
+CHAT_INPUT = "chat-input"
+CHAT_SEND = "chat-send"
+
+
+def by_test_id(scope, test_id):
+    """Locate ``test_id`` within a page, frame or locator."""
+    return scope.get_by_test_id(test_id)
+
+
+def document_card(page, title):
+    """The dashboard card whose title is exactly ``title``."""
+    return page.get_by_test_id(DOCUMENT_CARD).filter(
+        has=page.get_by_test_id(DOCUMENT_CARD_TITLE).get_by_text(title, exact=True)
+    )
+
+
+def knowledge_item(page, title):
+    """The Knowledge sidebar item whose title is exactly ``title``."""
+    return page.get_by_test_id(KNOWLEDGE_ITEM).filter(
+        has=page.get_by_test_id(KNOWLEDGE_ITEM_TITLE).get_by_text(title, exact=True)
+    )
+
+
+def toolbar_button(page, name):
+    """An editor toolbar button by its ``TOOLBAR_BUTTONS`` name."""
+    if name not in TOOLBAR_BUTTONS:
+        raise ValueError(f"Unknown toolbar button {name!r}")
+    return page.get_by_test_id(f"editor-toolbar-{name}")
+
+
+def chat_messages(page, role=None):
+    """Chat bubbles in display order, optionally only ``"user"`` or ``"assistant"``."""
+    messages = page.get_by_test_id(CHAT_MESSAGE)
+    if role is not None:
+        messages = messages.and_(page.locator(f"[data-role='{role}']"))
+    return messages
@@ -0,0 +1,285 @@
+"""Deterministic OpenAI-compatible stub for ``ai.chat``.
+
+convex/ai.ts reads ``OPENAI_BASE_URL``; point it at this server to run the AI
+tests offline and with repeatable timing::
+
+    python -m harness.mock_openai --port 8787 --ttft 0.4 --tokens-per-second 40
+    npx convex env set OPENAI_BASE_URL http://127.0.0.1:8787/v1
+
+Replies echo the last user message unless a script maps it to a canned
+answer.  The first token is held back ``ttft`` seconds, the rest are paced at
+``tokens_per_second`` (streamed as SSE when the request sets ``stream``), and
+``error_rate`` of the chat requests fail with a 500, drawn from a seeded RNG.
+
+``/v1/embeddings`` answers with a hashed bag of words, so texts sharing
+words are close and knowledge retrieval behaves sensibly offline.
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+_WORD = re.compile(r"\w+")
+
+# text-embedding-3-small's size when the request does not ask for fewer.
+DEFAULT_EMBEDDING_DIMENSIONS = 1536
+
+
+@dataclass
+class MockConfig:
+    ttft: float = 0.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    # (regex, reply) pairs matched against the last user message, in order.
+    script: list = field(default_factory=list)
+
+    @classmethod
+    def load_script(cls, path, **options):
+        rules = json.loads(Path(path).read_text())
+        return cls(script=[(rule["match"], rule["reply"]) for rule in rules], **options)
+
+
+def _tokens(text):
+    return _TOKEN.findall(text)
+
+
+def embedding(text, dimensions):
+    """Each word adds +-1 to the dimension its CRC selects; unit length."""
+    vector = [0.0] * dimensions
+    for word in _WORD.findall(text.lower()):
+        crc = zlib.crc32(word.encode())
+        vector[crc % dimensions] += -1.0 if crc & 0x80000000 else 1.0
+    length = math.sqrt(sum(value * value for value in vector))
+    return [value / length for value in vector] if length else vector
+
+
+def _estimate_tokens(messages):
+    return sum(len(str(message.get("content", ""))) for message in messages) // 4
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockOpenAI"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [
+                {"id": "gpt-4o-mini", "object": "model", "owned_by": "mock"},
+            ]})
+        else:
+            self._send_error(404, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/").endswith("/embeddings"):
+            self._embeddings(body)
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_error(404, f"Unknown path {self.path}")
+            return
+        mock = self.server
+        if mock.should_fail():
+            self._send_error(500, "Simulated upstream failure", "server_error")
+            return
+        messages = body.get("messages", [])
+        reply = mock.reply_for(messages)
+        completion = {
+            "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+        }
+        usage = {
+            "prompt_tokens": _estimate_tokens(messages),
+            "completion_tokens": len(_tokens(reply)),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if body.get("stream"):
+            self._stream(completion, reply, usage)
+        else:
+            mock.pace(len(_tokens(reply)))
+            self._send_json(200, {
+                **completion,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+    def _embeddings(self, body):
+        texts = body.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        dimensions = body.get("dimensions") or DEFAULT_EMBEDDING_DIMENSIONS
+        tokens = sum(len(_tokens(text)) for text in texts)
+        vectors = [embedding(text, dimensions) for text in texts]
+        if body.get("encoding_format") == "base64":
+            # What the Node SDK asks for unless told otherwise.
+            vectors = [base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode()
+                       for vector in vectors]
+        self._send_json(200, {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": index, "embedding": vector}
+                for index, vector in enumerate(vectors)
+            ],
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    def _stream(self, completion, reply, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            self._write_event({
+                **completion,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            })
+
+        mock = self.server
+        time.sleep(mock.config.ttft)
+        chunk({"role": "assistant", "content": ""})
+        for index, token in enumerate(_tokens(reply)):
+            if index and mock.config.tokens_per_second:
+                time.sleep(1 / mock.config.tokens_per_second)
+            chunk({"content": token})
+        chunk({}, "stop")
+        self._write_event({**completion, "object": "chat.completion.chunk",
+                           "choices": [], "usage": usage})
+        self._write_raw(b"data: [DONE]\n\n")
+        self._write_raw(b"")
+
+    def _write_event(self, payload):
+        self._write_raw(f"data: {json.dumps(payload)}\n\n".encode())
+
+    def _write_raw(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, message, kind="invalid_request_error"):
+        self._send_json(status, {"error": {"message": message, "type": kind, "code": None}})
+
+
+class MockOpenAI(ThreadingHTTPServer):
+    """Serve the stub on ``host:port`` from a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, config=None, *, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.config = config or MockConfig()
+        self.requests = 0
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            return self._random.random() < self.config.error_rate
+
+    def reply_for(self, messages):
+        question = next(
+            (str(message.get("content", "")) for message in reversed(messages)
+             if message.get("role") == "user"),
+            "",
+        )
+        for pattern, reply in self.config.script:
+            if re.search(pattern, question, re.IGNORECASE):
+                return reply
+        return f"You said: {question}"
+
+    def pace(self, tokens):
+        """Sleep as long as streaming ``tokens`` tokens would take."""
+        delay = self.config.ttft
+        if self.config.tokens_per_second and tokens > 1:
+            delay += (tokens - 1) / self.config.tokens_per_second
+        time.sleep(delay)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.mock_openai", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttft", type=float, default=0.0,
+                        help="seconds before the first token (default: 0)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="pace of the remaining tokens; 0 sends them at once (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with a 500 (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the error draws")
+    parser.add_argument("--script", metavar="PATH",
+                        help='JSON list of {"match": regex, "reply": text} rules')
+    args = parser.parse_args(argv)
+
+    options = dict(ttft=args.ttft, tokens_per_second=args.tokens_per_second,
+                   error_rate=args.error_rate, seed=args.seed)
+    config = MockConfig.load_script(args.script, **options) if args.script else MockConfig(**options)
+    server = MockOpenAI(config, host=args.host, port=args.port)
+    print(f"Mock OpenAI listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
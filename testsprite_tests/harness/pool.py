@@ -0,0 +1,145 @@
+"""Bounded pool of long-lived Chromium browsers.
+
+Every TC script used to start Playwright and boot its own Chromium, so the
+suite paid a full browser launch per test.  The pool launches ``size``
+browsers once and hands each test an isolated ``new_context()`` on the least
+loaded one; contexts are cheap and share nothing (cookies, storage, cache).
+The launch arguments, blocked resources and whether browsers are shared at
+all come from a ``LaunchProfile`` (see harness.profiles).
+"""
+
+import asyncio
+import contextlib
+
+from playwright import async_api
+
+from harness import actions
+from harness.actions import DEFAULT_TIMEOUT_MS
+from harness.auth import AuthSession
+from harness.profiles import block_resources, get_profile
+
+
+async def launch_browser(playwright, *, headless=True, profile=None):
+    """Launch Chromium with the launch arguments of ``profile``."""
+    profile = profile or get_profile()
+    return await playwright.chromium.launch(headless=headless, args=list(profile.args))
+
+
+@contextlib.asynccontextmanager
+async def open_context(browser, *, block=(), **options):
+    """Yield a fresh, instrumented context on ``browser`` and close it afterwards.
+
+    Requests matching a pattern in ``block`` are aborted.
+    """
+    context = None
+    try:
+        context = await browser.new_context(**options)
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        await block_resources(context, block)
+        await actions.instrument(context)
+        yield context
+    finally:
+        if context:
+            with contextlib.suppress(async_api.Error):
+                await context.close()
+
+
+class BrowserPool:
+    """Launch ``size`` browsers up front and lend out fresh contexts.
+
+    With a profile that does not reuse browsers, every context gets a browser
+    of its own that is closed with it.
+    """
+
+    def __init__(self, size=1, *, headless=True, profile=None):
+        if size < 1:
+            raise ValueError("BrowserPool size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.profile = profile or get_profile()
+        self._pw = None
+        self._browsers = []
+        self._leases = {}
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        self._pw = await async_api.async_playwright().start()
+        if not self.profile.reuse_browser:
+            return
+        self._browsers = list(
+            await asyncio.gather(*(self._launch() for _ in range(self.size)))
+        )
+        self._leases = {id(browser): 0 for browser in self._browsers}
+
+    async def close(self):
+        for browser in self._browsers:
+            with contextlib.suppress(async_api.Error):
+                await browser.close()
+        self._browsers = []
+        self._leases = {}
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def _launch(self):
+        return await launch_browser(self._pw, headless=self.headless, profile=self.profile)
+
+    async def _checkout(self):
+        async with self._lock:
+            index, browser = min(
+                enumerate(self._browsers),
+                key=lambda item: self._leases[id(item[1])],
+            )
+            if not browser.is_connected():
+                # A crashed browser is replaced in place so later tests keep
+                # the full pool width.
+                del self._leases[id(browser)]
+                browser = await self._launch()
+                self._browsers[index] = browser
+                self._leases[id(browser)] = 0
+            self._leases[id(browser)] += 1
+            return browser
+
+    def _release(self, browser):
+        if id(browser) in self._leases:
+            self._leases[id(browser)] -= 1
+
+    @contextlib.asynccontextmanager
+    async def context(self, *, requires=(), **options):
+        """Yield a fresh browser context, closing it when the test finishes.
+
+        ``requires`` names blockable resources the test cannot do without.
+        """
+        block = self.profile.blocked(requires)
+        if not self.profile.reuse_browser:
+            browser = await self._launch()
+            try:
+                async with open_context(browser, block=block, **options) as context:
+                    yield context
+            finally:
+                with contextlib.suppress(async_api.Error):
+                    await browser.close()
+            return
+        browser = await self._checkout()
+        try:
+            async with open_context(browser, block=block, **options) as context:
+                yield context
+        finally:
+            self._release(browser)
+
+
+async def run_standalone(run_test, *, requires_auth=False, requires=()):
+    """Run a single TC coroutine in its own one-browser pool."""
+    async with BrowserPool(size=1) as pool:
+        options = {}
+        if requires_auth:
+            options["storage_state"] = await AuthSession().storage_state(pool.context)
+        async with pool.context(requires=requires, **options) as context:
+            await run_test(context)
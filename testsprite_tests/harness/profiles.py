@@ -0,0 +1,90 @@
+"""Chromium launch profiles for the e2e suite.
+
+The generated scripts launched Chromium with ``--single-process`` and
+``--ipc=host``, which folds the renderer, GPU and network service into one
+process: concurrent pages then queue behind each other and a renderer crash
+takes the whole browser down.  A profile bundles the launch arguments with
+two cheaper levers, blocking heavy third-party resources and sharing one
+browser between tests, so they can be compared with ``python -m
+harness.bench_launch`` and picked per run::
+
+    pytest --profile lean
+    python -m harness --profile single-process
+    INKWELL_E2E_PROFILE=lean python TC008_Auto_Save_Document_Content_While_Editing.py
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+BASE_ARGS = (
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+)
+
+# Resource groups a profile can block, as URL patterns.  Scripts that need
+# one of them list it in ``REQUIRES_RESOURCES``.
+BLOCKABLE = {
+    # The Google Fonts stylesheet imported by src/index.css and its font files.
+    "fonts": re.compile(r"^https://fonts\.(googleapis|gstatic)\.com/"),
+    # The Polar checkout embed opened from the trial popup.
+    "polar": re.compile(r"^https://([\w-]+\.)*polar\.sh/"),
+}
+
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    name: str
+    description: str
+    args: tuple = BASE_ARGS
+    # Names from ``BLOCKABLE`` aborted in every context.
+    block: tuple = ()
+    # Share long-lived browsers between tests instead of launching one per test.
+    reuse_browser: bool = True
+
+    def blocked(self, required=()):
+        """The block patterns to apply for a script needing ``required``."""
+        return [BLOCKABLE[name] for name in self.block if name not in required]
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        LaunchProfile(
+            "multi-process",
+            "Chromium's default process model; browsers shared between tests",
+        ),
+        LaunchProfile(
+            "single-process",
+            "the generated scripts' flags: renderer and browser in one process",
+            args=BASE_ARGS + ("--ipc=host", "--single-process"),
+        ),
+        LaunchProfile(
+            "lean",
+            "multi-process with web fonts and the Polar checkout blocked",
+            block=("fonts", "polar"),
+        ),
+        LaunchProfile(
+            "fresh-browser",
+            "multi-process with a new browser for every test",
+            reuse_browser=False,
+        ),
+    )
+}
+
+DEFAULT_PROFILE = "multi-process"
+
+
+def get_profile(name=None):
+    """Look up a profile by name, defaulting to ``INKWELL_E2E_PROFILE``."""
+    name = name or os.environ.get("INKWELL_E2E_PROFILE") or DEFAULT_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown launch profile {name!r}; choose from {', '.join(PROFILES)}") from None
+
+
+async def block_resources(context, patterns):
+    """Abort every request of ``context`` matching one of ``patterns``."""
+    for pattern in patterns:
+        await context.route(pattern, lambda route: route.abort("blockedbyclient"))
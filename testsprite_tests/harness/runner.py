@@ -0,0 +1,167 @@
+"""Discover the TC scripts and run them concurrently over a ``BrowserPool``."""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from harness import actions
+from harness.auth import AuthSession
+from harness.backend import LocalBackend
+from harness.config import SUITE_DIR
+from harness.pool import BrowserPool
+from harness.profiles import PROFILES, get_profile
+from harness.trace import TRACE_DIR, format_steps, slowest_steps, span_summary, write_summary
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    name: str
+    passed: bool
+    duration: float
+    error: str = None
+    waited: float = 0.0
+    actions: list = field(default_factory=list)
+
+
+def discover(directory=SUITE_DIR, pattern="TC*.py", keyword=None):
+    """Return the TC script paths in ``directory`` in suite order."""
+    paths = sorted(Path(directory).glob(pattern))
+    if keyword:
+        paths = [path for path in paths if keyword.lower() in path.stem.lower()]
+    return paths
+
+
+def load_script(path):
+    """Import a TC script without running it.
+
+    Scripts expose ``run_test(context)`` and may set ``REQUIRES_AUTH`` (start
+    from the shared signed-in session), ``REQUIRES_RESOURCES`` (blockable
+    resources the launch profile must let through) and ``EXCLUSIVE``
+    (changes shared account state, so run it alone after the concurrent
+    batch).
+    """
+    path = Path(path)
+    spec = importlib.util.spec_from_file_location(f"testsprite_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _run_one(pool, auth, semaphore, path):
+    test_id, _, name = path.stem.partition("_")
+    async with semaphore:
+        result = TestResult(test_id, name, passed=False, duration=0.0)
+        started = time.perf_counter()
+        try:
+            script = load_script(path)
+            options = {"requires": getattr(script, "REQUIRES_RESOURCES", ())}
+            if getattr(script, "REQUIRES_AUTH", False):
+                options["storage_state"] = await auth.storage_state(pool.context)
+            async with pool.context(**options) as context:
+                try:
+                    await script.run_test(context)
+                finally:
+                    trace = await actions.finish(context)
+                    trace.write(TRACE_DIR / f"{path.stem}.json", name=path.stem)
+                    result.actions = trace.spans
+            result.passed = True
+        except Exception as exc:
+            result.error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        result.duration = time.perf_counter() - started
+        result.waited = sum(record.waited for record in result.actions)
+        return result
+
+
+def _is_exclusive(path):
+    try:
+        return getattr(load_script(path), "EXCLUSIVE", False)
+    except Exception:
+        # Let _run_one report the import error as a normal failure.
+        return False
+
+
+async def run_suite(paths, workers=4, browsers=2, headless=True, profile=None):
+    """Run ``paths`` with at most ``workers`` tests in flight at once.
+
+    Tests marked ``EXCLUSIVE`` run one at a time once the rest are done.
+    """
+    exclusive = {path for path in paths if _is_exclusive(path)}
+    semaphore = asyncio.Semaphore(workers)
+    auth = AuthSession()
+    async with BrowserPool(size=min(browsers, workers), headless=headless, profile=profile) as pool:
+        results = dict(zip(
+            [path for path in paths if path not in exclusive],
+            await asyncio.gather(*(
+                _run_one(pool, auth, semaphore, path) for path in paths if path not in exclusive
+            )),
+        ))
+        for path in paths:
+            if path in exclusive:
+                results[path] = await _run_one(pool, auth, semaphore, path)
+    return [results[path] for path in paths]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__)
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="number of tests to run at once (default: 4)")
+    parser.add_argument("-b", "--browsers", type=int, default=2,
+                        help="number of long-lived browsers to share (default: 2)")
+    parser.add_argument("-k", "--keyword",
+                        help="only run TC scripts whose file name contains KEYWORD")
+    parser.add_argument("--headed", action="store_true",
+                        help="show the browsers instead of running headless")
+    parser.add_argument("--profile", choices=sorted(PROFILES),
+                        help="browser launch profile (default: $INKWELL_E2E_PROFILE or multi-process)")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="run against a seeded local Convex backend and Vite dev server")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results to PATH as JSON")
+    parser.add_argument("--slowest-steps", type=int, default=10, metavar="N",
+                        help="list the N slowest steps of the run (default: 10, 0 to disable)")
+    args = parser.parse_args(argv)
+
+    profile = get_profile(args.profile)
+    paths = discover(keyword=args.keyword)
+    if not paths:
+        parser.error("no TC scripts matched")
+
+    with contextlib.ExitStack() as stack:
+        if args.local_backend:
+            stack.enter_context(LocalBackend())
+        started = time.perf_counter()
+        results = asyncio.run(
+            run_suite(paths, workers=args.workers, browsers=args.browsers,
+                      headless=not args.headed, profile=profile)
+        )
+        elapsed = time.perf_counter() - started
+
+    for result in results:
+        status = "PASS" if result.passed else "FAIL"
+        print(f"{status}  {result.test_id}  {result.duration:6.1f}s  "
+              f"(waited {result.waited:5.1f}s over {len(result.actions)} actions)  {result.name}")
+        if result.error:
+            print(f"      {result.error}")
+    steps = slowest_steps(
+        [(result.test_id, span_summary(span)) for result in results for span in result.actions],
+        limit=None,
+    )
+    write_summary(steps)
+    if args.slowest_steps > 0 and steps:
+        print(f"\nSlowest {min(args.slowest_steps, len(steps))} steps:")
+        for line in format_steps(steps[:args.slowest_steps]):
+            print(f"  {line}")
+    passed = sum(result.passed for result in results)
+    print(f"\n{passed}/{len(results)} passed in {elapsed:.1f}s "
+          f"({args.workers} workers, {min(args.browsers, args.workers)} browsers, {profile.name} profile)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(result) for result in results], indent=2))
+    return 0 if passed == len(results) else 1
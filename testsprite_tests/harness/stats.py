@@ -0,0 +1,27 @@
+"""Small latency statistics shared by the benchmarks."""
+
+
+def percentile(values, q):
+    """The ``q``-th percentile (0-100) of ``values``, linearly interpolated."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """Count, mean and the usual percentiles of ``values``."""
+    values = list(values)
+    if not values:
+        return {"n": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    return {
+        "n": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
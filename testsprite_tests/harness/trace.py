@@ -0,0 +1,214 @@
+"""Per-test timing traces: step spans, Convex calls and browser metrics.
+
+``harness.actions`` records every goto, click, fill, wait and assertion as a
+span on the context's ``Trace`` and logs each Convex function call seen on the
+sync websocket.  A ``PerformanceObserver`` injected into every page buffers
+Largest Contentful Paint and long-task entries, which are harvested before
+each navigation and when the test ends.
+
+``Trace.write`` emits Chrome trace-event JSON (open it in ``chrome://tracing``
+or https://ui.perfetto.dev) with one track for the steps, one for Convex
+calls and one for the browser's main thread.  ``slowest_steps`` ranks spans
+across a whole run.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass
+
+from playwright.async_api import Error as PlaywrightError
+
+from harness.config import SUITE_DIR
+
+TRACE_DIR = SUITE_DIR / "tmp" / "traces"
+SUMMARY_PATH = TRACE_DIR / "summary.json"
+
+# Buffers LCP and long-task entries in the top frame until ``harvest`` takes them.
+PERFORMANCE_OBSERVER = """
+(() => {
+  if (window !== window.top || window.__inkwellPerf) return;
+  const entries = (window.__inkwellPerf = []);
+  const observe = (type, toEntry) => {
+    try {
+      new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) entries.push(toEntry(entry));
+      }).observe({ type, buffered: true });
+    } catch {
+      // Entry type not supported by this browser.
+    }
+  };
+  observe("largest-contentful-paint", (entry) => ({
+    kind: "lcp", start: entry.startTime, duration: 0, size: entry.size,
+  }));
+  observe("longtask", (entry) => ({
+    kind: "longtask", start: entry.startTime, duration: entry.duration, size: 0,
+  }));
+})();
+"""
+
+_HARVEST = """() => ({
+  origin: performance.timeOrigin,
+  entries: (window.__inkwellPerf || []).splice(0),
+})"""
+
+# Chrome trace track ids.
+_STEPS, _CONVEX, _BROWSER = 1, 2, 3
+
+
+@dataclass
+class ConvexCall:
+    # "query" (subscription added), "mutation", "action", or "update" for a
+    # query result the server pushed without being asked.
+    kind: str
+    path: str
+    start: float
+    end: float = None
+    ok: bool = True
+
+
+@dataclass
+class BrowserEntry:
+    kind: str
+    start: float
+    duration: float
+    # LCP: milliseconds since the page's navigation started.
+    value: float = 0.0
+    url: str = ""
+
+
+class Trace:
+    """Spans, Convex calls and browser entries of one test, on wall-clock time."""
+
+    def __init__(self):
+        self.origin = time.time()
+        self.spans = []
+        self.calls = []
+        self.browser = []
+
+    def start_call(self, kind, path):
+        call = ConvexCall(kind, path or "?", time.time())
+        self.calls.append(call)
+        return call
+
+    def add(self, span):
+        """Add a finished span and the Convex calls made while it ran."""
+        end = span.start + span.duration
+        span.calls = [call for call in self.calls if span.start <= call.start <= end]
+        self.spans.append(span)
+
+    async def harvest(self, page):
+        """Move the page's buffered performance entries into the trace."""
+        try:
+            buffered = await page.evaluate(_HARVEST)
+        except PlaywrightError:
+            # Closed or mid-navigation; its entries are lost with it.
+            return
+        origin = buffered["origin"]
+        for entry in buffered["entries"]:
+            self.browser.append(BrowserEntry(
+                entry["kind"],
+                (origin + entry["start"]) / 1000,
+                entry["duration"] / 1000,
+                value=entry["start"],
+                url=page.url,
+            ))
+
+    async def finish(self, context):
+        """Harvest the context's open pages and attribute browser entries to spans."""
+        for page in context.pages:
+            await self.harvest(page)
+        self._attribute()
+
+    def _attribute(self):
+        self.browser.sort(key=lambda entry: entry.start)
+        for span in self.spans:
+            end = span.start + span.duration
+            span.long_tasks = 1000 * sum(
+                max(0.0, min(end, entry.start + entry.duration) - max(span.start, entry.start))
+                for entry in self.browser if entry.kind == "longtask"
+            )
+        for entry in self.browser:
+            if entry.kind != "lcp":
+                continue
+            # The latest LCP candidate wins, on the navigation that produced it.
+            gotos = [span for span in self.spans if span.action == "goto" and span.start <= entry.start]
+            if gotos:
+                gotos[-1].lcp = entry.value
+
+    def chrome_trace(self, name=""):
+        """Return the trace as a Chrome trace-event document."""
+        def ts(seconds):
+            return round((seconds - self.origin) * 1e6)
+
+        events = [
+            {"ph": "M", "pid": 1, "name": "process_name", "args": {"name": name or "e2e test"}},
+            {"ph": "M", "pid": 1, "tid": _STEPS, "name": "thread_name", "args": {"name": "steps"}},
+            {"ph": "M", "pid": 1, "tid": _CONVEX, "name": "thread_name", "args": {"name": "convex"}},
+            {"ph": "M", "pid": 1, "tid": _BROWSER, "name": "thread_name", "args": {"name": "browser"}},
+        ]
+        for span in self.spans:
+            events.append({
+                "ph": "X", "pid": 1, "tid": _STEPS, "cat": "step",
+                "name": f"{span.action} {span.target}",
+                "ts": ts(span.start), "dur": round(span.duration * 1e6),
+                "args": {
+                    "waited_ms": round(span.waited * 1000, 1),
+                    "long_tasks_ms": round(span.long_tasks, 1),
+                    "lcp_ms": span.lcp,
+                    "convex_calls": [f"{call.kind} {call.path}" for call in span.calls],
+                    "error": span.error,
+                },
+            })
+        for call in self.calls:
+            event = {"pid": 1, "tid": _CONVEX, "cat": call.kind,
+                     "name": call.path, "ts": ts(call.start), "args": {"ok": call.ok}}
+            if call.end is None or call.end == call.start:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=round((call.end - call.start) * 1e6))
+            events.append(event)
+        for entry in self.browser:
+            event = {"pid": 1, "tid": _BROWSER, "cat": entry.kind, "ts": ts(entry.start),
+                     "args": {"url": entry.url}}
+            if entry.kind == "lcp":
+                event.update(ph="i", s="t", name=f"LCP {entry.value:.0f} ms")
+            else:
+                event.update(ph="X", name="Long task", dur=round(entry.duration * 1e6))
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path, name=""):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(name)))
+
+
+def span_summary(span):
+    """A span as plain data, for reports that cross process boundaries."""
+    summary = asdict(span)
+    summary["calls"] = [f"{call.kind} {call.path}" for call in span.calls]
+    return summary
+
+
+def slowest_steps(spans_by_test, limit=10):
+    """Rank ``(test_id, span_summary)`` pairs by duration, slowest first."""
+    ranked = sorted(spans_by_test, key=lambda item: item[1]["duration"], reverse=True)
+    return [{"test": test_id, **span} for test_id, span in ranked[:limit]]
+
+
+def format_steps(steps):
+    """One line per step of a ``slowest_steps`` result."""
+    lines = []
+    for step in steps:
+        details = f"waited {step['waited']:.2f}s, {len(step['calls'])} convex calls"
+        if step["long_tasks"]:
+            details += f", {step['long_tasks']:.0f} ms long tasks"
+        if step["lcp"] is not None:
+            details += f", LCP {step['lcp']:.0f} ms"
+        lines.append(f"{step['duration']:7.2f}s  {step['test']}  {step['action']:<6} "
+                     f"{step['target']}  ({details})")
+    return lines
+
+
+def write_summary(steps, path=SUMMARY_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(steps, indent=2))